@@ -9,18 +9,60 @@ This server provides MCP tools for interacting with Rundeck Enterprise, includin
 """
 
 import asyncio
+import atexit
+import bisect
+import codecs
+import cProfile
+import heapq
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional, Sequence
-from urllib.parse import urljoin
-from datetime import datetime, timedelta
-from collections import defaultdict
+import pstats
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+import xml.etree.ElementTree as ElementTree
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse
+from datetime import date, datetime, timedelta
+from collections import defaultdict, deque
 import statistics
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import contextvars
+import functools
+import gzip
+import hashlib
+import hmac
+import importlib
+import io
 
 import requests
+from urllib3.exceptions import ReadTimeoutError
+from dateutil import tz as dateutil_tz
 from mcp.server import Server
+
+# Optional, only needed for YAML server registries
+yaml: Optional[ModuleType]
+try:
+    yaml = importlib.import_module('yaml')
+except ImportError:
+    yaml = None
+
+# Optional, faster JSON encode/decode
+orjson: Optional[ModuleType]
+try:
+    orjson = importlib.import_module('orjson')
+except ImportError:
+    orjson = None
 from mcp.server.models import InitializationOptions
 from mcp.types import ServerCapabilities, ToolsCapability, PromptsCapability
 from mcp.server.stdio import stdio_server
@@ -32,9 +74,3111 @@ from mcp.types import (
     Tool,
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Concurrent tool calls per lane: interactive (status, output, run_job) and bulk analytics
+TOOL_WORKERS = int(os.getenv('RUNDECK_MCP_WORKERS', '16'))
+BULK_TOOL_WORKERS = int(os.getenv('RUNDECK_MCP_BULK_WORKERS', '4'))
+
+# Upstream request budget per Rundeck server (0 = unlimited) and the share bulk calls may use
+MAX_REQUESTS_PER_SECOND = float(os.getenv('RUNDECK_MAX_REQUESTS_PER_SECOND', '0'))
+BULK_RATE_SHARE = float(os.getenv('RUNDECK_BULK_RATE_SHARE', '0.5'))
+
+# Scans and analytics run in the bulk lane; everything else is interactive
+BULK_TOOLS = {
+    'get_all_executions', 'get_execution_metrics', 'calculate_job_roi', 'get_project_stats',
+    'get_bulk_execution_status', 'cluster_failures', 'forecast_running_executions',
+    'get_concurrency_profile', 'calculate_project_roi', 'get_node_reliability',
+    'detect_anomalies', 'get_job_graph', 'forecast_schedule_load',
+}
+
+# Node inventory cache lifetime in seconds (0 disables caching)
+NODE_CACHE_TTL_SECONDS = int(os.getenv('RUNDECK_NODE_CACHE_TTL', '300'))
+
+# Rundeck node filter attribute aliases
+NODE_FILTER_ALIASES = {
+    'name': 'nodename',
+    'os-name': 'osName',
+    'os-family': 'osFamily',
+    'os-arch': 'osArch',
+    'os-version': 'osVersion',
+}
+
+# How long a fetched execution window can answer narrower queries (0 disables)
+FETCH_PLANNER_TTL_SECONDS = int(os.getenv('RUNDECK_FETCH_PLANNER_TTL', '120'))
+FETCH_PLANNER_MAX_ENTRIES = 32
+
+# Opt-in compressed, full-text indexed archive of fetched execution logs
+LOG_ARCHIVE_DIR = os.getenv('RUNDECK_LOG_ARCHIVE_DIR')
+LOG_ARCHIVE_MAX_MB = float(os.getenv('RUNDECK_LOG_ARCHIVE_MAX_MB', '256'))
+
+# Execution state snapshots kept for get_execution_state_changes cursors
+EXECUTION_STATE_CURSORS = int(os.getenv('RUNDECK_EXECUTION_STATE_CURSORS', '256'))
+EXECUTION_STATE_MAX_CHANGES = 200
+
+# Seconds a project's bulk-exported job definitions back the job reference graph
+JOB_GRAPH_TTL_SECONDS = int(os.getenv('RUNDECK_JOB_GRAPH_TTL', '600'))
+
+# Opt-in listener for Rundeck webhook notifications that wakes run_job_with_monitoring
+WEBHOOK_PORT = int(os.getenv('RUNDECK_WEBHOOK_PORT', '0'))
+WEBHOOK_HOST = os.getenv('RUNDECK_WEBHOOK_HOST', '127.0.0.1')
+WEBHOOK_PUBLIC_URL = os.getenv('RUNDECK_WEBHOOK_PUBLIC_URL')
+WEBHOOK_SECRET = os.getenv('RUNDECK_WEBHOOK_SECRET')
+WEBHOOK_PATH = '/rundeck/notifications'
+# Fallback poll interval while a job is known to notify the listener
+WEBHOOK_FALLBACK_POLL_SECONDS = float(os.getenv('RUNDECK_WEBHOOK_FALLBACK_POLL', '120'))
+
+# Adaptive execution page size: floor, ceiling, first page and per-page latency/size targets
+PAGE_SIZE_MIN = int(os.getenv('RUNDECK_PAGE_SIZE_MIN', '100'))
+PAGE_SIZE_MAX = int(os.getenv('RUNDECK_PAGE_SIZE_MAX', '5000'))
+PAGE_SIZE_INITIAL = int(os.getenv('RUNDECK_PAGE_SIZE_INITIAL', '1000'))
+PAGE_TARGET_SECONDS = float(os.getenv('RUNDECK_PAGE_TARGET_SECONDS', '5'))
+PAGE_TARGET_BYTES = int(float(os.getenv('RUNDECK_PAGE_TARGET_MB', '16')) * 1024 * 1024)
+# Bytes read from the socket at a time when stream-decoding executions and log output
+STREAM_CHUNK_BYTES = 64 * 1024
+# Most log entries returned by one get_execution_output call (page with offset)
+OUTPUT_MAX_ENTRIES = int(os.getenv('RUNDECK_OUTPUT_MAX_ENTRIES', '5000'))
+
+# Background prefetch: hot projects ("project" on the default server or "server:project"),
+# refresh interval, and the recent execution window kept warm for each
+PREFETCH_PROJECTS = [p.strip() for p in os.getenv('RUNDECK_PREFETCH_PROJECTS', '').split(',') if p.strip()]
+PREFETCH_INTERVAL_SECONDS = float(os.getenv('RUNDECK_PREFETCH_INTERVAL', '60'))
+PREFETCH_DAYS = int(os.getenv('RUNDECK_PREFETCH_DAYS', '30'))
+PREFETCH_MAX_EXECUTIONS = int(os.getenv('RUNDECK_PREFETCH_MAX_EXECUTIONS', '5000'))
+# Prefetched project and job lists are served from memory until two refreshes are missed
+CATALOG_TTL_SECONDS = 2 * PREFETCH_INTERVAL_SECONDS if PREFETCH_PROJECTS else 0
+
+# Client-side launch queue: duplicate window, per-job run limit, concurrent launches, max queue wait
+LAUNCH_DEDUPE_SECONDS = float(os.getenv('RUNDECK_LAUNCH_DEDUPE_SECONDS', '60'))
+MAX_RUNS_PER_JOB = int(os.getenv('RUNDECK_MAX_RUNS_PER_JOB', '0'))
+LAUNCH_CONCURRENCY = int(os.getenv('RUNDECK_LAUNCH_CONCURRENCY', '4'))
+LAUNCH_QUEUE_TIMEOUT_SECONDS = float(os.getenv('RUNDECK_LAUNCH_QUEUE_TIMEOUT', '300'))
+LAUNCH_RECHECK_SECONDS = 5.0
+
+TERMINAL_EXECUTION_STATUSES = {'succeeded', 'failed', 'aborted', 'timedout'}
+
+# Opt-in SQLite cache shared by every server process on this machine
+SHARED_CACHE_DIR = os.getenv('RUNDECK_SHARED_CACHE_DIR')
+SHARED_CACHE_MAX_MB = float(os.getenv('RUNDECK_SHARED_CACHE_MAX_MB', '256'))
+SHARED_CACHE_TTL_SECONDS = int(os.getenv('RUNDECK_SHARED_CACHE_TTL', '300'))
+
+# Failure clustering: MinHash permutations, LSH bands and concurrent output fetches
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+FAILURE_FETCH_WORKERS = int(os.getenv('RUNDECK_FAILURE_FETCH_WORKERS', '8'))
+
+# Completion forecasting: history window and minimum samples per condition
+FORECAST_HISTORY_DAYS = int(os.getenv('RUNDECK_FORECAST_HISTORY_DAYS', '30'))
+FORECAST_MIN_SAMPLES = 5
+# Most firings evaluated per scheduled job over a forecast horizon
+SCHEDULE_FORECAST_MAX_FIRINGS = 20000
+
+CRON_MONTHS = {name: i + 1 for i, name in enumerate(
+    ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC'])}
+CRON_WEEKDAYS = {name: i + 1 for i, name in enumerate(['SUN', 'MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT'])}
+
+# Anomaly detection: MAD to standard deviation factor, smallest duration spread
+# (fraction of the median, and seconds) and smallest median shift worth reporting
+MAD_TO_SIGMA = 1.4826
+ANOMALY_MIN_SPREAD_FRACTION = 0.05
+ANOMALY_MIN_SPREAD_SECONDS = 1.0
+ANOMALY_MIN_SHIFT_FRACTION = 0.2
+
+# Record/replay of Rundeck HTTP traffic and tool call traces for offline benchmarking
+HTTP_RECORD_PATH = os.getenv('RUNDECK_HTTP_RECORD')
+HTTP_REPLAY_PATH = os.getenv('RUNDECK_HTTP_REPLAY')
+REPLAY_LATENCY_SCALE = float(os.getenv('RUNDECK_REPLAY_LATENCY_SCALE', '1.0'))
+TOOL_TRACE_PATH = os.getenv('RUNDECK_TOOL_TRACE')
+
+# Opt-in cProfile/tracemalloc profiling of tool calls
+PROFILE_DIR = os.getenv('RUNDECK_PROFILE_DIR')
+PROFILE_TOOLS = {t.strip() for t in os.getenv('RUNDECK_PROFILE_TOOLS', '').split(',') if t.strip()}
+
+# Tracing spans exported as OpenTelemetry JSON lines (disabled unless set)
+TRACE_FILE = os.getenv('RUNDECK_TRACE_FILE')
+
+# Server registry file (YAML or JSON), reload check interval and idle client eviction
+SERVERS_FILE = os.getenv('RUNDECK_SERVERS_FILE')
+REGISTRY_CHECK_SECONDS = float(os.getenv('RUNDECK_REGISTRY_CHECK_SECONDS', '5'))
+CLIENT_IDLE_SECONDS = float(os.getenv('RUNDECK_CLIENT_IDLE_SECONDS', '900'))
+
+# Units accepted by Rundeck's recentFilter parameter
+RECENT_FILTER_UNITS = {'h': 3600, 'd': 86400, 'w': 604800, 'm': 2592000, 'y': 31536000}
+
+REGEX_METACHARACTERS = set('.*+?[](){}|^$\\')
+
+
+def tokenize_node_filter(node_filter: str) -> List[str]:
+    """Split a node filter into whitespace separated tokens, honouring quotes"""
+    tokens = []
+    current: List[str] = []
+    quote = None
+    has_token = False
+
+    for char in node_filter:
+        if quote:
+            if char == quote:
+                quote = None
+            else:
+                current.append(char)
+        elif char in ('"', "'"):
+            quote = char
+            has_token = True
+        elif char.isspace():
+            if has_token:
+                tokens.append(''.join(current))
+                current = []
+                has_token = False
+        else:
+            current.append(char)
+            has_token = True
+
+    if quote:
+        raise ValueError(f"Unterminated quote ({quote}) in node filter")
+    if has_token:
+        tokens.append(''.join(current))
+    return tokens
+
+
+def parse_node_filter(node_filter: str) -> Dict[str, Dict[str, List[str]]]:
+    """Parse Rundeck node filter syntax into include and exclude selectors.
+
+    Supports ``attribute: value`` pairs, ``!attribute: value`` exclusions,
+    comma separated alternatives, ``tags: a+b`` conjunctions and bare words,
+    which select on node name. Raises ValueError for malformed filters.
+    """
+    tokens = tokenize_node_filter(node_filter)
+    selectors: Dict[str, Dict[str, List[str]]] = {'include': {}, 'exclude': {}}
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.endswith(':') and len(token) > 1:
+            # "attribute:" followed by a separate value token
+            key = token[:-1]
+            if i + 1 >= len(tokens):
+                raise ValueError(f"Missing value for node filter attribute '{key}'")
+            value = tokens[i + 1]
+            i += 2
+        elif ':' in token and not token.startswith(':'):
+            key, value = token.split(':', 1)
+            i += 1
+        else:
+            key, value = 'name', token
+            i += 1
+
+        target = selectors['include']
+        if key.startswith('!'):
+            target = selectors['exclude']
+            key = key[1:]
+        key = NODE_FILTER_ALIASES.get(key, key)
+
+        if not key:
+            raise ValueError(f"Missing attribute name in node filter term '{token}'")
+        values = [v.strip() for v in value.split(',') if v.strip()]
+        if not values:
+            raise ValueError(f"Empty value for node filter attribute '{key}'")
+
+        for v in values:
+            patterns = v.split('+') if key == 'tags' else [v]
+            for pattern in patterns:
+                if any(c in REGEX_METACHARACTERS for c in pattern):
+                    try:
+                        re.compile(pattern)
+                    except re.error as e:
+                        raise ValueError(f"Invalid regular expression '{pattern}' for '{key}': {e}")
+        target.setdefault(key, []).extend(values)
+
+    return selectors
+
+
+class NodeInventory:
+    """Indexed snapshot of a project's node resources"""
+
+    def __init__(self, project: str, resources: Any):
+        self.project = project
+        self.fetched_at = time.time()
+        self.nodes: List[Dict[str, Any]] = []
+
+        if isinstance(resources, dict):
+            for node_name, attributes in resources.items():
+                node = dict(attributes) if isinstance(attributes, dict) else {}
+                node.setdefault('nodename', node_name)
+                self.nodes.append(node)
+        elif isinstance(resources, list):
+            self.nodes = [dict(n) for n in resources if isinstance(n, dict)]
+
+        # attribute -> value -> node indexes
+        self.index: Dict[str, Dict[str, set]] = defaultdict(lambda: defaultdict(set))
+        for idx, node in enumerate(self.nodes):
+            for attr, value in node.items():
+                if attr == 'tags':
+                    for tag in self._split_tags(value):
+                        self.index['tags'][tag].add(idx)
+                elif isinstance(value, (str, int, float, bool)):
+                    self.index[attr][str(value)].add(idx)
+
+    @staticmethod
+    def _split_tags(value: Any) -> List[str]:
+        if isinstance(value, list):
+            return [str(t).strip() for t in value if str(t).strip()]
+        if isinstance(value, str):
+            return [t.strip() for t in value.split(',') if t.strip()]
+        return []
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.fetched_at
+
+    def _match_value(self, attr: str, pattern: str) -> set:
+        """Return node indexes whose attribute equals or fully matches pattern"""
+        values = self.index.get(attr)
+        if not values:
+            return set()
+        matched = set(values.get(pattern, ()))
+        if any(c in REGEX_METACHARACTERS for c in pattern):
+            regex = re.compile(pattern)
+            for value, idxs in values.items():
+                if value != pattern and regex.fullmatch(value):
+                    matched |= idxs
+        return matched
+
+    def _match_selector(self, selector: Dict[str, List[str]]) -> set:
+        """Attributes are ANDed, comma separated values ORed, tag terms joined by + ANDed"""
+        result: Optional[set] = None
+        for attr, values in selector.items():
+            attr_matches: set = set()
+            for value in values:
+                if attr == 'tags':
+                    tag_matches: Optional[set] = None
+                    for tag in value.split('+'):
+                        found = self._match_value('tags', tag)
+                        tag_matches = found if tag_matches is None else tag_matches & found
+                    attr_matches |= tag_matches or set()
+                else:
+                    attr_matches |= self._match_value(attr, value)
+            result = attr_matches if result is None else result & attr_matches
+            if not result:
+                return set()
+        return result if result is not None else set()
+
+    def select(self, node_filter: str) -> List[Dict[str, Any]]:
+        """Evaluate a node filter against the inventory"""
+        selectors = parse_node_filter(node_filter)
+        if selectors['include']:
+            selected = self._match_selector(selectors['include'])
+        else:
+            selected = set(range(len(self.nodes)))
+        if selectors['exclude']:
+            selected -= self._match_selector(selectors['exclude'])
+        return [self.nodes[i] for i in sorted(selected)]
+
+
+def parse_recent_filter(recent_filter: Optional[str]) -> Optional[float]:
+    """Convert a Rundeck recentFilter such as '7d' or '12h' to seconds"""
+    if not recent_filter:
+        return None
+    match = re.fullmatch(r'\s*(\d+)\s*([hdwmy])\s*', recent_filter)
+    if not match:
+        raise ValueError(f"Unsupported recent filter: {recent_filter}")
+    return int(match.group(1)) * RECENT_FILTER_UNITS[match.group(2)]
+
+
+def execution_timestamp(execution: Dict[str, Any], field: str) -> Optional[float]:
+    """Epoch seconds of an execution's date-started/date-ended field"""
+    value = execution.get(field)
+    if not value:
+        return None
+    if value.get('unixtime') is not None:
+        return float(value['unixtime']) / 1000.0
+    try:
+        return datetime.fromisoformat(value['date'].replace('Z', '+00:00')).timestamp()
+    except (ValueError, KeyError, AttributeError):
+        return None
+
+
+def execution_duration_seconds(execution: Dict[str, Any]) -> Optional[float]:
+    """Wall-clock duration of a finished execution"""
+    started = execution_timestamp(execution, 'date-started')
+    ended = execution_timestamp(execution, 'date-ended')
+    if started is None or ended is None:
+        return None
+    return max(ended - started, 0.0)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linearly interpolated percentile of pre-sorted values"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def forecast_completion(execution: Dict[str, Any], history: List[Dict[str, Any]],
+                        now: Optional[float] = None) -> Dict[str, Any]:
+    """Estimate when a running execution finishes from its job's past durations.
+    
+    History is narrowed to runs with the same options, then the same node
+    count, when enough samples exist. The remaining time is the median of
+    past durations longer than the time already elapsed.
+    """
+    now = time.time() if now is None else now
+    started = execution_timestamp(execution, 'date-started')
+    if started is None:
+        return {"available": False, "reason": "Execution has no start time"}
+    elapsed = max(now - started, 0.0)
+    
+    samples: List[Tuple[float, Dict[str, Any]]] = []
+    for ex in history:
+        duration = execution_duration_seconds(ex)
+        if duration is not None:
+            samples.append((duration, ex))
+    node_count = len(execution.get('successfulNodes') or []) + len(execution.get('failedNodes') or [])
+    
+    basis = "job"
+    durations = [d for d, _ in samples]
+    same_options = [d for d, ex in samples if ex.get('argstring') == execution.get('argstring')]
+    same_nodes = [d for d, ex in samples
+                  if len(ex.get('successfulNodes') or []) + len(ex.get('failedNodes') or []) == node_count]
+    if execution.get('argstring') and len(same_options) >= FORECAST_MIN_SAMPLES:
+        basis, durations = "same_options", same_options
+    elif node_count and len(same_nodes) >= FORECAST_MIN_SAMPLES:
+        basis, durations = "same_node_count", same_nodes
+    
+    if len(durations) < 3:
+        return {"available": False, "reason": f"Only {len(durations)} past successful runs",
+                "elapsed_seconds": round(elapsed, 1)}
+    
+    durations.sort()
+    p50, p90, p95 = (percentile(durations, p) for p in (50, 90, 95))
+    longer = [d for d in durations if d > elapsed]
+    expected_total = percentile(longer, 50) if longer else elapsed
+    remaining = max(expected_total - elapsed, 0.0)
+    
+    return {
+        "available": True,
+        "basis": basis,
+        "samples": len(durations),
+        "elapsed_seconds": round(elapsed, 1),
+        "p50_duration_seconds": round(p50, 1),
+        "p90_duration_seconds": round(p90, 1),
+        "p95_duration_seconds": round(p95, 1),
+        "expected_remaining_seconds": round(remaining, 1),
+        "expected_finish": datetime.fromtimestamp(now + remaining).astimezone().isoformat(timespec='seconds'),
+        "overdue": elapsed > p95,
+        "overrun_ratio": round(elapsed / p95, 2) if p95 > 0 else None
+    }
+
+
+def local_hour_boundaries(start: float, end: float) -> List[float]:
+    """Timestamps where local wall-clock hours begin, from the hour holding start until past end.
+    
+    Local hours need not begin on UTC hours (e.g. UTC+05:30), and a DST
+    change shifts them, so each boundary is taken from the local clock.
+    """
+    def hour_start(timestamp: float) -> float:
+        local = datetime.fromtimestamp(timestamp)
+        return timestamp - (local.minute * 60 + local.second + local.microsecond / 1e6)
+    
+    boundaries = [hour_start(start)]
+    while boundaries[-1] <= end:
+        following = hour_start(boundaries[-1] + 3600)
+        boundaries.append(following if following > boundaries[-1] else boundaries[-1] + 3600)
+    return boundaries
+
+
+def concurrency_profile(executions: List[Dict[str, Any]], window_start: float,
+                        now: Optional[float] = None, top_jobs: int = 10) -> Dict[str, Any]:
+    """Concurrent execution statistics from a sweep over start/end events.
+    
+    Running executions count until now and every interval is clipped to
+    [window_start, now]. Percentiles are weighted by time spent at each
+    concurrency level. Per-job overlap counts come from bisecting sorted
+    start and end times, so the whole profile is O(n log n).
+    """
+    now = time.time() if now is None else now
+    intervals = []
+    for ex in executions:
+        started = execution_timestamp(ex, 'date-started')
+        if started is None:
+            continue
+        ended = execution_timestamp(ex, 'date-ended') or now
+        started, ended = max(started, window_start), min(ended, now)
+        if ended > started:
+            intervals.append((started, ended, ex))
+    
+    if not intervals:
+        return {"executions": 0, "peak_concurrency": 0}
+    
+    # Ends sort before starts at the same instant so back-to-back runs don't overlap
+    events = sorted([(start, 1) for start, _, _ in intervals] + [(end, -1) for _, end, _ in intervals])
+    events.append((now, 0))
+    boundaries = local_hour_boundaries(window_start, now)
+    hour_peak = [0] * (len(boundaries) - 1)
+    hour_area = [0.0] * len(hour_peak)
+    level_seconds = [0.0] * (len(intervals) + 1)
+    level, peak, peak_at = 0, 0, window_start
+    previous = window_start
+    hour = 0
+    for timestamp, delta in events:
+        if timestamp > previous:
+            level_seconds[level] += timestamp - previous
+            # Spread the interval over the hour buckets it covers
+            while timestamp > boundaries[hour + 1]:
+                if level > hour_peak[hour] and boundaries[hour + 1] > previous:
+                    hour_peak[hour] = level
+                hour_area[hour] += level * (boundaries[hour + 1] - previous)
+                previous = boundaries[hour + 1]
+                hour += 1
+            if level > hour_peak[hour]:
+                hour_peak[hour] = level
+            hour_area[hour] += level * (timestamp - previous)
+            previous = timestamp
+        level += delta
+        if level > peak:
+            peak, peak_at = level, timestamp
+    seconds_at_level = {value: seconds for value, seconds in enumerate(level_seconds[:peak + 1]) if seconds > 0}
+    
+    total_seconds = sum(seconds_at_level.values())
+    levels = sorted(seconds_at_level)
+    
+    def level_percentile(pct: float) -> int:
+        threshold, covered = total_seconds * pct / 100.0, 0.0
+        for value in levels:
+            covered += seconds_at_level[value]
+            if covered >= threshold:
+                return value
+        return levels[-1]
+    
+    # Fold hour buckets onto a local weekday x hour-of-day grid
+    weekdays = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    grid_peak = {day: [0] * 24 for day in weekdays}
+    grid_area = {day: [0.0] * 24 for day in weekdays}
+    grid_seconds = {day: [0.0] * 24 for day in weekdays}
+    for hour, (bucket_peak, bucket_area) in enumerate(zip(hour_peak, hour_area)):
+        local = datetime.fromtimestamp(boundaries[hour])
+        day, hour_of_day = weekdays[local.weekday()], local.hour
+        grid_peak[day][hour_of_day] = max(grid_peak[day][hour_of_day], bucket_peak)
+        grid_area[day][hour_of_day] += bucket_area
+        grid_seconds[day][hour_of_day] += min(boundaries[hour + 1], now) - max(boundaries[hour], window_start)
+    
+    # Executions overlapping each one: started before it ended minus ended before it started
+    starts = sorted(start for start, _, _ in intervals)
+    ends = sorted(end for _, end, _ in intervals)
+    jobs: Dict[str, Dict[str, Any]] = {}
+    for start, end, ex in intervals:
+        overlapping = bisect.bisect_left(starts, end) - bisect.bisect_right(ends, start) - 1
+        job = ex.get('job') or {}
+        key = job.get('id') or 'adhoc'
+        stats = jobs.get(key)
+        if stats is None:
+            stats = jobs[key] = {
+                "job_id": job.get('id'),
+                "job_name": job.get('name', 'Ad-hoc command'),
+                "project": ex.get('project') or job.get('project'),
+                "executions": 0, "total_overlaps": 0, "max_overlapping": 0, "busy_seconds": 0.0
+            }
+        stats["executions"] += 1
+        stats["total_overlaps"] += overlapping
+        stats["max_overlapping"] = max(stats["max_overlapping"], overlapping)
+        stats["busy_seconds"] += end - start
+    
+    ranked = sorted(jobs.values(), key=lambda j: j["total_overlaps"], reverse=True)[:top_jobs]
+    for stats in ranked:
+        stats["avg_overlapping"] = round(stats["total_overlaps"] / stats["executions"], 2)
+        stats["busy_seconds"] = round(stats["busy_seconds"], 1)
+    
+    return {
+        "executions": len(intervals),
+        "window_start": datetime.fromtimestamp(window_start).astimezone().isoformat(timespec='seconds'),
+        "window_end": datetime.fromtimestamp(now).astimezone().isoformat(timespec='seconds'),
+        "peak_concurrency": peak,
+        "peak_at": datetime.fromtimestamp(peak_at).astimezone().isoformat(timespec='seconds'),
+        "average_concurrency": round(sum(v * t for v, t in seconds_at_level.items()) / total_seconds, 2) if total_seconds else 0,
+        "p50_concurrency": level_percentile(50),
+        "p90_concurrency": level_percentile(90),
+        "p95_concurrency": level_percentile(95),
+        "p99_concurrency": level_percentile(99),
+        "idle_percent": round(seconds_at_level.get(0, 0.0) / total_seconds * 100, 1) if total_seconds else 0,
+        "hourly_peak_heatmap": grid_peak,
+        "hourly_average_heatmap": {
+            day: [round(grid_area[day][h] / grid_seconds[day][h], 2) if grid_seconds[day][h] > 0 else 0
+                  for h in range(24)]
+            for day in weekdays
+        },
+        "most_overlapping_jobs": ranked
+    }
+
+
+def parse_cron_field(text: str, low: int, high: int, names: Optional[Dict[str, int]] = None) -> Set[int]:
+    """Values of one Quartz cron field: *, ?, lists, ranges (wrapping), steps and names"""
+    def value(token: str) -> int:
+        number = names.get(token) if names else None
+        number = int(token) if number is None else number
+        if not low <= number <= high:
+            raise ValueError(f"Cron value {token} outside {low}-{high}")
+        return number
+    
+    values: Set[int] = set()
+    for part in text.strip().upper().split(','):
+        base, _, step_text = part.partition('/')
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"Invalid cron step in {part}")
+        if base in ('*', '?'):
+            start, end = low, high
+        elif '-' in base:
+            first, last = base.split('-', 1)
+            start, end = value(first), value(last)
+        else:
+            start = value(base)
+            end = high if step_text else start
+        span = list(range(start, end + 1)) if start <= end else \
+            list(range(start, high + 1)) + list(range(low, end + 1))
+        values.update(span[::step])
+    return values
+
+
+class CronSchedule:
+    """A Quartz cron expression (sec min hour day-of-month month day-of-week [year]).
+    
+    Supports lists, ranges, steps and names, plus L, L-n, nW and LW in the
+    day of month and nL and n#k in the day of week. Firing times within a
+    day are precomputed as (hour, minute, second) wall-clock times.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) not in (6, 7):
+            raise ValueError(f"Expected 6 or 7 cron fields, got {len(fields)}: {expression}")
+        self.expression = expression
+        seconds = parse_cron_field(fields[0], 0, 59)
+        minutes = parse_cron_field(fields[1], 0, 59)
+        hours = parse_cron_field(fields[2], 0, 23)
+        self.times_of_day = sorted((h, m, sec) for h in hours for m in minutes for sec in seconds)
+        self.seconds_of_day = [h * 3600 + m * 60 + sec for h, m, sec in self.times_of_day]
+        self.months = parse_cron_field(fields[4], 1, 12, CRON_MONTHS)
+        self.years = parse_cron_field(fields[6], 1970, 2199) if len(fields) == 7 else None
+        self._day_of_month = self._parse_day_of_month(fields[3].strip().upper())
+        self._day_of_week = self._parse_day_of_week(fields[5].strip().upper())
+
+    @staticmethod
+    def _month_length(day: date) -> int:
+        next_month = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+        return (next_month - timedelta(days=1)).day
+
+    def _parse_day_of_month(self, text: str) -> Optional[Callable[[date], bool]]:
+        if text == '?':
+            return None
+        if text.startswith('L'):
+            if text == 'LW':
+                return lambda day: day.day == self._nearest_weekday(day, self._month_length(day))
+            if text != 'L' and not text.startswith('L-'):
+                raise ValueError(f"Invalid cron day of month {text}")
+            offset = self._number(text[2:], 0, 30) if text != 'L' else 0
+            return lambda day: day.day == self._month_length(day) - offset
+        if text.endswith('W'):
+            target = self._number(text[:-1], 1, 31)
+            return lambda day: day.day == self._nearest_weekday(day, min(target, self._month_length(day)))
+        days = parse_cron_field(text, 1, 31)
+        return lambda day: day.day in days
+
+    @staticmethod
+    def _number(token: str, low: int, high: int) -> int:
+        if not token.isdigit() or not low <= int(token) <= high:
+            raise ValueError(f"Cron value {token} outside {low}-{high}")
+        return int(token)
+
+    def _nearest_weekday(self, day: date, target: int) -> int:
+        """Quartz W: the weekday nearest the target day, without leaving the month"""
+        weekday = date(day.year, day.month, target).weekday()
+        if weekday == 5:
+            return target - 1 if target > 1 else target + 2
+        if weekday == 6:
+            return target + 1 if target < self._month_length(day) else target - 2
+        return target
+
+    def _parse_day_of_week(self, text: str) -> Optional[Callable[[date], bool]]:
+        if text == '?':
+            return None
+        # Quartz numbers days 1=SUN..7=SAT; Python's weekday() is 0=MON..6=SUN
+        def quartz(day: date) -> int:
+            return (day.weekday() + 1) % 7 + 1
+        if text.endswith('L') and text != 'L':
+            target = parse_cron_field(text[:-1], 1, 7, CRON_WEEKDAYS).pop()
+            return lambda day: quartz(day) == target and day.day + 7 > self._month_length(day)
+        if '#' in text:
+            weekday_text, _, nth_text = text.partition('#')
+            target = parse_cron_field(weekday_text, 1, 7, CRON_WEEKDAYS).pop()
+            nth = self._number(nth_text, 1, 5)
+            return lambda day: quartz(day) == target and (day.day - 1) // 7 + 1 == nth
+        days = parse_cron_field('7' if text == 'L' else text, 1, 7, CRON_WEEKDAYS)
+        return lambda day: quartz(day) in days
+
+    def matches_day(self, day: date) -> bool:
+        if day.month not in self.months or (self.years is not None and day.year not in self.years):
+            return False
+        if self._day_of_month is not None and not self._day_of_month(day):
+            return False
+        return self._day_of_week is None or self._day_of_week(day)
+
+    def firings(self, start: float, end: float, timezone: Any,
+                limit: int = SCHEDULE_FORECAST_MAX_FIRINGS) -> List[float]:
+        """Epoch seconds of firings in [start, end), in the schedule's time zone.
+        
+        On days with a UTC offset change each firing is placed by its wall
+        clock time: times skipped by the change move forward by the gap,
+        and repeated times fire once, at their first occurrence.
+        """
+        times: List[float] = []
+        day = datetime.fromtimestamp(start, timezone).date()
+        last_day = datetime.fromtimestamp(end, timezone).date()
+        while day <= last_day and len(times) < limit:
+            next_day = day + timedelta(days=1)
+            if self.matches_day(day):
+                midnight = datetime(day.year, day.month, day.day, tzinfo=timezone)
+                following = datetime(next_day.year, next_day.month, next_day.day, tzinfo=timezone)
+                if midnight.utcoffset() == following.utcoffset():
+                    base = midnight.timestamp()
+                    first = bisect.bisect_left(self.seconds_of_day, start - base)
+                    day_times = [base + offset for offset in self.seconds_of_day[first:]]
+                else:
+                    day_times = sorted({dateutil_tz.resolve_imaginary(
+                        datetime(day.year, day.month, day.day, h, m, sec, tzinfo=timezone)).timestamp()
+                        for h, m, sec in self.times_of_day})
+                for fired in day_times:
+                    if fired >= end or len(times) >= limit:
+                        break
+                    if fired >= start:
+                        times.append(fired)
+            day = next_day
+        return times
+
+
+def rundeck_schedule_cron(schedule: Dict[str, Any]) -> str:
+    """Quartz expression of a job definition's schedule (crontab or structured form)"""
+    if schedule.get('crontab'):
+        return str(schedule['crontab'])
+    clock = schedule.get('time') or {}
+    day_of_month = (schedule.get('dayofmonth') or {}).get('day')
+    weekday = (schedule.get('weekday') or {}).get('day')
+    if day_of_month and day_of_month != '?':
+        weekday = '?'
+    else:
+        day_of_month, weekday = '?', weekday or '*'
+    return ' '.join(str(part) for part in (
+        clock.get('seconds', '0'), clock.get('minute', '0'), clock.get('hour', '0'),
+        day_of_month, schedule.get('month', '*'), weekday, schedule.get('year', '*')
+    ))
+
+
+def schedule_load_forecast(jobs: List[Dict[str, Any]], start: float, end: float,
+                           bucket_seconds: int = 900, top: int = 10) -> Dict[str, Any]:
+    """Expected concurrency per time bucket from scheduled firings and expected durations.
+    
+    Each job carries its CronSchedule ('cron'), time zone, expected duration
+    and whether it allows multiple executions. Firings of a job that doesn't
+    are skipped while its previous run is still expected to be going, as
+    Rundeck would. A sweep over start/end events gives each bucket's average
+    (time-weighted) and peak concurrency.
+    """
+    intervals: List[Tuple[float, float]] = []
+    per_job: List[Dict[str, Any]] = []
+    skipped_total = 0
+    # Many jobs share an expression (hourly, nightly), so firings are computed once per zone
+    firing_cache: Dict[Tuple[str, int], List[float]] = {}
+    for job in jobs:
+        duration = max(job['duration_seconds'], 1.0)
+        cache_key = (job['cron'].expression, id(job['timezone']))
+        fired_at = firing_cache.get(cache_key)
+        if fired_at is None:
+            fired_at = firing_cache[cache_key] = job['cron'].firings(start, end, job['timezone'])
+        starts, skipped, busy_until = [], 0, float('-inf')
+        for fired in fired_at:
+            if not job['multiple_executions'] and fired < busy_until:
+                skipped += 1
+                continue
+            starts.append(fired)
+            busy_until = fired + duration
+            intervals.append((fired, min(fired + duration, end)))
+        skipped_total += skipped
+        per_job.append({"job": job, "starts": starts, "skipped": skipped,
+                        "truncated": len(fired_at) >= SCHEDULE_FORECAST_MAX_FIRINGS})
+    
+    # Buckets are aligned to the clock, e.g. :00/:15/:30/:45 for 15 minutes
+    grid_start = start - start % bucket_seconds
+    bucket_count = max(int(-(-(end - grid_start) // bucket_seconds)), 1)
+    bucket_peak = [0] * bucket_count
+    bucket_area = [0.0] * bucket_count
+    bucket_firings = [0] * bucket_count
+    for fired, _ in intervals:
+        bucket_firings[int((fired - grid_start) // bucket_seconds)] += 1
+    
+    # Ends sort before starts at the same instant so back-to-back runs don't overlap
+    events = sorted([(begin, 1) for begin, _ in intervals] + [(finish, -1) for _, finish in intervals])
+    events.append((end, 0))
+    level, peak, peak_at = 0, 0, start
+    bucket, last_bucket = 0, bucket_count - 1
+    previous, bucket_end = start, grid_start + bucket_seconds
+    current_peak, current_area = 0, 0.0
+    for timestamp, delta in events:
+        if timestamp >= bucket_end and bucket < last_bucket:
+            current_area += level * (bucket_end - previous)
+            if bucket_end > previous and level > current_peak:
+                current_peak = level
+            bucket_peak[bucket], bucket_area[bucket] = current_peak, current_area
+            # Buckets without events hold the current level throughout
+            idle = min(int((timestamp - bucket_end) // bucket_seconds), last_bucket - bucket - 1)
+            for skipped_bucket in range(bucket + 1, bucket + 1 + idle):
+                bucket_peak[skipped_bucket], bucket_area[skipped_bucket] = level, level * bucket_seconds
+            bucket += idle + 1
+            previous = bucket_end + idle * bucket_seconds
+            bucket_end = previous + bucket_seconds
+            current_peak, current_area = 0, 0.0
+        if timestamp > previous:
+            current_area += level * (timestamp - previous)
+            previous = timestamp
+            if level > current_peak:
+                current_peak = level
+        level += delta
+        if delta > 0 and level > current_peak:
+            current_peak = level
+            if level > peak:
+                peak, peak_at = level, timestamp
+    bucket_peak[bucket], bucket_area[bucket] = current_peak, current_area
+    
+    def iso(timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec='seconds')
+    
+    def describe(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {"job_id": job['id'], "job_name": job['name'], "group": job.get('group'), "project": job['project']}
+    
+    def covered(i: int) -> float:
+        low = grid_start + i * bucket_seconds
+        return min(low + bucket_seconds, end) - max(low, start)
+    
+    buckets = [{
+        "start": iso(grid_start + i * bucket_seconds),
+        "firings": bucket_firings[i],
+        "expected_concurrency": round(bucket_area[i] / covered(i), 2) if covered(i) > 0 else 0,
+        "peak_concurrency": bucket_peak[i]
+    } for i in range(bucket_count)]
+    
+    hot = sorted(range(bucket_count), key=lambda i: (bucket_peak[i], bucket_area[i]), reverse=True)
+    hot_spots = []
+    for i in hot[:top]:
+        if not bucket_peak[i]:
+            break
+        low, high = grid_start + i * bucket_seconds, grid_start + (i + 1) * bucket_seconds
+        contributors = []
+        for entry in per_job:
+            duration = entry["job"]['duration_seconds']
+            # Runs overlapping the bucket started within (low - duration, high)
+            running = bisect.bisect_left(entry["starts"], high) - bisect.bisect_right(entry["starts"], low - duration)
+            if running:
+                contributors.append({**describe(entry["job"]), "runs": running})
+        contributors.sort(key=lambda c: c["runs"], reverse=True)
+        hot_spots.append({**buckets[i], "jobs": contributors[:top]})
+    
+    busiest = sorted(per_job, key=lambda e: len(e["starts"]) * e["job"]['duration_seconds'], reverse=True)
+    return {
+        "scheduled_jobs": len(jobs),
+        "firings": len(intervals),
+        "skipped_while_running": skipped_total,
+        "peak_concurrency": peak,
+        "peak_at": iso(peak_at),
+        "average_concurrency": round(sum(bucket_area) / (end - start), 2) if end > start else 0,
+        "hot_spots": hot_spots,
+        "busiest_jobs": [{
+            **describe(e["job"]),
+            "schedule": e["job"]['cron'].expression,
+            "firings": len(e["starts"]),
+            "skipped_while_running": e["skipped"],
+            "expected_duration_seconds": round(e["job"]['duration_seconds'], 1),
+            "duration_source": e["job"]['duration_source'],
+            "busy_seconds": round(len(e["starts"]) * e["job"]['duration_seconds'], 1),
+            "truncated": e["truncated"]
+        } for e in busiest[:top] if e["starts"]],
+        "buckets": [b for b in buckets if b["firings"] or b["peak_concurrency"]]
+    }
+
+
+def node_reliability(executions: List[Dict[str, Any]], min_executions: int = 3,
+                     limit: int = 20) -> Dict[str, Any]:
+    """Per-node success/failure statistics from executions' successfulNodes/failedNodes.
+    
+    Executions are replayed oldest first so each node's current and longest
+    failure streaks are exact. Nodes with fewer than min_executions results
+    are counted but not ranked.
+    """
+    ordered = sorted(
+        (ex for ex in executions if ex.get('successfulNodes') or ex.get('failedNodes')),
+        key=lambda ex: execution_timestamp(ex, 'date-started') or 0.0
+    )
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for ex in ordered:
+        started = execution_timestamp(ex, 'date-started')
+        job_name = (ex.get('job') or {}).get('name', 'Ad-hoc command')
+        for node_name, failed in [(n, False) for n in ex.get('successfulNodes') or []] + \
+                                 [(n, True) for n in ex.get('failedNodes') or []]:
+            node = nodes.get(node_name)
+            if node is None:
+                node = nodes[node_name] = {
+                    "node": node_name, "executions": 0, "failures": 0, "streak": 0,
+                    "longest_failure_streak": 0, "last_failure": None, "last_seen": None,
+                    "projects": set(), "failed_jobs": defaultdict(int)
+                }
+            node["executions"] += 1
+            node["last_seen"] = started
+            if ex.get('project'):
+                node["projects"].add(ex['project'])
+            if failed:
+                node["failures"] += 1
+                node["streak"] += 1
+                node["longest_failure_streak"] = max(node["longest_failure_streak"], node["streak"])
+                node["last_failure"] = started
+                node["failed_jobs"][job_name] += 1
+            else:
+                node["streak"] = 0
+    
+    def iso(timestamp: Optional[float]) -> Optional[str]:
+        return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec='seconds') if timestamp else None
+    
+    ranked = [n for n in nodes.values() if n["executions"] >= min_executions and n["failures"]]
+    ranked.sort(key=lambda n: (n["failures"] / n["executions"], n["streak"], n["failures"]), reverse=True)
+    worst = [{
+        "node": n["node"],
+        "executions": n["executions"],
+        "failures": n["failures"],
+        "failure_rate_percent": round(n["failures"] / n["executions"] * 100, 2),
+        "current_failure_streak": n["streak"],
+        "longest_failure_streak": n["longest_failure_streak"],
+        "last_failure": iso(n["last_failure"]),
+        "last_seen": iso(n["last_seen"]),
+        "projects": sorted(n["projects"]),
+        "top_failing_jobs": dict(sorted(n["failed_jobs"].items(), key=lambda item: item[1], reverse=True)[:3])
+    } for n in ranked[:limit]]
+    
+    total_results = sum(n["executions"] for n in nodes.values())
+    total_failures = sum(n["failures"] for n in nodes.values())
+    return {
+        "executions_with_node_results": len(ordered),
+        "nodes_seen": len(nodes),
+        "nodes_with_failures": sum(1 for n in nodes.values() if n["failures"]),
+        "nodes_failing_now": sum(1 for n in nodes.values() if n["streak"]),
+        "fleet_failure_rate_percent": round(total_failures / total_results * 100, 2) if total_results else 0,
+        "worst_nodes": worst
+    }
+
+
+def execution_anomalies(executions: List[Dict[str, Any]], recent_since: float,
+                        threshold: float = 3.5, min_baseline: int = 10,
+                        limit: int = 20) -> Dict[str, Any]:
+    """Flag duration outliers and duration/failure-rate shifts per job.
+    
+    Finished executions started before recent_since form each job's
+    baseline: the median and MAD of successful durations, and the failure
+    rate. Recent executions are scored with a robust z-score against it,
+    and the recent median duration and failure rate are tested for a shift
+    of at least threshold standard errors. Jobs with fewer than
+    min_baseline baseline runs are counted but not scored.
+    """
+    # One pass splits executions into per-job baseline and recent columns
+    jobs: Dict[str, Dict[str, Any]] = {}
+    analyzed = 0
+    for ex in executions:
+        status = ex.get('status')
+        job = ex.get('job')
+        if status not in TERMINAL_EXECUTION_STATUSES or not job or not job.get('id'):
+            continue
+        started = execution_timestamp(ex, 'date-started')
+        ended = execution_timestamp(ex, 'date-ended')
+        if started is None or ended is None:
+            continue
+        analyzed += 1
+        entry = jobs.get(job['id'])
+        if entry is None:
+            entry = jobs[job['id']] = {
+                "job": job, "project": ex.get('project') or job.get('project'),
+                "baseline": [], "baseline_runs": 0, "baseline_failures": 0,
+                "recent": [], "recent_failures": 0
+            }
+        failed = status in ('failed', 'timedout')
+        if started < recent_since:
+            entry["baseline_runs"] += 1
+            if failed:
+                entry["baseline_failures"] += 1
+            elif status == 'succeeded':
+                entry["baseline"].append(max(ended - started, 0.0))
+        else:
+            entry["recent"].append((max(ended - started, 0.0), status, started, ex.get('id')))
+            if failed:
+                entry["recent_failures"] += 1
+    
+    def iso(timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec='seconds')
+    
+    outliers: List[Dict[str, Any]] = []
+    duration_shifts: List[Dict[str, Any]] = []
+    failure_shifts: List[Dict[str, Any]] = []
+    scored = 0
+    for job_id, entry in jobs.items():
+        if entry["baseline_runs"] < min_baseline or not entry["recent"]:
+            continue
+        scored += 1
+        job = entry["job"]
+        about = {"job_id": job_id, "job_name": job.get('name'), "group": job.get('group') or None,
+                 "project": entry["project"]}
+        
+        baseline = entry["baseline"]
+        if len(baseline) >= min_baseline:
+            baseline.sort()
+            median = statistics.median(baseline)
+            mad = statistics.median([abs(d - median) for d in baseline])
+            # Near-constant jobs would otherwise flag every second of jitter
+            sigma = max(MAD_TO_SIGMA * mad, ANOMALY_MIN_SPREAD_FRACTION * median, ANOMALY_MIN_SPREAD_SECONDS)
+            
+            for duration, status, started, execution_id in entry["recent"]:
+                score = (duration - median) / sigma
+                if abs(score) >= threshold:
+                    outliers.append({
+                        "execution_id": execution_id, **about, "status": status,
+                        "started": iso(started),
+                        "duration_seconds": round(duration, 1),
+                        "baseline_median_seconds": round(median, 1),
+                        "robust_z": round(score, 2),
+                        "direction": "slower" if score > 0 else "faster"
+                    })
+            
+            recent = [d for d, status, _, _ in entry["recent"] if status == 'succeeded']
+            if len(recent) >= 3:
+                recent_median = statistics.median(recent)
+                # Standard error of a median is ~1.2533 sigma / sqrt(n)
+                score = (recent_median - median) / (1.2533 * sigma / len(recent) ** 0.5)
+                change = (recent_median - median) / median if median else 0.0
+                if abs(score) >= threshold and abs(change) >= ANOMALY_MIN_SHIFT_FRACTION:
+                    duration_shifts.append({
+                        **about,
+                        "baseline_median_seconds": round(median, 1),
+                        "recent_median_seconds": round(recent_median, 1),
+                        "change_percent": round(change * 100, 1),
+                        "z": round(score, 2),
+                        "baseline_runs": len(baseline),
+                        "recent_runs": len(recent)
+                    })
+        
+        # Two-proportion z-test; only increases are reported
+        base_runs, base_failures = entry["baseline_runs"], entry["baseline_failures"]
+        recent_runs, recent_failures = len(entry["recent"]), entry["recent_failures"]
+        if recent_runs >= 3:
+            base_rate, recent_rate = base_failures / base_runs, recent_failures / recent_runs
+            pooled = (base_failures + recent_failures) / (base_runs + recent_runs)
+            spread = (pooled * (1 - pooled) * (1 / base_runs + 1 / recent_runs)) ** 0.5
+            if spread and recent_rate > base_rate and (recent_rate - base_rate) / spread >= threshold:
+                failure_shifts.append({
+                    **about,
+                    "baseline_failure_rate_percent": round(base_rate * 100, 1),
+                    "recent_failure_rate_percent": round(recent_rate * 100, 1),
+                    "recent_failures": recent_failures,
+                    "recent_runs": recent_runs,
+                    "z": round((recent_rate - base_rate) / spread, 2)
+                })
+    
+    outliers.sort(key=lambda o: abs(o["robust_z"]), reverse=True)
+    duration_shifts.sort(key=lambda s: abs(s["z"]), reverse=True)
+    failure_shifts.sort(key=lambda s: s["z"], reverse=True)
+    return {
+        "executions_analyzed": analyzed,
+        "jobs_seen": len(jobs),
+        "jobs_scored": scored,
+        "threshold": threshold,
+        "duration_outliers_found": len(outliers),
+        "duration_outliers": outliers[:limit],
+        "duration_shifts": duration_shifts[:limit],
+        "failure_rate_shifts": failure_shifts[:limit]
+    }
+
+
+def flatten_execution_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an execution/{id}/state tree to node -> step context -> state"""
+    nodes: Dict[str, Dict[str, str]] = {}
+    for node_name, steps in (state.get('nodes') or {}).items():
+        nodes[node_name] = {
+            str(step.get('stepctx')): step.get('executionState', 'WAITING') for step in steps or []
+        }
+    # Target nodes that have not started any step yet
+    for node_name in state.get('targetNodes') or []:
+        nodes.setdefault(node_name, {})
+    return {
+        "execution_state": state.get('executionState'),
+        "completed": bool(state.get('completed')),
+        "step_count": state.get('stepCount'),
+        "nodes": nodes
+    }
+
+
+def node_overall_state(steps: Dict[str, str]) -> str:
+    """Summarize a node's step states as one state"""
+    states = set(steps.values())
+    for candidate in ('FAILED', 'ABORTED', 'TIMEDOUT', 'NODE_MIXED', 'RUNNING', 'RUNNING_HANDLER'):
+        if candidate in states:
+            return candidate
+    if states and states <= {'SUCCEEDED', 'NOT_STARTED', 'NODE_PARTIAL'} and 'SUCCEEDED' in states:
+        return 'SUCCEEDED'
+    return 'WAITING'
+
+
+class ExecutionStateTracker:
+    """Snapshots of execution state behind cursor tokens, for incremental polling.
+    
+    Each poll stores the flattened state under a new cursor. Passing that
+    cursor back returns only node and step changes since then, so several
+    clients can follow the same execution independently.
+    """
+
+    def __init__(self, max_cursors: int = EXECUTION_STATE_CURSORS):
+        self.max_cursors = max_cursors
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def diff(self, execution_id: str, state: Dict[str, Any],
+             cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Compare state with the snapshot behind cursor and issue a new cursor"""
+        current = flatten_execution_state(state)
+        with self._lock:
+            previous = self._snapshots.get(cursor) if cursor else None
+            if previous is not None and previous['execution_id'] != str(execution_id):
+                previous = None
+            new_cursor = f"{execution_id}.{os.urandom(6).hex()}"
+            self._snapshots[new_cursor] = {"execution_id": str(execution_id), **current}
+            while len(self._snapshots) > self.max_cursors:
+                self._snapshots.pop(next(iter(self._snapshots)))
+        
+        old_nodes = previous['nodes'] if previous else {}
+        started, finished, failed = [], [], []
+        step_changes = []
+        for node_name, steps in current['nodes'].items():
+            old_steps = old_nodes.get(node_name, {})
+            before, after = node_overall_state(old_steps), node_overall_state(steps)
+            if before != after:
+                if after in ('RUNNING', 'RUNNING_HANDLER') and before == 'WAITING':
+                    started.append(node_name)
+                elif after == 'SUCCEEDED':
+                    finished.append(node_name)
+                elif after in ('FAILED', 'ABORTED', 'TIMEDOUT', 'NODE_MIXED'):
+                    failed.append({"node": node_name, "state": after})
+            for stepctx, step_state in steps.items():
+                if old_steps.get(stepctx) != step_state:
+                    step_changes.append({"node": node_name, "step": stepctx,
+                                         "from": old_steps.get(stepctx), "to": step_state})
+        
+        counts: Dict[str, int] = defaultdict(int)
+        for steps in current['nodes'].values():
+            counts[node_overall_state(steps)] += 1
+        
+        return {
+            "execution_id": execution_id,
+            "cursor": new_cursor,
+            "full_state": previous is None,
+            "execution_state": current['execution_state'],
+            "execution_state_changed": previous is None or previous['execution_state'] != current['execution_state'],
+            "completed": current['completed'],
+            "node_count": len(current['nodes']),
+            "node_states": dict(counts),
+            "nodes_started": started,
+            "nodes_finished": finished,
+            "nodes_failed": failed,
+            "step_changes": step_changes[:EXECUTION_STATE_MAX_CHANGES],
+            "step_changes_truncated": max(len(step_changes) - EXECUTION_STATE_MAX_CHANGES, 0)
+        }
+
+
+def job_path(group: Optional[str], name: Optional[str]) -> str:
+    """Rundeck's group/name path of a job"""
+    return f"{group}/{name}" if group else (name or '')
+
+
+def job_references(definition: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Job reference steps of a definition, including those in error handlers"""
+    refs = []
+    for index, command in enumerate((definition.get('sequence') or {}).get('commands') or []):
+        for step, handler in ((command, False), (command.get('errorhandler') or {}, True)):
+            ref = step.get('jobref')
+            if ref:
+                refs.append({
+                    "uuid": ref.get('uuid') or None,
+                    "project": ref.get('project') or None,
+                    "path": job_path(ref.get('group'), ref.get('name')),
+                    "step": index + 1,
+                    "error_handler": handler
+                })
+    return refs
+
+
+class JobGraph:
+    """Directed graph of job reference steps between job definitions.
+    
+    An edge A -> B means a workflow step or error handler of A runs job B.
+    References are resolved by UUID, or by group/name within the referenced
+    (default: the same) project. Definitions can be loaded a project at a
+    time or replaced one by one; references to jobs that are not loaded
+    yet are resolved as soon as those jobs appear.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.refs: Dict[str, List[Dict[str, Any]]] = {}
+        self.downstream: Dict[str, Set[str]] = defaultdict(set)
+        self.upstream: Dict[str, Set[str]] = defaultdict(set)
+        self.loaded_projects: Dict[str, float] = {}
+        self._paths: Dict[Tuple[str, str], str] = {}
+        # (project, path) -> jobs referencing it by name, resolved or not
+        self._path_dependents: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        self._cycles: Optional[List[List[str]]] = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(job: Dict[str, Any]) -> Tuple[str, str]:
+        return (job['project'], job_path(job.get('group'), job.get('name')))
+
+    def _resolve(self, source: Dict[str, Any], ref: Dict[str, Any]) -> Optional[str]:
+        if ref['uuid']:
+            return str(ref['uuid'])
+        return self._paths.get((ref['project'] or source['project'], ref['path']))
+
+    def _link(self, job_id: str) -> None:
+        for previous in self.downstream.pop(job_id, set()):
+            self.upstream[previous].discard(job_id)
+        source = self.jobs[job_id]
+        for ref in self.refs.get(job_id, []):
+            target = self._resolve(source, ref)
+            if target:
+                self.downstream[job_id].add(target)
+                self.upstream[target].add(job_id)
+
+    def _remove(self, job_id: str) -> Set[str]:
+        """Drop a job's own entries; returns the jobs that referenced its path"""
+        job = self.jobs.pop(job_id)
+        key = self._key(job)
+        if self._paths.get(key) == job_id:
+            del self._paths[key]
+        for ref in self.refs.pop(job_id, []):
+            if not ref['uuid']:
+                self._path_dependents[(ref['project'] or job['project'], ref['path'])].discard(job_id)
+        for target in self.downstream.pop(job_id, set()):
+            self.upstream[target].discard(job_id)
+        return set(self._path_dependents.get(key, ()))
+
+    def update(self, definition: Dict[str, Any], project: Optional[str] = None) -> bool:
+        """Add or replace one job definition; False if it lacks an id or project"""
+        job_id = definition.get('id') or definition.get('uuid')
+        project = definition.get('project') or project
+        with self._lock:
+            if job_id and not project and job_id in self.jobs:
+                project = self.jobs[job_id]['project']
+            if not job_id or not project:
+                return False
+            relink = self._remove(job_id) if job_id in self.jobs else set()
+            job = {"id": job_id, "name": definition.get('name'), "group": definition.get('group') or None,
+                   "project": project, "scheduled": bool(definition.get('schedule')) and
+                   definition.get('scheduleEnabled', True) is not False}
+            key = self._key(job)
+            self.jobs[job_id] = job
+            self._paths[key] = job_id
+            self.refs[job_id] = job_references(definition)
+            for ref in self.refs[job_id]:
+                if not ref['uuid']:
+                    self._path_dependents[(ref['project'] or project, ref['path'])].add(job_id)
+            relink |= self._path_dependents.get(key, set())
+            relink.add(job_id)
+            for source in relink:
+                if source in self.jobs:
+                    self._link(source)
+            self._cycles = None
+            return True
+
+    def load_project(self, project: str, definitions: Iterator[Dict[str, Any]]) -> int:
+        """Replace every job of a project with a freshly exported set"""
+        with self._lock:
+            seen = set()
+            for definition in definitions:
+                if self.update(definition, project):
+                    seen.add(definition.get('id') or definition.get('uuid'))
+            for job_id in [j for j, job in self.jobs.items() if job['project'] == project and j not in seen]:
+                for source in self._remove(job_id):
+                    if source in self.jobs:
+                        self._link(source)
+            self.loaded_projects[project] = time.time()
+            self._cycles = None
+            return len(seen)
+
+    def _walk(self, job_id: str, edges: Dict[str, Set[str]], max_depth: Optional[int]) -> List[Tuple[str, int]]:
+        depths = {job_id: 0}
+        queue = deque([job_id])
+        while queue:
+            current = queue.popleft()
+            if max_depth is not None and depths[current] >= max_depth:
+                continue
+            for neighbour in edges.get(current, ()):
+                if neighbour not in depths:
+                    depths[neighbour] = depths[current] + 1
+                    queue.append(neighbour)
+        del depths[job_id]
+        return sorted(depths.items(), key=lambda item: (item[1], item[0]))
+
+    def describe(self, job_id: str) -> Dict[str, Any]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return {"id": job_id, "loaded": False}
+        return {"id": job_id, "name": job['name'], "group": job['group'], "project": job['project']}
+
+    def cycles(self) -> List[List[str]]:
+        """Strongly connected components with a loop (Tarjan's algorithm, iterative)"""
+        with self._lock:
+            if self._cycles is not None:
+                return self._cycles
+            index: Dict[str, int] = {}
+            lowlink: Dict[str, int] = {}
+            on_stack: Set[str] = set()
+            stack: List[str] = []
+            found: List[List[str]] = []
+            for root in list(self.downstream):
+                if root in index:
+                    continue
+                work = [(root, iter(self.downstream.get(root, ())))]
+                index[root] = lowlink[root] = len(index)
+                stack.append(root)
+                on_stack.add(root)
+                while work:
+                    node, neighbours = work[-1]
+                    advanced = False
+                    for neighbour in neighbours:
+                        if neighbour not in index:
+                            index[neighbour] = lowlink[neighbour] = len(index)
+                            stack.append(neighbour)
+                            on_stack.add(neighbour)
+                            work.append((neighbour, iter(self.downstream.get(neighbour, ()))))
+                            advanced = True
+                            break
+                        if neighbour in on_stack:
+                            lowlink[node] = min(lowlink[node], index[neighbour])
+                    if advanced:
+                        continue
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.downstream.get(node, ()):
+                            found.append(sorted(component))
+            self._cycles = found
+            return found
+
+    def query(self, job_id: str, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """Callers, callees and the entry points affected by a change to one job"""
+        with self._lock:
+            upstream = self._walk(job_id, self.upstream, max_depth)
+            downstream = self._walk(job_id, self.downstream, max_depth)
+            callers = [j for j, _ in self._walk(job_id, self.upstream, None)]
+            # Entry points: affected callers nothing else calls, or that run on a schedule
+            entry_points = [j for j in callers if not self.upstream.get(j) or self.jobs.get(j, {}).get('scheduled')]
+            return {
+                "job": self.describe(job_id),
+                "upstream": [{**self.describe(j), "depth": depth} for j, depth in upstream],
+                "downstream": [{**self.describe(j), "depth": depth} for j, depth in downstream],
+                "impact": {
+                    "affected_jobs": len(callers),
+                    "affected_projects": sorted({self.jobs[j]['project'] for j in callers if j in self.jobs}),
+                    "entry_points": [{**self.describe(j), "scheduled": self.jobs.get(j, {}).get('scheduled', False)}
+                                     for j in entry_points]
+                },
+                "cycles": [[self.describe(j) for j in cycle] for cycle in self.cycles() if job_id in cycle]
+            }
+
+    def summary(self, projects: Sequence[str], limit: int = 20) -> Dict[str, Any]:
+        """Size, most-referenced jobs, cycles and unresolved references of the loaded graph"""
+        with self._lock:
+            scope = {j for j, job in self.jobs.items() if job['project'] in projects}
+            edges = sum(len(self.downstream.get(j, ())) for j in scope)
+            referenced = sorted(
+                ((j, len(callers)) for j, callers in self.upstream.items() if callers and (j in scope or j not in self.jobs)),
+                key=lambda item: item[1], reverse=True
+            )
+            unresolved = [
+                {"from": self.describe(j), "step": ref['step'], "project": ref['project'] or self.jobs[j]['project'],
+                 "job": ref['uuid'] or ref['path']}
+                for j in scope for ref in self.refs.get(j, [])
+                if (self._resolve(self.jobs[j], ref) or '') not in self.jobs
+            ]
+            return {
+                "jobs": len(scope),
+                "references": edges,
+                "jobs_calling_others": sum(1 for j in scope if self.downstream.get(j)),
+                "jobs_called_by_others": sum(1 for j in scope if self.upstream.get(j)),
+                "most_referenced": [{**self.describe(j), "callers": count} for j, count in referenced[:limit]],
+                "cycles": [[self.describe(j) for j in cycle] for cycle in self.cycles()
+                           if any(j in scope for j in cycle)],
+                "unresolved_references": unresolved[:limit],
+                "unresolved_reference_count": len(unresolved)
+            }
+
+
+class ExecutionFetchPlanner:
+    """Answers execution queries from recently fetched, wider execution windows.
+    
+    Each completed get_all_executions fetch is remembered with its filters.
+    A later query for the same project whose filters are equal or narrower
+    and whose time window lies inside the fetched one is filtered locally
+    instead of downloading the overlapping pages again.
+    """
+
+    def __init__(self, ttl_seconds: float = FETCH_PLANNER_TTL_SECONDS,
+                 max_entries: int = FETCH_PLANNER_MAX_ENTRIES, namespace: str = ''):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self._entries: List[Dict[str, Any]] = []
+        # Shared cache keys already read, with the store time of the copy read
+        self._adopted: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _cutoff(window_seconds: Optional[float], now: float) -> Optional[float]:
+        return None if window_seconds is None else now - window_seconds
+
+    @staticmethod
+    def _matches(execution: Dict[str, Any], status: Optional[str], user: Optional[str],
+                 job_id: Optional[str], cutoff: Optional[float]) -> bool:
+        if status and execution.get('status') != status:
+            return False
+        if user and execution.get('user') != user:
+            return False
+        if job_id and (execution.get('job') or {}).get('id') != job_id:
+            return False
+        if cutoff is not None:
+            # recentFilter selects on completion time; running executions have none
+            ended = execution_timestamp(execution, 'date-ended')
+            if ended is not None and ended < cutoff:
+                return False
+        return True
+
+    def _answer(self, entry: Dict[str, Any], status: Optional[str], user: Optional[str],
+                job_id: Optional[str], window_seconds: Optional[float],
+                max_total: int, now: float) -> Optional[List[Dict[str, Any]]]:
+        for key, wanted in (('status', status), ('user', user), ('job_id', job_id)):
+            if entry[key] is not None and entry[key] != wanted:
+                return None
+        
+        entry_cutoff = self._cutoff(entry['window_seconds'], entry['fetched_at'])
+        cutoff = self._cutoff(window_seconds, now)
+        if entry_cutoff is not None and (cutoff is None or cutoff < entry_cutoff):
+            return None
+        
+        selected = []
+        for execution in entry['executions']:
+            if self._matches(execution, status, user, job_id, cutoff):
+                selected.append(execution)
+                if len(selected) >= max_total:
+                    # The newest max_total matches are all inside the window
+                    return selected
+        
+        if entry['complete']:
+            return selected
+        # A truncated fetch covers the query only if it reaches back past its cutoff
+        if cutoff is not None and entry['oldest'] is not None and entry['oldest'] <= cutoff:
+            return selected
+        return None
+
+    def lookup(self, project: str, status: Optional[str], user: Optional[str],
+               job_id: Optional[str], recent_filter: Optional[str],
+               max_total: int) -> Optional[List[Dict[str, Any]]]:
+        """Return the executions for a query if a cached superset covers it"""
+        found = self.lookup_window(project, status, user, job_id, recent_filter, max_total)
+        return None if found is None else found[0]
+
+    def lookup_window(self, project: str, status: Optional[str], user: Optional[str],
+                      job_id: Optional[str], recent_filter: Optional[str],
+                      max_total: int) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """Like lookup, also returning when the answering window was fetched"""
+        if self.ttl_seconds <= 0:
+            return None
+        try:
+            window_seconds = parse_recent_filter(recent_filter)
+        except ValueError:
+            return None
+        
+        now = time.time()
+        with self._lock:
+            self._entries = [e for e in self._entries if now - e['fetched_at'] <= self.ttl_seconds]
+            self._adopted = {k: t for k, t in self._adopted.items() if now - t <= self.ttl_seconds}
+            found = self._lookup_locked(project, status, user, job_id, window_seconds, max_total, now)
+        if found is None and shared_cache is not None:
+            # Adopt windows fetched by other server processes, then retry
+            adopted = self._adopt_shared(project)
+            if adopted:
+                with self._lock:
+                    known = {(e['project'], e['fetched_at']) for e in self._entries}
+                    self._entries.extend(e for e in adopted if (e['project'], e['fetched_at']) not in known)
+                    del self._entries[:-self.max_entries]
+                    found = self._lookup_locked(project, status, user, job_id, window_seconds, max_total, now)
+        with self._lock:
+            if found is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return found
+
+    def _adopt_shared(self, project: str) -> List[Dict[str, Any]]:
+        """Read the shared windows for a project not yet adopted, outside the planner lock.
+        
+        Only key names are listed; each window is read and decompressed once
+        per store, so repeated misses don't rescan the stored windows.
+        """
+        cache = shared_cache
+        if cache is None:
+            return []
+        adopted = []
+        for key, stored_at in cache.keys(f"executions|{self.namespace}|{project}|", self.ttl_seconds):
+            with self._lock:
+                if self._adopted.get(key) == stored_at:
+                    continue
+                self._adopted[key] = stored_at
+            entry = cache.get(key, self.ttl_seconds)
+            if entry is not None:
+                adopted.append(entry)
+        return adopted
+
+    def _lookup_locked(self, project: str, status: Optional[str], user: Optional[str],
+                       job_id: Optional[str], window_seconds: Optional[float],
+                       max_total: int, now: float) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        for entry in self._entries:
+            if entry['project'] != project:
+                continue
+            result = self._answer(entry, status, user, job_id, window_seconds, max_total, now)
+            if result is not None:
+                # Keep recently useful windows at the back of the eviction order
+                self._entries.remove(entry)
+                self._entries.append(entry)
+                return result, entry['fetched_at']
+        return None
+
+    def record(self, project: str, status: Optional[str], user: Optional[str],
+               job_id: Optional[str], recent_filter: Optional[str], max_total: int,
+               executions: List[Dict[str, Any]]) -> None:
+        """Remember a completed fetch so narrower queries can reuse it"""
+        if self.ttl_seconds <= 0:
+            return
+        try:
+            window_seconds = parse_recent_filter(recent_filter)
+        except ValueError:
+            return
+        
+        ended = [t for t in (execution_timestamp(e, 'date-ended') for e in executions) if t is not None]
+        entry = {
+            'project': project,
+            'status': status,
+            'user': user,
+            'job_id': job_id,
+            'window_seconds': window_seconds,
+            'fetched_at': time.time(),
+            'complete': len(executions) < max_total,
+            'oldest': min(ended) if ended else None,
+            'executions': executions,
+        }
+        with self._lock:
+            # A refetch of the same query (e.g. by the prefetcher) supersedes the older window
+            self._entries = [
+                e for e in self._entries
+                if (e['project'], e['status'], e['user'], e['job_id'], e['window_seconds'])
+                != (project, status, user, job_id, window_seconds)
+            ]
+            self._entries.append(entry)
+            if len(self._entries) > self.max_entries:
+                self._entries.pop(0)
+        if shared_cache is not None:
+            key = f"executions|{self.namespace}|{project}|{status}|{user}|{job_id}|{recent_filter}|{max_total}"
+            stored_at = shared_cache.put(key, entry)
+            if stored_at is not None:
+                # This process already holds the window it shared
+                with self._lock:
+                    self._adopted[key] = stored_at
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "cached_executions": sum(len(e['executions']) for e in self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class OutputSpool:
+    """Temporary file holding the log entries of one output as JSON lines.
+    
+    Entries are spooled as they stream in, so an output can be archived
+    after the caller has read it without keeping the entries in memory.
+    """
+
+    def __init__(self) -> None:
+        self._file = tempfile.TemporaryFile()
+
+    def __enter__(self) -> 'OutputSpool':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._file.close()
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json_bytes(entry) + b'\n')
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._file.seek(0)
+        for line in self._file:
+            yield json_loads(line)
+
+
+class ExecutionLogArchive:
+    """Compressed store of completed execution outputs with an FTS5 line index.
+    
+    Each output is kept in SQLite as zlib-compressed JSON lines: the output
+    fields other than its entries, then one log entry per line, so entries
+    are compressed and read back one at a time. Each log line is indexed in
+    a contentless FTS5 table whose rowid encodes the archived output and
+    line number, so snippets are read back from the compressed blob.
+    Oldest outputs are evicted once the archive exceeds its size budget.
+    """
+
+    LINE_SLOTS = 1 << 20  # Max indexed lines per execution
+
+    def __init__(self, directory: str, max_bytes: int):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.path = str(Path(directory) / "execution_logs.db")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS outputs (
+                id INTEGER PRIMARY KEY,
+                server TEXT NOT NULL,
+                execution_id TEXT NOT NULL,
+                archived_at REAL NOT NULL,
+                lines INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                UNIQUE (server, execution_id)
+            );
+            CREATE INDEX IF NOT EXISTS outputs_archived_at ON outputs (archived_at);
+            CREATE VIRTUAL TABLE IF NOT EXISTS log_lines USING fts5(line, content='');
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _blob_lines(data: bytes) -> Iterator[bytes]:
+        """Decompress an archived blob a chunk at a time, yielding its lines"""
+        decompressor = zlib.decompressobj()
+        pending = b''
+        for start in range(0, len(data), STREAM_CHUNK_BYTES):
+            compressed = data[start:start + STREAM_CHUNK_BYTES]
+            while compressed:
+                pending += decompressor.decompress(compressed, STREAM_CHUNK_BYTES)
+                compressed = decompressor.unconsumed_tail
+                *lines, pending = pending.split(b'\n')
+                yield from lines
+        pending += decompressor.flush()
+        yield from (line for line in pending.split(b'\n') if line)
+
+    @classmethod
+    def _read_blob(cls, data: bytes) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """The output fields and a lazy iterator over the entries of a blob"""
+        lines = cls._blob_lines(data)
+        envelope = json_loads(next(lines))
+        return envelope, (json_loads(line) for line in lines if line)
+
+    @classmethod
+    def _index_rows(cls, base: int, entries: Iterator[Dict[str, Any]]) -> Iterator[Tuple[int, str]]:
+        """FTS rows (rowid, line) of the non-empty indexed lines of an output"""
+        for index, entry in enumerate(entries):
+            if index >= cls.LINE_SLOTS:
+                return
+            line = str(entry.get('log', ''))
+            if line:
+                yield base + index, line
+
+    def read(self, server: str, execution_id: str) -> Optional[Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]]:
+        """An archived output as its fields and a lazy iterator over its entries, if present"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM outputs WHERE server = ? AND execution_id = ?",
+                (server, str(execution_id))
+            ).fetchone()
+        return self._read_blob(row[0]) if row else None
+
+    def store(self, server: str, execution_id: str, envelope: Dict[str, Any],
+              entries: Iterable[Dict[str, Any]]) -> None:
+        """Archive and index a completed execution output, reading its entries once"""
+        compressor = zlib.compressobj()
+        parts = [compressor.compress(json_bytes(envelope) + b'\n')]
+        counts = {"lines": 0, "text": 0}
+        
+        def compressed(entries: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            for entry in entries:
+                parts.append(compressor.compress(json_bytes(entry) + b'\n'))
+                counts["lines"] += 1
+                counts["text"] += len(str(entry.get('log', '')))
+                yield entry
+        
+        with self._lock:
+            if self._conn.execute(
+                "SELECT 1 FROM outputs WHERE server = ? AND execution_id = ?",
+                (server, str(execution_id))
+            ).fetchone():
+                return
+            cursor = self._conn.execute(
+                "INSERT INTO outputs (server, execution_id, archived_at, lines, size, data) "
+                "VALUES (?, ?, ?, 0, 0, x'')",
+                (server, str(execution_id), time.time())
+            )
+            output_id = cursor.lastrowid
+            if output_id is None:
+                raise sqlite3.DatabaseError("Archived output was not assigned a row id")
+            # Entries are compressed and indexed in a single pass
+            stream = compressed(entries)
+            self._conn.executemany(
+                "INSERT INTO log_lines (rowid, line) VALUES (?, ?)",
+                self._index_rows(output_id * self.LINE_SLOTS, stream)
+            )
+            # Entries past the indexed lines are still archived
+            for _ in stream:
+                pass
+            parts.append(compressor.flush())
+            data = b''.join(parts)
+            self._conn.execute(
+                "UPDATE outputs SET lines = ?, size = ?, data = ? WHERE id = ?",
+                (min(counts["lines"], self.LINE_SLOTS), len(data) + counts["text"], data, output_id)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop the oldest outputs until the archive fits its size budget"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM outputs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for output_id, size in self._conn.execute(
+            "SELECT id, size FROM outputs ORDER BY archived_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            data = self._conn.execute("SELECT data FROM outputs WHERE id = ?", (output_id,)).fetchone()[0]
+            # Contentless FTS rows are removed by replaying their original values
+            self._conn.executemany(
+                "INSERT INTO log_lines (log_lines, rowid, line) VALUES ('delete', ?, ?)",
+                self._index_rows(output_id * self.LINE_SLOTS, self._read_blob(data)[1])
+            )
+            self._conn.execute("DELETE FROM outputs WHERE id = ?", (output_id,))
+            total -= size
+
+    def search(self, server: str, query: str, limit: int = 50) -> Dict[str, Any]:
+        """Full-text search archived log lines, grouped by execution"""
+        started = time.perf_counter()
+        # Only lines of this server's outputs are counted and returned
+        sql = ("SELECT log_lines.rowid FROM log_lines JOIN outputs ON outputs.id = log_lines.rowid / ? "
+               "WHERE log_lines MATCH ? AND outputs.server = ? ORDER BY log_lines.rank")
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, (self.LINE_SLOTS, query, server)).fetchall()
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax, search for the literal phrase instead
+                phrase = '"' + query.replace('"', '""') + '"'
+                rows = self._conn.execute(sql, (self.LINE_SLOTS, phrase, server)).fetchall()
+            
+            matches_by_output: Dict[int, List[int]] = defaultdict(list)
+            for (rowid,) in rows:
+                matches_by_output[rowid // self.LINE_SLOTS].append(rowid % self.LINE_SLOTS)
+            
+            executions: List[Dict[str, Any]] = []
+            total_matches = 0
+            for output_id, line_numbers in matches_by_output.items():
+                total_matches += len(line_numbers)
+                if len(executions) >= limit:
+                    continue
+                row = self._conn.execute(
+                    "SELECT execution_id, data FROM outputs WHERE id = ?", (output_id,)
+                ).fetchone()
+                if not row:
+                    continue
+                wanted = sorted(line_numbers)[:5]
+                found: Dict[int, Dict[str, Any]] = {}
+                for index, entry in enumerate(self._read_blob(row[1])[1]):
+                    if index in wanted:
+                        found[index] = entry
+                    if index >= wanted[-1]:
+                        break
+                snippets = []
+                for line_no in wanted:
+                    entry = found.get(line_no, {})
+                    snippets.append({
+                        "line_number": line_no + 1,
+                        "node": entry.get('node'),
+                        "time": entry.get('time'),
+                        "level": entry.get('level'),
+                        "text": str(entry.get('log', ''))[:240]
+                    })
+                executions.append({
+                    "execution_id": row[0],
+                    "match_count": len(line_numbers),
+                    "nodes": sorted({s['node'] for s in snippets if s['node']}),
+                    "snippets": snippets
+                })
+            
+            archived = self._conn.execute(
+                "SELECT COUNT(*) FROM outputs WHERE server = ?", (server,)
+            ).fetchone()[0]
+        
+        return {
+            "query": query,
+            "executions_matched": len(matches_by_output),
+            "lines_matched": total_matches,
+            "archived_executions": archived,
+            "executions": executions,
+            "search_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+
+class SharedCache:
+    """Size-bounded LRU cache of JSON values in SQLite, shared between processes.
+    
+    The database runs in WAL mode so several server processes can read while
+    one writes. Values are zlib-compressed JSON; least recently used entries
+    are evicted once the total size exceeds max_bytes. Hits only note their
+    access time in memory; the notes are written with the next store.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.path = str(Path(directory) / "shared_cache.db")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+        """)
+        self._conn.commit()
+        # Access times of hits not yet written, keyed by cache key
+        self._touched: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, max_age: float) -> Optional[Any]:
+        """Return a value stored less than max_age seconds ago"""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data FROM entries WHERE key = ? AND stored_at >= ?", (key, now - max_age)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+                self._touched[key] = now
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache read failed for {key}: {e}")
+            return None
+        return json_loads(zlib.decompress(row[0]))
+
+    def keys(self, prefix: str, max_age: float) -> List[Tuple[str, float]]:
+        """Keys and store times of values stored less than max_age seconds ago under a prefix"""
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, stored_at FROM entries WHERE key >= ? AND key < ? AND stored_at >= ?",
+                    (prefix, prefix + '\uffff', time.time() - max_age)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache scan failed for {prefix}: {e}")
+            return []
+        return [(key, stored_at) for key, stored_at in rows]
+
+    def put(self, key: str, value: Any) -> Optional[float]:
+        """Store a value, evicting least recently used entries beyond the size budget.
+        
+        Returns the store time, or None if the value was not stored.
+        """
+        data = zlib.compress(json_bytes(value))
+        if len(data) > self.max_bytes:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, stored_at, accessed_at, size, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, now, now, len(data), data)
+                )
+                self._touched.pop(key, None)
+                self._flush_touched()
+                self._evict()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache write failed for {key}: {e}")
+            return None
+        return now
+
+    def _flush_touched(self) -> None:
+        """Write the access times noted by hits, in the store's transaction"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(at, key) for key, at in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its size budget"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "size_mb": round(size / 1024 / 1024, 2),
+            "max_size_mb": round(self.max_bytes / 1024 / 1024, 2),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+ERROR_LINE_PATTERN = re.compile(
+    r'error|exception|fail|fatal|refused|denied|timed? ?out|unreachable|not found|traceback',
+    re.IGNORECASE
+)
+
+# Volatile fragments stripped from error lines before clustering, most specific first
+LOG_NORMALIZATION_RULES = [
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.I), '<uuid>'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:z|[+-]\d{2}:?\d{2})?', re.I), '<ts>'),
+    (re.compile(r'\b\d{4}-\d{2}-\d{2}\b'), '<date>'),
+    (re.compile(r'\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b'), '<time>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'), '<ip>'),
+    (re.compile(r'\b(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,}(?::\d+)?\b', re.I), '<host>'),
+    (re.compile(r'\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b', re.I), '<hex>'),
+    (re.compile(r'\d+'), '<n>'),
+]
+
+
+def normalize_log_line(line: str) -> str:
+    """Strip IDs, timestamps, hosts and numbers so recurring errors compare equal"""
+    for pattern, replacement in LOG_NORMALIZATION_RULES:
+        line = pattern.sub(replacement, line)
+    return ' '.join(line.lower().split())
+
+
+def extract_error_lines(entries: Iterable[Dict[str, Any]], max_lines: int = 3) -> List[str]:
+    """Pick the lines of an execution output most likely to describe its failure.
+    
+    Prefers ERROR/SEVERE entries, then lines that look like errors, then the
+    last lines. The entries are read once, keeping only these candidates.
+    """
+    levelled: List[str] = []
+    matching: List[str] = []
+    last: deque = deque(maxlen=max_lines)
+    for entry in entries:
+        line = str(entry.get('log', ''))
+        if not line.strip():
+            continue
+        if len(levelled) < max_lines and str(entry.get('level', '')).upper() in ('ERROR', 'SEVERE'):
+            levelled.append(line)
+        if len(matching) < max_lines and ERROR_LINE_PATTERN.search(line):
+            matching.append(line)
+        last.append(line)
+    return [line.strip() for line in levelled or matching or list(last)]
+
+
+def _stable_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+# Random but fixed (a, b) pairs for the MinHash permutations h(x) = (a*x + b) mod p
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_PARAMS = [
+    (_stable_hash(f"a{i}") % (_MINHASH_PRIME - 1) + 1, _stable_hash(f"b{i}") % _MINHASH_PRIME)
+    for i in range(MINHASH_PERMUTATIONS)
+]
+
+
+def minhash_signature(text: str) -> List[int]:
+    """MinHash signature over word trigrams (or words for very short lines)"""
+    words = text.split()
+    shingles = {' '.join(words[i:i + 3]) for i in range(max(1, len(words) - 2))} or {text}
+    hashes = [_stable_hash(shingle) for shingle in shingles]
+    return [min((a * h + b) % _MINHASH_PRIME for h in hashes) for a, b in _MINHASH_PARAMS]
+
+
+def cluster_signatures(signatures: Dict[str, List[int]], threshold: float) -> List[List[str]]:
+    """Group near-duplicate signatures using LSH banding and union-find"""
+    parent = {key: key for key in signatures}
+    
+    def find(key: str) -> str:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+    
+    rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+    for band in range(MINHASH_BANDS):
+        buckets: Dict[tuple, List[str]] = defaultdict(list)
+        for key, signature in signatures.items():
+            buckets[tuple(signature[band * rows:(band + 1) * rows])].append(key)
+        for members in buckets.values():
+            first = members[0]
+            for other in members[1:]:
+                if find(first) == find(other):
+                    continue
+                matching = sum(1 for x, y in zip(signatures[first], signatures[other]) if x == y)
+                if matching / MINHASH_PERMUTATIONS >= threshold:
+                    parent[find(other)] = find(first)
+    
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for key in signatures:
+        groups[find(key)].append(key)
+    return list(groups.values())
+
+
+def json_loads(data: Any) -> Any:
+    """Decode JSON with orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_bytes(value: Any) -> bytes:
+    """Compact JSON encoding, with orjson when installed"""
+    if orjson is not None:
+        try:
+            data: bytes = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+            return data
+        except TypeError:
+            pass
+    return json.dumps(value).encode('utf-8')
+
+
+def to_json_text(value: Any) -> str:
+    """Indented JSON for tool results, with orjson when installed"""
+    if orjson is not None:
+        try:
+            data: bytes = orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            return data.decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(value, indent=2)
+
+
+# Elements are decoded one call at a time, which loses the key sharing json.loads does
+# within a document; interning keeps thousands of executions from each owning their keys
+_json_decoder = json.JSONDecoder(object_pairs_hook=lambda pairs: {sys.intern(k): v for k, v in pairs})
+_json_whitespace = re.compile(r'[ \t\n\r]*')
+
+
+def iter_json_items(chunks: Iterator[bytes], array_key: Optional[str] = None,
+                    envelope: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """Yield the elements of a JSON array as its bytes arrive.
+    
+    The array is either the whole document or the top-level member named
+    array_key; the other top-level members are decoded into envelope. Only
+    one element is held at a time, so memory stays flat however long the
+    array is.
+    """
+    chunks = iter(chunks)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buf, pos, eof = '', 0, False
+    
+    def fill() -> None:
+        nonlocal buf, pos, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            text = decoder.decode(b'', final=True)
+        else:
+            text = decoder.decode(chunk)
+        buf, pos = buf[pos:] + text, 0
+    
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            # The pattern also matches the empty string, so a match always exists
+            match = _json_whitespace.match(buf, pos)
+            pos = match.end() if match else pos
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                return ''
+            fill()
+    
+    def value() -> Any:
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                item, end = _json_decoder.raw_decode(buf, pos)
+                # Objects, arrays and strings end on a delimiter; bare numbers may continue
+                if eof or buf[end - 1] in '}]"' or (end < len(buf) and buf[end] in ',]} \t\n\r'):
+                    pos = end
+                    return item
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # Read until the pending text doubles, so large values are not re-scanned per chunk
+            wanted = 2 * (len(buf) - pos) + 1
+            while not eof and len(buf) - pos < wanted:
+                fill()
+    
+    def expect(delimiters: str) -> str:
+        nonlocal pos
+        char = peek()
+        if not char or char not in delimiters:
+            raise json.JSONDecodeError(f"Expected one of {delimiters!r}", buf, pos)
+        pos += 1
+        return char
+    
+    def array() -> Iterator[Any]:
+        expect('[')
+        if peek() == ']':
+            expect(']')
+            return
+        while True:
+            yield value()
+            if expect(',]') == ']':
+                return
+    
+    first = peek()
+    if not first:
+        # An empty body holds no items, as an empty non-streamed response decodes to {}
+        return
+    if first == '[':
+        yield from array()
+        return
+    expect('{')
+    if peek() == '}':
+        return
+    while True:
+        key = value()
+        expect(':')
+        if key == array_key and peek() == '[':
+            yield from array()
+        else:
+            member = value()
+            if envelope is not None:
+                envelope[key] = member
+        if expect(',}') == '}':
+            return
+
+
+# Tool arguments and request fields whose values may be secrets (job option values)
+REDACTED_FIELDS = ('options',)
+REDACTED = '<redacted>'
+
+
+def redact_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of tool arguments or a request body safe to trace: option names kept, values hidden"""
+    redacted = dict(arguments)
+    for field in REDACTED_FIELDS:
+        value = redacted.get(field)
+        if isinstance(value, dict):
+            redacted[field] = {key: REDACTED for key in value}
+        elif value is not None:
+            redacted[field] = REDACTED
+    return redacted
+
+
+def cassette_key(method: str, url: str, body: Any = None) -> str:
+    """Server-independent key for a Rundeck API request: method, endpoint, query and body.
+    
+    Job option values in the body are redacted, so keys hold no secrets and
+    launches replayed from a redacted tool trace still match.
+    """
+    parsed = urlparse(url)
+    endpoint = re.sub(r'^.*?/api/\d+/', '', parsed.path)
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', errors='replace')
+    if body and any(field in body for field in REDACTED_FIELDS):
+        try:
+            decoded = json_loads(body)
+        except ValueError:
+            decoded = None
+        if isinstance(decoded, dict):
+            body = json.dumps(redact_arguments(decoded), sort_keys=True)
+    return f"{method.upper()} {endpoint}?{query} {body or ''}"
+
+
+class JsonLinesWriter:
+    """Thread-safe appender of JSON records to a (optionally gzipped) JSON-lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(path, 'at', encoding='utf-8') if path.endswith('.gz') else open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def read_json_lines(path: str) -> List[Dict[str, Any]]:
+    """Read a (optionally gzipped) JSON-lines file, tolerating a truncated tail"""
+    records = []
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        try:
+            for line in f:
+                if line.strip():
+                    records.append(json.loads(line))
+        except (EOFError, json.JSONDecodeError) as e:
+            logger.warning(f"Stopped reading {path} at a truncated record: {e}")
+    return records
+
+
+class ReplayAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter serving Rundeck responses from a recorded cassette.
+    
+    Identical requests are answered in recorded order, repeating the last
+    recording once exhausted. Recorded latency is reproduced, scaled by
+    RUNDECK_REPLAY_LATENCY_SCALE (0 replays instantly).
+    """
+
+    def __init__(self, cassette_path: str, latency_scale: float = REPLAY_LATENCY_SCALE):
+        super().__init__()
+        self.latency_scale = latency_scale
+        self._recordings: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for record in read_json_lines(cassette_path):
+            self._recordings[record['key']].append(record)
+        self._positions: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        logger.info(f"Replaying {sum(len(r) for r in self._recordings.values())} recorded responses from {cassette_path}")
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout: Any = None,
+             verify: Union[bool, str] = True, cert: Any = None,
+             proxies: Optional[Mapping[str, str]] = None) -> requests.Response:
+        key = cassette_key(request.method or 'GET', request.url or '', request.body)
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if recordings:
+                position = self._positions[key]
+                record = recordings[min(position, len(recordings) - 1)]
+                self._positions[key] = position + 1
+            else:
+                record = None
+        
+        response = requests.Response()
+        response.request = request
+        response.url = request.url or ''
+        if record is None:
+            logger.warning(f"No recorded response for {key}")
+            response.status_code = 404
+            response.raw = io.BytesIO(json.dumps({"error": True, "message": "Not in cassette"}).encode('utf-8'))
+            return response
+        
+        if self.latency_scale > 0:
+            time.sleep(record['latency_ms'] / 1000.0 * self.latency_scale)
+        response.status_code = record['status']
+        response.headers['Content-Type'] = record.get('content_type') or 'application/json'
+        response.raw = io.BytesIO(record['content'].encode('utf-8'))
+        response.encoding = 'utf-8'
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class OperationCancelled(Exception):
+    """Raised when the MCP client cancels a tool call that is still running"""
+
+
+class ToolProgress:
+    """Progress reporting and cancellation for a tool call running on a worker thread"""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, session: Any = None,
+                 progress_token: Any = None, request_id: Any = None):
+        self.loop = loop
+        self.session = session
+        self.progress_token = progress_token
+        self.request_id = request_id
+        self._cancelled = threading.Event()
+        self._progress = 0.0
+
+    def report(self, progress: float, total: Optional[float] = None,
+               message: Optional[str] = None) -> None:
+        """Send an MCP progress notification if the caller asked for them"""
+        if message:
+            logger.debug(f"Progress: {message}")
+        if self.session is None or self.progress_token is None or self.loop is None:
+            return
+        # Progress must increase monotonically for each token
+        self._progress = max(self._progress, progress)
+        asyncio.run_coroutine_threadsafe(
+            self.session.send_progress_notification(
+                self.progress_token, self._progress, total=total, message=message,
+                related_request_id=self.request_id
+            ),
+            self.loop
+        )
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check_cancelled(self) -> None:
+        if self._cancelled.is_set():
+            raise OperationCancelled("Tool call cancelled by the client")
+
+    def wait(self, seconds: float) -> None:
+        """Sleep for up to seconds, waking immediately on cancellation"""
+        if self._cancelled.wait(seconds):
+            raise OperationCancelled("Tool call cancelled by the client")
+
+
+class Span:
+    """A timed operation with attributes, nested under the span active when it started"""
+
+    KINDS = {'INTERNAL': 1, 'SERVER': 2, 'CLIENT': 3}
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_span_id: Optional[str],
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.error = message
+
+    @staticmethod
+    def _otlp_value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode as an OTLP/JSON span"""
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": self._otlp_value(value)}
+                for key, value in self.attributes.items() if value is not None
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class _NoopSpan:
+    """Stand-in span used while tracing is disabled"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+
+class Tracer:
+    """Minimal tracer writing finished spans as OTLP/JSON ExportTraceServiceRequest lines"""
+
+    def __init__(self, exporter: Optional[JsonLinesWriter] = None):
+        self.exporter = exporter
+        self._current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            'current_span', default=None
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def current(self) -> Any:
+        return self._current.get() or _NoopSpan()
+
+    def start_span(self, name: str, kind: str = 'INTERNAL',
+                   attributes: Optional[Dict[str, Any]] = None) -> Any:
+        """Begin a child of the current span without making it current"""
+        if self.exporter is None:
+            return _NoopSpan()
+        parent = self._current.get()
+        return Span(name, kind, parent.trace_id if parent else os.urandom(16).hex(),
+                    parent.span_id if parent else None, attributes)
+
+    @contextmanager
+    def activate(self, span: Any) -> Iterator[Any]:
+        """Make a started span current for a block"""
+        if not isinstance(span, Span):
+            yield span
+            return
+        token = self._current.set(span)
+        try:
+            yield span
+        finally:
+            self._current.reset(token)
+
+    def end_span(self, span: Any) -> None:
+        """Finish a span and export it"""
+        if not isinstance(span, Span) or self.exporter is None:
+            return
+        span.end_ns = time.time_ns()
+        span.set_attribute("duration_ms", round((span.end_ns - span.start_ns) / 1e6, 3))
+        self.exporter.write({"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": "rundeck-mcp-server"}}
+            ]},
+            "scopeSpans": [{"scope": {"name": "rundeck_mcp_server"}, "spans": [span.to_otlp()]}]
+        }]})
+
+    @contextmanager
+    def span(self, name: str, kind: str = 'INTERNAL',
+             attributes: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """Time a block as a child of the current span"""
+        span = self.start_span(name, kind, attributes)
+        try:
+            with self.activate(span):
+                yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            self.end_span(span)
+
+
+tracer = Tracer(JsonLinesWriter(TRACE_FILE) if TRACE_FILE else None)
+
+
+# Progress reporter for the tool call running in the current context
+current_progress: contextvars.ContextVar[Optional[ToolProgress]] = contextvars.ContextVar(
+    'current_progress', default=None
+)
+
+# Execution lane of the tool call running in the current context
+current_lane: contextvars.ContextVar[str] = contextvars.ContextVar('current_lane', default='interactive')
+
+
+class ExecutionLane:
+    """A worker pool with its own concurrency budget and queue statistics"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"rundeck-{name}")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self._waits: deque = deque(maxlen=1000)
+
+    def submit(self, loop: asyncio.AbstractEventLoop, func: Any) -> Any:
+        """Run func on this lane's pool, returning an awaitable future"""
+        enqueued = time.monotonic()
+        with self._lock:
+            self.queued += 1
+
+        def run() -> Any:
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self._waits.append(time.monotonic() - enqueued)
+            try:
+                return func()
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        return loop.run_in_executor(self.executor, run)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "workers": self.workers,
+                "running": self.running,
+                "queue_depth": self.queued,
+                "completed": self.completed,
+                "queue_wait_p50_ms": round(percentile(waits, 50) * 1000, 1) if waits else 0.0,
+                "queue_wait_p99_ms": round(percentile(waits, 99) * 1000, 1) if waits else 0.0
+            }
+
+
+def validate_rate_limits(rate: float, bulk_share: float) -> None:
+    """Reject rate settings that would stall requests instead of limiting them"""
+    if rate < 0:
+        raise ValueError(f"RUNDECK_MAX_REQUESTS_PER_SECOND must be 0 (unlimited) or positive, got {rate:g}")
+    if rate > 0 and not 0 < bulk_share <= 1:
+        raise ValueError(f"RUNDECK_BULK_RATE_SHARE must be greater than 0 and at most 1, got {bulk_share:g}; "
+                         f"a share of 0 would block bulk tool calls forever")
+
+
+class RequestRateLimiter:
+    """Token buckets capping a client's request rate, with bulk calls held to a share of it.
+
+    Interactive requests only draw from the overall bucket; bulk requests must
+    also draw from a smaller bucket, so interactive calls always keep at least
+    (1 - bulk_share) of the budget.
+    """
+
+    def __init__(self, rate: float, bulk_share: float):
+        validate_rate_limits(rate, bulk_share)
+        self.rate = rate
+        self.bulk_rate = rate * bulk_share
+        self._tokens = max(rate, 1.0)
+        self._bulk_tokens = max(self.bulk_rate, 1.0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waits: Dict[str, int] = defaultdict(int)
+        self.wait_seconds: Dict[str, float] = defaultdict(float)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(max(self.rate, 1.0), self._tokens + elapsed * self.rate)
+        self._bulk_tokens = min(max(self.bulk_rate, 1.0), self._bulk_tokens + elapsed * self.bulk_rate)
+
+    def acquire(self, lane: str, progress: Optional[ToolProgress] = None) -> None:
+        """Block until a request may be sent for the given lane"""
+        if not self.enabled:
+            return
+        bulk = lane == 'bulk'
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1 and (not bulk or self._bulk_tokens >= 1):
+                    self._tokens -= 1
+                    if bulk:
+                        self._bulk_tokens -= 1
+                    break
+                delay = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+                if bulk and self._bulk_tokens < 1:
+                    delay = max(delay, (1 - self._bulk_tokens) / self.bulk_rate) if self.bulk_rate > 0 else 1.0
+            if progress is not None:
+                progress.wait(delay)
+            else:
+                time.sleep(delay)
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            with self._lock:
+                self.waits[lane] += 1
+                self.wait_seconds[lane] += waited
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_requests_per_second": self.rate,
+                "bulk_requests_per_second": round(self.bulk_rate, 2),
+                "throttled_requests": dict(self.waits),
+                "throttled_seconds": {lane: round(v, 3) for lane, v in self.wait_seconds.items()}
+            }
+
+
+def parse_rundeck_notification(body: bytes, content_type: str = '') -> Optional[Dict[str, Any]]:
+    """Extract execution id, trigger and status from a Rundeck webhook notification (JSON or XML)"""
+    text = body.decode('utf-8', errors='replace').strip()
+    if not text:
+        return None
+    
+    if 'xml' in content_type or text.startswith('<'):
+        try:
+            root = ElementTree.fromstring(text)
+        except ElementTree.ParseError:
+            return None
+        element = root.find('.//execution')
+        attributes = dict(element.attrib) if element is not None else {}
+        execution_id = root.get('executionId') or attributes.get('id')
+        if not execution_id:
+            return None
+        return {
+            "execution_id": str(execution_id),
+            "trigger": root.get('trigger'),
+            "status": root.get('status') or attributes.get('status'),
+            "server_url": attributes.get('href') or attributes.get('permalink')
+        }
+    
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    nested = data.get('execution')
+    execution: Dict[str, Any] = nested if isinstance(nested, dict) else data
+    execution_id = execution.get('id') or data.get('executionId')
+    if execution_id is None:
+        return None
+    return {
+        "execution_id": str(execution_id),
+        "trigger": data.get('trigger') or execution.get('trigger'),
+        "status": execution.get('status') or data.get('status'),
+        "server_url": execution.get('href') or execution.get('permalink') or data.get('serverUrl')
+    }
+
+
+class ExecutionWaiters:
+    """Registry of executions waited on, woken by webhook notifications.
+    
+    Execution ids are only unique per Rundeck server, so waiters and
+    completions are keyed by (server base URL, execution id). Completion
+    notifications are remembered for a while even when nobody waits yet,
+    so a run that finishes before its monitor starts waiting is still seen.
+    """
+
+    MAX_REMEMBERED = 1000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._events: Dict[Tuple[str, str], threading.Event] = {}
+        self._completed: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.received = 0
+        self.woken = 0
+
+    def notify(self, server: str, notification: Dict[str, Any]) -> None:
+        key = (server, notification['execution_id'])
+        if notification.get('status') not in TERMINAL_EXECUTION_STATUSES:
+            notification['status'] = {'success': 'succeeded', 'failure': 'failed'}.get(
+                notification.get('trigger') or '', notification.get('status'))
+        terminal = notification.get('status') in TERMINAL_EXECUTION_STATUSES
+        with self._lock:
+            self.received += 1
+            if not terminal:
+                return
+            self._completed[key] = notification
+            while len(self._completed) > self.MAX_REMEMBERED:
+                self._completed.pop(next(iter(self._completed)))
+            event = self._events.get(key)
+            if event is not None and not event.is_set():
+                self.woken += 1
+                event.set()
+
+    def completion(self, server: str, execution_id: str) -> Optional[Dict[str, Any]]:
+        """The completion notification received for an execution of a server, if any"""
+        with self._lock:
+            return self._completed.get((server, str(execution_id)))
+
+    def wait(self, server: str, execution_id: str, seconds: float,
+             progress: Optional[ToolProgress] = None) -> bool:
+        """Sleep up to seconds or until the execution's completion is pushed"""
+        key = (server, str(execution_id))
+        with self._lock:
+            event = self._events.setdefault(key, threading.Event())
+            if key in self._completed:
+                event.set()
+        try:
+            deadline = time.monotonic() + seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                # Short slices keep cancellation responsive
+                if event.wait(min(remaining, 0.5)):
+                    return True
+                if progress:
+                    progress.check_cancelled()
+        finally:
+            with self._lock:
+                self._events.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "notifications_received": self.received,
+                "waiters_woken": self.woken,
+                "waiting": len(self._events),
+                "remembered_completions": len(self._completed)
+            }
+
+
+def match_server_url(url: str, base_urls: List[str]) -> Optional[str]:
+    """The base URL (longest first) that a Rundeck link such as an execution href lives under"""
+    url = url.lower()
+    best = None
+    for base_url in base_urls:
+        prefix = base_url.rstrip('/').lower()
+        if (url == prefix or url.startswith(prefix + '/')) and (best is None or len(base_url) > len(best)):
+            best = base_url
+    return best
+
+
+class WebhookReceiver:
+    """Embedded HTTP listener accepting Rundeck webhook notifications.
+    
+    Each notification is attributed to a configured server before it wakes
+    anyone: by the ``server`` query parameter of the webhook URL, else by
+    the execution link in the payload. resolve_server maps (server name,
+    link) to that server's base URL.
+    """
+
+    def __init__(self, host: str, port: int, secret: Optional[str] = None,
+                 public_url: Optional[str] = None,
+                 resolve_server: Optional[Callable[[Optional[str], Optional[str]], Optional[str]]] = None):
+        self.waiters = ExecutionWaiters()
+        self.secret = secret
+        self.resolve_server = resolve_server or (lambda name, url: None)
+        self.unattributed = 0
+        self._lock = threading.Lock()
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(f"Webhook: {format % args}")
+
+            def do_POST(self) -> None:
+                url = urlparse(self.path)
+                if url.path.rstrip('/') != WEBHOOK_PATH:
+                    self.send_error(404)
+                    return
+                params = dict(parse_qsl(url.query))
+                token = params.get('token') or self.headers.get('X-Rundeck-Webhook-Token') or ''
+                if receiver.secret and not hmac.compare_digest(token.encode(), receiver.secret.encode()):
+                    self.send_error(403)
+                    return
+                length = int(self.headers.get('Content-Length') or 0)
+                if length > 1024 * 1024:
+                    self.send_error(413)
+                    return
+                notification = parse_rundeck_notification(self.rfile.read(length),
+                                                          self.headers.get('Content-Type', ''))
+                if notification is None:
+                    self.send_error(400, "Unrecognized notification")
+                    return
+                server = receiver.resolve_server(params.get('server'), notification.get('server_url'))
+                if server is None:
+                    with receiver._lock:
+                        receiver.unattributed += 1
+                    logger.warning(f"Webhook: cannot tell which Rundeck server sent the notification for "
+                                   f"execution {notification['execution_id']}; add ?server=<name> to its URL")
+                    self.send_error(400, "Unknown Rundeck server")
+                    return
+                logger.info(f"Webhook: {server} execution {notification['execution_id']} "
+                            f"{notification.get('trigger') or notification.get('status')}")
+                receiver.waiters.notify(server, notification)
+                self.send_response(204)
+                self.end_headers()
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        bound_host, bound_port = self._server.server_address[:2]
+        if isinstance(bound_host, bytes):
+            bound_host = bound_host.decode()
+        self.public_url = public_url or f"http://{bound_host}:{bound_port}{WEBHOOK_PATH}"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="rundeck-webhook", daemon=True)
+        self._thread.start()
+
+    def url_for(self, server_name: Optional[str]) -> str:
+        """The webhook URL a server's jobs should notify"""
+        if not server_name:
+            return self.public_url
+        separator = '&' if '?' in self.public_url else '?'
+        return f"{self.public_url}{separator}{urlencode({'server': server_name})}"
+
+    def notifies_receiver(self, job_definition: Dict[str, Any]) -> bool:
+        """Whether a job's notifications already target this listener's URL"""
+        listener = self.public_url.split('?', 1)[0]
+        pending: List[Any] = [job_definition.get('notification') or {}]
+        while pending:
+            value = pending.pop()
+            if isinstance(value, dict):
+                pending.extend(value.values())
+            elif isinstance(value, list):
+                pending.extend(value)
+            elif isinstance(value, str):
+                # A urls setting may hold several comma-separated URLs
+                for url in re.split(r'[\s,]+', value):
+                    if url and match_server_url(url.split('?', 1)[0], [listener]):
+                        return True
+        return False
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            unattributed = self.unattributed
+        return {"url": self.public_url, "unattributed_notifications": unattributed,
+                **self.waiters.stats()}
+
+
+class PageSizer:
+    """Execution page size for one server, tuned from observed page latency and bytes.
+    
+    Per-row time and size are tracked as moving averages over full pages;
+    the next page is sized to hit the latency and byte targets, growing at
+    most 2x per page and halving after a timeout, within [floor, ceiling].
+    """
+
+    SMOOTHING = 0.3
+
+    def __init__(self, floor: int = PAGE_SIZE_MIN, ceiling: int = PAGE_SIZE_MAX,
+                 initial: int = PAGE_SIZE_INITIAL, target_seconds: float = PAGE_TARGET_SECONDS,
+                 target_bytes: int = PAGE_TARGET_BYTES):
+        self.floor = max(floor, 1)
+        self.ceiling = max(ceiling, self.floor)
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self.size = min(max(initial, self.floor), self.ceiling)
+        self.seconds_per_row: Optional[float] = None
+        self.bytes_per_row: Optional[float] = None
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def next_size(self) -> int:
+        with self._lock:
+            return self.size
+
+    def observe(self, requested: int, rows: int, seconds: float, nbytes: int) -> None:
+        """Record a page; short final pages carry too much fixed overhead to learn from"""
+        if rows <= 0 or rows < min(requested, self.floor):
+            return
+        with self._lock:
+            spr, bpr = seconds / rows, nbytes / rows
+            alpha = self.SMOOTHING
+            self.seconds_per_row = spr if self.seconds_per_row is None else \
+                alpha * spr + (1 - alpha) * self.seconds_per_row
+            self.bytes_per_row = bpr if self.bytes_per_row is None else \
+                alpha * bpr + (1 - alpha) * self.bytes_per_row
+            
+            ideal = float(self.ceiling)
+            if self.seconds_per_row > 0:
+                ideal = min(ideal, self.target_seconds / self.seconds_per_row)
+            if self.bytes_per_row > 0:
+                ideal = min(ideal, self.target_bytes / self.bytes_per_row)
+            ideal = min(ideal, requested * 2)
+            self.size = int(min(max(ideal, self.floor), self.ceiling))
+
+    def shrink(self, requested: Optional[int] = None) -> bool:
+        """Halve the page size (or the requested size that timed out); False once at the floor"""
+        with self._lock:
+            self.timeouts += 1
+            size = min(self.size, requested) if requested else self.size
+            if size <= self.floor:
+                return False
+            self.size = max(self.floor, size // 2)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "page_size": self.size,
+                "floor": self.floor,
+                "ceiling": self.ceiling,
+                "ms_per_row": round(self.seconds_per_row * 1000, 3) if self.seconds_per_row else None,
+                "bytes_per_row": round(self.bytes_per_row) if self.bytes_per_row else None,
+                "timeouts": self.timeouts
+            }
+
+
+class _PendingLaunch:
+    """A launch in flight that identical launches wait on"""
+
+    def __init__(self) -> None:
+        self.done = False
+        self.execution: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class LaunchQueue:
+    """Client-side queue in front of job launches.
+    
+    Identical launches (same job, options and node filter) within the
+    dedupe window, or while one is in flight, return the first execution.
+    Launches are sent by at most `concurrency` threads at a time, highest
+    priority first, and wait while their job already has max_runs running.
+    """
+
+    def __init__(self, launch: Any, running_count: Any, dedupe_seconds: float = LAUNCH_DEDUPE_SECONDS,
+                 max_runs_per_job: int = MAX_RUNS_PER_JOB, concurrency: int = LAUNCH_CONCURRENCY):
+        self._launch = launch
+        self._running_count = running_count
+        self.dedupe_seconds = dedupe_seconds
+        self.max_runs_per_job = max_runs_per_job
+        self.concurrency = max(concurrency, 1)
+        self._cond = threading.Condition()
+        self._waiting: List[Any] = []
+        self._sequence = 0
+        self._active = 0
+        self._recent: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._in_flight: Dict[str, _PendingLaunch] = {}
+        self.launched = 0
+        self.deduplicated = 0
+        self.held_for_capacity = 0
+
+    @staticmethod
+    def launch_key(job_id: str, options: Optional[Dict[str, str]], node_filter: Optional[str]) -> str:
+        return json.dumps([job_id, options or {}, node_filter or ''], sort_keys=True)
+
+    def _duplicate(self, key: str, progress: Optional[ToolProgress]) -> Optional[Dict[str, Any]]:
+        """Return the execution of an identical recent or in-flight launch (caller holds the lock)"""
+        recent = self._recent.get(key)
+        if recent and time.time() - recent[0] <= self.dedupe_seconds:
+            return recent[1]
+        pending = self._in_flight.get(key)
+        if pending is None:
+            return None
+        while not pending.done:
+            self._cond.wait(0.5)
+            if progress:
+                progress.check_cancelled()
+        if pending.error is not None:
+            raise pending.error
+        return pending.execution
+
+    def submit(self, job_id: str, options: Optional[Dict[str, str]] = None,
+               node_filter: Optional[str] = None, priority: int = 0,
+               max_concurrent_runs: Optional[int] = None, allow_duplicate: bool = False,
+               progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Launch a job through the queue, returning its (or a duplicate's) execution"""
+        key = self.launch_key(job_id, options, node_filter)
+        max_runs = self.max_runs_per_job if max_concurrent_runs is None else max_concurrent_runs
+        queued_at = time.monotonic()
+        
+        with self._cond:
+            if not allow_duplicate and self.dedupe_seconds > 0:
+                duplicate = self._duplicate(key, progress)
+                if duplicate is not None:
+                    self.deduplicated += 1
+                    return {**duplicate, "launch_queue": {"deduplicated": True,
+                                                          "existing_execution_id": duplicate.get('id')}}
+            pending = _PendingLaunch()
+            if not allow_duplicate:
+                self._in_flight[key] = pending
+            self._sequence += 1
+            ticket = (-priority, self._sequence)
+        
+        try:
+            held = False
+            while True:
+                self._acquire(ticket, queued_at, progress)
+                try:
+                    if max_runs and self._running_count(job_id) >= max_runs:
+                        held = True
+                    else:
+                        execution = self._launch(job_id, options, node_filter)
+                        break
+                finally:
+                    with self._cond:
+                        self._active -= 1
+                        self._cond.notify_all()
+                # Job at its run limit: give the slot away and retry later in the same queue position
+                if time.monotonic() - queued_at > LAUNCH_QUEUE_TIMEOUT_SECONDS:
+                    raise ValueError(f"Job {job_id} still has {max_runs} or more running executions after "
+                                     f"{LAUNCH_QUEUE_TIMEOUT_SECONDS:.0f}s in the launch queue")
+                if progress:
+                    progress.report(time.monotonic() - queued_at, LAUNCH_QUEUE_TIMEOUT_SECONDS,
+                                    f"Waiting for a free run slot of job {job_id}")
+                    progress.wait(LAUNCH_RECHECK_SECONDS)
+                else:
+                    time.sleep(LAUNCH_RECHECK_SECONDS)
+            
+            with self._cond:
+                self.launched += 1
+                if held:
+                    self.held_for_capacity += 1
+                pending.execution = execution
+                if not allow_duplicate:
+                    self._recent[key] = (time.time(), execution)
+                    for stale in [k for k, (at, _) in self._recent.items() if time.time() - at > self.dedupe_seconds]:
+                        del self._recent[stale]
+            return {**execution, "launch_queue": {
+                "deduplicated": False,
+                "priority": priority,
+                "queued_seconds": round(time.monotonic() - queued_at, 2)
+            }}
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._cond:
+                pending.done = True
+                if self._in_flight.get(key) is pending:
+                    del self._in_flight[key]
+                self._cond.notify_all()
+
+    def _acquire(self, ticket: Any, queued_at: float, progress: Optional[ToolProgress]) -> None:
+        """Wait for a launch slot, served in priority then arrival order"""
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while self._waiting[0] != ticket or self._active >= self.concurrency:
+                    self._cond.wait(0.5)
+                    if progress:
+                        progress.check_cancelled()
+                    if time.monotonic() - queued_at > LAUNCH_QUEUE_TIMEOUT_SECONDS:
+                        raise ValueError(f"Launch waited more than {LAUNCH_QUEUE_TIMEOUT_SECONDS:.0f}s in the queue")
+                heapq.heappop(self._waiting)
+                self._active += 1
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "queue_depth": len(self._waiting),
+                "launching": self._active,
+                "launched": self.launched,
+                "deduplicated": self.deduplicated,
+                "held_for_capacity": self.held_for_capacity
+            }
+
+
+class Prefetcher:
+    """Keeps hot projects warm so interactive calls rarely wait on Rundeck.
+    
+    A daemon thread fetches the projects list and, for each configured
+    project, its job list and recent execution window right after startup,
+    then refreshes them every interval. Requests go out one at a time in the
+    bulk lane, so a rate limit leaves interactive calls their share.
+    """
+
+    def __init__(self, targets: Sequence[str], interval_seconds: float = PREFETCH_INTERVAL_SECONDS,
+                 days: int = PREFETCH_DAYS, max_executions: int = PREFETCH_MAX_EXECUTIONS):
+        # Group "project" and "server:project" targets by server (None is the default server)
+        self.target_names = list(targets)
+        self.targets: Dict[Optional[str], List[str]] = defaultdict(list)
+        for target in targets:
+            server_name, _, project = target.rpartition(':')
+            self.targets[server_name or None].append(project)
+        self.interval_seconds = interval_seconds
+        self.recent_filter = f"{days}d"
+        self.max_executions = max_executions
+        self.runs = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_run_at: Optional[float] = None
+        self.last_run_seconds: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rundeck-prefetch", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        current_lane.set('bulk')
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval_seconds)
+
+    def refresh(self) -> None:
+        """Refetch every hot project's catalog and recent executions once"""
+        started = time.time()
+        for server_name, projects in self.targets.items():
+            try:
+                client = get_rundeck_client(server_name)
+                client.get_projects(refresh=True)
+            except Exception as e:
+                self._failed(f"{server_name or 'default server'}: {e}")
+                continue
+            for project in projects:
+                if self._stop.is_set():
+                    return
+                try:
+                    client.get_jobs(project, refresh=True)
+                    client.get_all_executions(project, max_total=self.max_executions,
+                                              recent_filter=self.recent_filter, refresh=True)
+                except Exception as e:
+                    self._failed(f"{project}: {e}")
+        self.runs += 1
+        self.last_run_at = started
+        self.last_run_seconds = time.time() - started
+        logger.info(f"Prefetched {len(self.target_names)} projects "
+                    f"in {self.last_run_seconds:.1f}s")
+
+    def _failed(self, message: str) -> None:
+        self.errors += 1
+        self.last_error = message
+        logger.warning(f"Prefetch failed for {message}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "projects": self.target_names,
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_run_at": datetime.fromtimestamp(self.last_run_at).isoformat() if self.last_run_at else None,
+            "last_run_seconds": round(self.last_run_seconds, 2) if self.last_run_seconds is not None else None
+        }
 
 
 class RundeckClient:
@@ -50,14 +3194,136 @@ class RundeckClient:
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         })
+        # Size the connection pool for concurrent tool calls sharing this client
+        adapter: requests.adapters.BaseAdapter
+        if HTTP_REPLAY_PATH:
+            adapter = ReplayAdapter(HTTP_REPLAY_PATH)
+        else:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=TOOL_WORKERS + BULK_TOOL_WORKERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._node_inventories: Dict[str, NodeInventory] = {}
+        self._node_inventory_lock = threading.Lock()
+        self.fetch_planner = ExecutionFetchPlanner(namespace=self.base_url)
+        self.state_tracker = ExecutionStateTracker()
+        self.job_graph = JobGraph()
+        self.launch_queue = LaunchQueue(self._start_job, self.get_job_running_count)
+        self.page_sizer = PageSizer()
+        # Project and job lists kept in memory while prefetching is enabled
+        self._catalog: Dict[str, Any] = {}
+        # Per thread: size of the last response body read and when the executions last returned were fetched
+        self._response_meta = threading.local()
+        self.rate_limiter = RequestRateLimiter(MAX_REQUESTS_PER_SECOND, BULK_RATE_SHARE)
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make a request to the Rundeck API with enhanced error handling"""
+        with tracer.span(f"{method} {endpoint}", kind='CLIENT', attributes={
+            "rundeck.server": self.base_url,
+            "rundeck.endpoint": endpoint,
+            "http.method": method
+        }):
+            result: Dict[str, Any] = self._request_with_retries(method, endpoint, **kwargs)
+            return result
+    
+    def _stream_items(self, method: str, endpoint: str, array_key: Optional[str] = None,
+                      envelope: Optional[Dict[str, Any]] = None, retry_timeouts: bool = True,
+                      item_key: Optional[Callable[[Any], Any]] = None, **kwargs: Any) -> Iterator[Any]:
+        """Yield the elements of a JSON array response as they arrive from the socket.
+        
+        A body that breaks off mid-stream (connection reset, truncated chunked
+        encoding or a read timeout) is requested again within the same three
+        attempts as other requests. With item_key, elements of the new body
+        whose key was already yielded are skipped, since a list such as
+        executions can shift between attempts; without it the body is taken
+        to be append-only (log output) and the first elements are skipped by
+        count. A body read timeout raises Timeout straight away when
+        retry_timeouts is False, so paged callers can shrink the page instead.
+        The span is only current while requesting, never while the caller
+        consumes elements.
+        """
+        span = tracer.start_span(f"{method} {endpoint}", 'CLIENT', {
+            "rundeck.server": self.base_url,
+            "rundeck.endpoint": endpoint,
+            "http.method": method,
+            "rundeck.streamed": True
+        })
+        max_retries = 3
+        yielded = 0
+        received = 0
+        seen: Set[Any] = set()
+        
+        try:
+            for attempt in range(max_retries):
+                with tracer.activate(span):
+                    response = self._request_with_retries(method, endpoint, retry_timeouts,
+                                                          stream=True, **kwargs)
+                received = 0
+                
+                def chunks() -> Iterator[bytes]:
+                    nonlocal received
+                    for chunk in response.iter_content(STREAM_CHUNK_BYTES):
+                        received += len(chunk)
+                        yield chunk
+                
+                try:
+                    resume_at = 0 if item_key else yielded
+                    for index, item in enumerate(iter_json_items(chunks(), array_key, envelope)):
+                        if index < resume_at:
+                            continue
+                        if item_key:
+                            key = item_key(item)
+                            if key in seen:
+                                continue
+                            seen.add(key)
+                        yielded += 1
+                        yield item
+                    return
+                except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+                    # requests reports a read timeout inside the body as a ConnectionError
+                    timed_out = any(isinstance(arg, ReadTimeoutError) for arg in e.args)
+                    logger.warning(f"Response body {'timed out' if timed_out else 'broke off'} after "
+                                   f"{received} bytes on attempt {attempt + 1}/{max_retries}: {e}")
+                    if timed_out and not retry_timeouts:
+                        raise requests.exceptions.ReadTimeout(f"Reading the response body timed out: {e}")
+                    if attempt == max_retries - 1:
+                        if timed_out:
+                            raise requests.exceptions.Timeout(
+                                f"Response body timed out after {max_retries} attempts. "
+                                f"The Rundeck server may be overloaded or unreachable."
+                            )
+                        raise requests.exceptions.ConnectionError(
+                            f"Failed to read the response from Rundeck server after {max_retries} attempts. "
+                            f"Please check the connection to {self.base_url}"
+                        )
+                finally:
+                    response.close()
+                    self._response_meta.last_bytes = received
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to decode streamed JSON response: {e}")
+            span.set_error(f"JSONDecodeError: {e}")
+            raise ValueError(f"Invalid JSON response from Rundeck server: {e}")
+        except BaseException as e:
+            if not isinstance(e, GeneratorExit):
+                span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.set_attribute("rundeck.items", yielded)
+            span.set_attribute("http.response_content_length", received)
+            tracer.end_span(span)
+    
+    def _request_with_retries(self, method: str, endpoint: str, retry_timeouts: bool = True,
+                              stream: bool = False, **kwargs: Any) -> Any:
+        """Send a Rundeck API request, retrying connection failures and (optionally) timeouts.
+        
+        With stream=True the open response is returned undecoded, for _stream_items.
+        """
         url = urljoin(f"{self.base_url}/api/{self.api_version}/", endpoint.lstrip('/'))
         
         # Add default timeout and connection settings
         if 'timeout' not in kwargs:
             kwargs['timeout'] = 30
+        # Recording needs the whole body, so it reads it up front even when streaming
+        kwargs['stream'] = stream and http_recorder is None
         
         # Add retry logic for connection issues
         max_retries = 3
@@ -65,14 +3331,41 @@ class RundeckClient:
         
         for attempt in range(max_retries):
             try:
-                response = self.session.request(method, url, **kwargs)
+                self.rate_limiter.acquire(current_lane.get(), current_progress.get())
+                started = time.perf_counter()
+                with tracer.span(f"attempt {attempt + 1}", kind='CLIENT', attributes={
+                    "rundeck.server": self.base_url,
+                    "rundeck.endpoint": endpoint,
+                    "rundeck.attempt": attempt + 1
+                }) as attempt_span:
+                    response = self.session.request(method, url, **kwargs)
+                    attempt_span.set_attribute("http.status_code", response.status_code)
+                    if not kwargs['stream']:
+                        self._response_meta.last_bytes = len(response.content)
+                        attempt_span.set_attribute("http.response_content_length", len(response.content))
+                    if response.status_code >= 400:
+                        attempt_span.set_error(f"HTTP {response.status_code}")
+                if http_recorder is not None:
+                    http_recorder.write({
+                        "key": cassette_key(method, response.request.url or url, response.request.body),
+                        "server": self.base_url,
+                        "status": response.status_code,
+                        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                        "content_type": response.headers.get('Content-Type'),
+                        "content": response.content.decode('utf-8', errors='replace')
+                    })
+                if stream:
+                    if response.status_code >= 400:
+                        response.close()
+                    response.raise_for_status()
+                    return response
                 response.raise_for_status()
                 
                 # Handle empty responses
                 if not response.content.strip():
                     return {}
                 
-                return response.json()
+                return json_loads(response.content)
                 
             except requests.exceptions.ConnectionError as e:
                 logger.warning(f"Connection error on attempt {attempt + 1}/{max_retries}: {e}")
@@ -85,6 +3378,8 @@ class RundeckClient:
                 
             except requests.exceptions.Timeout as e:
                 logger.warning(f"Timeout error on attempt {attempt + 1}/{max_retries}: {e}")
+                if not retry_timeouts:
+                    raise
                 if attempt == max_retries - 1:
                     raise requests.exceptions.Timeout(
                         f"Request timed out after {max_retries} attempts. "
@@ -125,13 +3420,41 @@ class RundeckClient:
         # This should never be reached due to the retry logic, but added for type safety
         raise requests.exceptions.RequestException("Unexpected error in request handling")
     
-    def get_projects(self) -> List[Dict[str, Any]]:
+    def _catalog_get(self, key: str) -> Optional[Any]:
+        """Return a warm project or job list from memory or the shared cache"""
+        entry = self._catalog.get(key)
+        if entry is not None and time.time() - entry[0] <= CATALOG_TTL_SECONDS:
+            return entry[1]
+        if shared_cache is not None:
+            return shared_cache.get(key, SHARED_CACHE_TTL_SECONDS)
+        return None
+    
+    def _catalog_put(self, key: str, value: Any) -> None:
+        if CATALOG_TTL_SECONDS > 0:
+            self._catalog[key] = (time.time(), value)
+        if shared_cache is not None:
+            shared_cache.put(key, value)
+    
+    def get_projects(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """Get all projects"""
+        cache_key = f"projects|{self.base_url}"
+        if not refresh:
+            cached: Optional[List[Dict[str, Any]]] = self._catalog_get(cache_key)
+            if cached is not None:
+                return cached
         response = self._make_request('GET', 'projects')
-        return response if isinstance(response, list) else response.get('projects', [])
+        projects: List[Dict[str, Any]] = response if isinstance(response, list) else response.get('projects', [])
+        self._catalog_put(cache_key, projects)
+        return projects
     
-    def get_jobs(self, project: str, job_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_jobs(self, project: str, job_filter: Optional[str] = None,
+                 refresh: bool = False) -> List[Dict[str, Any]]:
         """Get jobs for a project with optional filtering"""
+        cache_key = f"jobs|{self.base_url}|{project}|{job_filter or ''}"
+        if not refresh:
+            cached: Optional[List[Dict[str, Any]]] = self._catalog_get(cache_key)
+            if cached is not None:
+                return cached
         try:
             params = {}
             if job_filter:
@@ -142,10 +3465,12 @@ class RundeckClient:
             
             if isinstance(response, list):
                 logger.info(f"Retrieved {len(response)} jobs successfully")
+                self._catalog_put(cache_key, response)
                 return response
             elif isinstance(response, dict):
-                jobs = response.get('jobs', [])
+                jobs: List[Dict[str, Any]] = response.get('jobs', [])
                 logger.info(f"Retrieved {len(jobs)} jobs from dict response")
+                self._catalog_put(cache_key, jobs)
                 return jobs
             else:
                 logger.warning(f"Unexpected response type: {type(response)}")
@@ -155,20 +3480,80 @@ class RundeckClient:
             logger.error(f"Error retrieving jobs for project {project}: {e}")
             raise
     
-    def get_job_definition(self, job_id: str) -> Dict[str, Any]:
-        """Get detailed job definition including options and workflow"""
+    def get_job_definition(self, job_id: str, project: Optional[str] = None) -> Dict[str, Any]:
+        """Get detailed job definition including options and workflow.
+        
+        project, when the caller knows it, files the definition in the job
+        graph; job/{id} responses often leave it out.
+        """
         response = self._make_request('GET', f'job/{job_id}')
         # Handle both list and dict responses
         if isinstance(response, list) and len(response) > 0:
-            return response[0]  # type: ignore
+            definition = response[0]  # type: ignore
         elif isinstance(response, dict):
-            return response
+            definition = response
         else:
             return {}
+        # Keep the job reference graph current with every definition we see
+        project = definition.get('project') or project or self._listed_project(job_id)
+        if not self.job_graph.update(definition, project):
+            logger.debug(f"Job {job_id} left out of the job graph: its project is unknown")
+        return definition
+    
+    def _listed_project(self, job_id: str) -> Optional[str]:
+        """Project of a job from the job listings held in memory, without a request"""
+        prefix = f"jobs|{self.base_url}|"
+        for key, (_, jobs) in list(self._catalog.items()):
+            if key.startswith(prefix) and any(job.get('id') == job_id for job in jobs):
+                return key[len(prefix):].split('|', 1)[0]
+        return None
+    
+    def export_job_definitions(self, project: str) -> Iterator[Dict[str, Any]]:
+        """Stream every job definition of a project from the bulk export"""
+        return self._stream_items('GET', f'project/{project}/jobs/export', params={'format': 'json'},
+                                  item_key=lambda job: job.get('id'))
+    
+    def get_job_graph(self, project: Optional[str] = None, job_id: Optional[str] = None,
+                      max_depth: Optional[int] = None, refresh: bool = False, limit: int = 20,
+                      progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Job reference graph of a project (or every project), or one job's place in it"""
+        projects = [project] if project else [p['name'] for p in self.get_projects()]
+        started = time.perf_counter()
+        loaded = 0
+        for index, name in enumerate(projects):
+            loaded_at = self.job_graph.loaded_projects.get(name)
+            if not refresh and loaded_at is not None and time.time() - loaded_at < JOB_GRAPH_TTL_SECONDS:
+                continue
+            if progress:
+                progress.check_cancelled()
+                progress.report(index, len(projects), f"Exporting job definitions of {name}")
+            loaded += self.job_graph.load_project(name, self.export_job_definitions(name))
+        load_ms = (time.perf_counter() - started) * 1000
+        
+        started = time.perf_counter()
+        if job_id:
+            result = self.job_graph.query(job_id, max_depth)
+        else:
+            result = self.job_graph.summary(projects, limit)
+        return {
+            "project": project or "all projects",
+            **result,
+            "definitions_loaded": loaded,
+            "load_ms": round(load_ms, 1),
+            "query_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
     
     def run_job(self, job_id: str, options: Optional[Dict[str, str]] = None, 
-                node_filter: Optional[str] = None) -> Dict[str, Any]:
-        """Execute a job with optional parameters"""
+                node_filter: Optional[str] = None, priority: int = 0,
+                max_concurrent_runs: Optional[int] = None, allow_duplicate: bool = False,
+                progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Execute a job with optional parameters through the launch queue"""
+        return self.launch_queue.submit(job_id, options, node_filter, priority,
+                                        max_concurrent_runs, allow_duplicate, progress)
+    
+    def _start_job(self, job_id: str, options: Optional[Dict[str, str]] = None,
+                   node_filter: Optional[str] = None) -> Dict[str, Any]:
+        """Send the run request for a job"""
         data = {}
         if options:
             data['options'] = options
@@ -177,20 +3562,206 @@ class RundeckClient:
         
         return self._make_request('POST', f'job/{job_id}/run', json=data)
     
+    def get_job_running_count(self, job_id: str) -> int:
+        """Number of running executions of a job"""
+        response = self._make_request('GET', f'job/{job_id}/executions', params={'status': 'running', 'max': 1})
+        if isinstance(response, dict):
+            paging = response.get('paging') or {}
+            return int(paging.get('total', len(response.get('executions', []))))
+        return len(response) if isinstance(response, list) else 0
+    
     def get_execution_status(self, execution_id: str) -> Dict[str, Any]:
         """Get the status of a job execution"""
         return self._make_request('GET', f'execution/{execution_id}')
     
-    def get_execution_output(self, execution_id: str) -> Dict[str, Any]:
-        """Get the output of a job execution"""
-        return self._make_request('GET', f'execution/{execution_id}/output')
+    def get_execution_state_changes(self, execution_id: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Per-node/step execution progress, reduced to changes since the cursor's poll"""
+        state = self._make_request('GET', f'execution/{execution_id}/state')
+        return self.state_tracker.diff(str(execution_id), state, cursor)
+    
+    def get_job_duration_history(self, project: str, job_id: str, days: int = FORECAST_HISTORY_DAYS,
+                                 cached_only: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Recent successful executions of a job, used as its duration distribution.
+        
+        With cached_only, only a recent wider fetch can answer; None otherwise.
+        """
+        if cached_only:
+            return self.fetch_planner.lookup(project, 'succeeded', None, job_id, f"{days}d", 500)
+        return self.get_all_executions(project, max_total=500, status='succeeded',
+                                       job_id=job_id, recent_filter=f"{days}d")
+    
+    def forecast_execution(self, execution: Dict[str, Any], load_history: bool = True) -> Dict[str, Any]:
+        """Forecast completion of a running execution from its job's history"""
+        job = execution.get('job') or {}
+        project = execution.get('project') or job.get('project')
+        if not job.get('id') or not project:
+            return {"available": False, "reason": "Ad-hoc execution without job history"}
+        try:
+            history = self.get_job_duration_history(project, job['id'], cached_only=not load_history)
+        except Exception as e:
+            logger.warning(f"Could not load duration history for job {job['id']}: {e}")
+            return {"available": False, "reason": str(e)}
+        if history is None:
+            return {"available": False, "reason": "Duration history not cached; request the forecast to load it"}
+        return forecast_completion(execution, history)
+    
+    def get_running_executions(self, project: str) -> List[Dict[str, Any]]:
+        """Get currently running executions for a project"""
+        response = self._make_request('GET', f'project/{project}/executions/running')
+        if isinstance(response, list):
+            return response
+        return list(response.get('executions') or []) if isinstance(response, dict) else []
+    
+    def forecast_running_executions(self, project: str) -> Dict[str, Any]:
+        """ETA for every running execution in a project, flagging those past their p95"""
+        forecasts = []
+        for ex in self.get_running_executions(project):
+            forecast = self.forecast_execution(ex)
+            forecasts.append({
+                "id": ex.get('id'),
+                "job": (ex.get('job') or {}).get('name', 'Ad-hoc'),
+                "user": ex.get('user'),
+                "date-started": (ex.get('date-started') or {}).get('date'),
+                "forecast": forecast
+            })
+        
+        forecasts.sort(key=lambda f: f["forecast"].get("overrun_ratio") or 0, reverse=True)
+        return {
+            "project": project,
+            "running_executions": len(forecasts),
+            "overdue_executions": sum(1 for f in forecasts if f["forecast"].get("overdue")),
+            "executions": forecasts
+        }
+    
+    def iter_execution_output(self, execution_id: str,
+                              envelope: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the log entries of an execution one at a time as they stream in.
+        
+        The other output fields are decoded into envelope. Archived outputs
+        are read back from the archive; otherwise, with the archive enabled,
+        entries are spooled to a temporary file on their way to the caller
+        and a completed output is archived once the caller has read them all.
+        """
+        envelope = {} if envelope is None else envelope
+        if log_archive is not None:
+            archived = log_archive.read(self.base_url, execution_id)
+            if archived is not None:
+                envelope.update(archived[0])
+                yield from archived[1]
+                return
+        
+        entries = self._stream_items('GET', f'execution/{execution_id}/output', 'entries', envelope)
+        if log_archive is None:
+            yield from entries
+            return
+        with OutputSpool() as spool:
+            for entry in entries:
+                spool.add(entry)
+                yield entry
+            if envelope.get('execCompleted'):
+                try:
+                    log_archive.store(self.base_url, execution_id, envelope, spool)
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not archive output of execution {execution_id}: {e}")
+    
+    def get_execution_output(self, execution_id: str, offset: int = 0,
+                             max_entries: int = OUTPUT_MAX_ENTRIES) -> Dict[str, Any]:
+        """Get up to max_entries log entries of a job execution, starting at entry offset.
+        
+        The whole log is streamed (and archived when enabled), but entries
+        outside the requested range are only counted, never kept.
+        """
+        output: Dict[str, Any] = {}
+        entries = []
+        total = 0
+        for entry in self.iter_execution_output(execution_id, output):
+            if offset <= total < offset + max_entries:
+                entries.append(entry)
+            total += 1
+        output['entries'] = entries
+        output['entries_offset'] = offset
+        output['entries_total'] = total
+        if offset + len(entries) < total:
+            output['next_offset'] = offset + len(entries)
+        return output
+    
+    def get_failure_lines(self, execution_id: str) -> List[str]:
+        """The error lines of an execution's output, picked as the log streams in"""
+        return extract_error_lines(self.iter_execution_output(execution_id))
+    
+    def get_resources(self, project: str) -> Any:
+        """Get the node resources of a project"""
+        return self._make_request('GET', f'project/{project}/resources')
+    
+    def get_node_inventory(self, project: str, refresh: bool = False) -> NodeInventory:
+        """Get the cached, indexed node inventory for a project"""
+        with self._node_inventory_lock:
+            inventory = self._node_inventories.get(project)
+            if (inventory is not None and not refresh
+                    and inventory.age_seconds < NODE_CACHE_TTL_SECONDS):
+                return inventory
+            
+            cache_key = f"resources|{self.base_url}|{project}"
+            cached = None
+            if shared_cache is not None and NODE_CACHE_TTL_SECONDS > 0 and not refresh:
+                cached = shared_cache.get(cache_key, NODE_CACHE_TTL_SECONDS)
+            if cached is not None:
+                inventory = NodeInventory(project, cached['resources'])
+                inventory.fetched_at = cached['fetched_at']
+            else:
+                inventory = NodeInventory(project, self.get_resources(project))
+                if shared_cache is not None and NODE_CACHE_TTL_SECONDS > 0:
+                    shared_cache.put(cache_key, {'fetched_at': inventory.fetched_at,
+                                                 'resources': inventory.nodes})
+            if NODE_CACHE_TTL_SECONDS > 0:
+                self._node_inventories[project] = inventory
+            logger.info(f"Loaded {len(inventory.nodes)} nodes for project {project}")
+            return inventory
+    
+    def preview_node_filter(self, project: str, node_filter: str,
+                            max_nodes: int = 50, refresh: bool = False) -> Dict[str, Any]:
+        """Resolve the nodes a node filter targets using the cached inventory"""
+        try:
+            parse_node_filter(node_filter)
+        except ValueError as e:
+            return {
+                "project": project,
+                "node_filter": node_filter,
+                "valid": False,
+                "error": str(e)
+            }
+        
+        inventory = self.get_node_inventory(project, refresh)
+        started = time.perf_counter()
+        nodes = inventory.select(node_filter)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        return {
+            "project": project,
+            "node_filter": node_filter,
+            "valid": True,
+            "matched_nodes": len(nodes),
+            "total_nodes": len(inventory.nodes),
+            "nodes": [
+                {
+                    "nodename": node.get('nodename'),
+                    "hostname": node.get('hostname'),
+                    "osFamily": node.get('osFamily'),
+                    "tags": node.get('tags')
+                }
+                for node in nodes[:max_nodes]
+            ],
+            "truncated": len(nodes) > max_nodes,
+            "inventory_age_seconds": round(inventory.age_seconds, 1),
+            "evaluation_ms": round(elapsed_ms, 3)
+        }
     
     def get_executions(self, project: str, max_results: int = 100,
                       status: Optional[str] = None, user: Optional[str] = None,
                       job_id: Optional[str] = None, recent_filter: Optional[str] = None,
-                      offset: int = 0) -> Dict[str, Any]:
+                      offset: int = 0, retry_timeouts: bool = True) -> Dict[str, Any]:
         """Get executions for a project with filtering options and pagination support"""
-        params: Dict[str, Any] = {'max': min(max_results, 1000), 'offset': offset}
+        params: Dict[str, Any] = {'max': min(max_results, self.page_sizer.ceiling), 'offset': offset}
         if status:
             params['statusFilter'] = status
         if user:
@@ -200,69 +3771,117 @@ class RundeckClient:
         if recent_filter:
             params['recentFilter'] = recent_filter
         
-        response = self._make_request('GET', f'project/{project}/executions', params=params)
-        
-        # Handle both list and dict responses, normalize to dict with pagination info
-        if isinstance(response, list):
-            return {
-                'executions': response,
-                'total': len(response),
-                'offset': offset,
-                'max': params['max'],
-                'hasMore': len(response) == params['max']
-            }
-        elif isinstance(response, dict):
-            executions = response.get('executions', [])
-            return {
-                'executions': executions,
-                'total': response.get('total', len(executions)),
-                'offset': offset,
-                'max': params['max'],
-                'hasMore': len(executions) == params['max']
-            }
-        else:
-            return {
-                'executions': [],
-                'total': 0,
-                'offset': offset,
-                'max': params['max'],
-                'hasMore': False
-            }
+        # Executions are decoded one at a time as the page streams in, whether the
+        # response is a bare list or a dict with paging info
+        envelope: Dict[str, Any] = {}
+        executions = list(self._stream_items(
+            'GET', f'project/{project}/executions', 'executions', envelope,
+            params=params, retry_timeouts=retry_timeouts, item_key=lambda ex: ex.get('id')
+        ))
+        total = (envelope.get('paging') or {}).get('total', envelope.get('total'))
+        return {
+            'executions': executions,
+            'total': total if total is not None else len(executions),
+            'offset': offset,
+            'max': params['max'],
+            # Trust the server's total over a full page, in case it caps max lower
+            'hasMore': offset + len(executions) < total if total is not None else len(executions) == params['max']
+        }
     
     def get_all_executions(self, project: str, max_total: int = 5000,
                           status: Optional[str] = None, user: Optional[str] = None,
-                          job_id: Optional[str] = None, recent_filter: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get all executions with automatic pagination"""
+                          job_id: Optional[str] = None, recent_filter: Optional[str] = None,
+                          progress: Optional[ToolProgress] = None,
+                          refresh: bool = False) -> List[Dict[str, Any]]:
+        """Get all executions with automatic pagination, stopping early if cancelled.
+        
+        executions_fetched_at() then tells when the returned data was fetched.
+        """
+        found = None if refresh else \
+            self.fetch_planner.lookup_window(project, status, user, job_id, recent_filter, max_total)
+        tracer.current().set_attribute("rundeck.fetch_planner_hit", found is not None)
+        if found is not None:
+            planned, self._response_meta.executions_fetched_at = found
+            logger.info(f"Answered {len(planned)} executions for {project} from a recent wider fetch")
+            if progress:
+                progress.report(len(planned), len(planned),
+                                f"Reused {len(planned)} executions from a recent fetch of {project}")
+            return planned
+        
         all_executions = []
         offset = 0
-        page_size = 1000
+        page = 0
+        self._response_meta.executions_fetched_at = time.time()
         
         while len(all_executions) < max_total:
+            if progress:
+                progress.check_cancelled()
+            
             remaining = max_total - len(all_executions)
-            current_page_size = min(page_size, remaining)
+            current_page_size = min(self.page_sizer.next_size(), remaining)
             
-            result = self.get_executions(
-                project, current_page_size, status, user, job_id, recent_filter, offset
-            )
+            with tracer.span("executions page", attributes={
+                "rundeck.project": project,
+                "rundeck.offset": offset,
+                "rundeck.page_size": current_page_size
+            }) as page_span:
+                started = time.perf_counter()
+                self._response_meta.last_bytes = 0
+                try:
+                    # Oversized pages get smaller instead of retrying the same timeout
+                    result = self.get_executions(
+                        project, current_page_size, status, user, job_id, recent_filter, offset,
+                        retry_timeouts=current_page_size <= self.page_sizer.floor
+                    )
+                except requests.exceptions.Timeout:
+                    if not self.page_sizer.shrink(current_page_size):
+                        raise
+                    logger.warning(f"Page of {current_page_size} executions timed out, "
+                                   f"retrying with {self.page_sizer.next_size()}")
+                    page_span.set_error("timeout")
+                    continue
+                elapsed = time.perf_counter() - started
+                self.page_sizer.observe(current_page_size, len(result['executions']), elapsed,
+                                        getattr(self._response_meta, 'last_bytes', 0))
+                page_span.set_attribute("rundeck.rows", len(result['executions']))
             
             executions = result['executions']
             if not executions:
                 break
                 
             all_executions.extend(executions)
+            page += 1
+            
+            if progress:
+                total = min(max_total, result['total']) if result.get('total') else max_total
+                progress.report(
+                    len(all_executions), max(total, len(all_executions)),
+                    f"Fetched page {page}: {len(all_executions)} executions from {project}"
+                )
             
             if not result['hasMore']:
                 break
                 
             offset += len(executions)
         
+        self.fetch_planner.record(project, status, user, job_id, recent_filter, max_total, all_executions)
         return all_executions
     
-    def get_execution_metrics(self, project: str, days: int = 30) -> Dict[str, Any]:
+    def executions_fetched_at(self) -> Optional[float]:
+        """When the executions last returned by get_all_executions on this thread were fetched"""
+        return getattr(self._response_meta, 'executions_fetched_at', None)
+    
+    def get_execution_metrics(self, project: str, days: int = 30,
+                              progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
         """Get execution metrics and analytics for a project"""
         # Get recent executions using the new method
         recent_filter = f"{days}d"  # Last N days
-        executions = self.get_all_executions(project, max_total=5000, recent_filter=recent_filter)
+        executions = self.get_all_executions(project, max_total=5000, recent_filter=recent_filter,
+                                             progress=progress)
+        if progress:
+            progress.check_cancelled()
+            progress.report(len(executions), len(executions),
+                            f"Aggregating metrics over {len(executions)} executions")
         
         if not executions:
             return {
@@ -370,7 +3989,7 @@ class RundeckClient:
         """Calculate ROI metrics for a specific job"""
         try:
             # Get job definition
-            job_def = self.get_job_definition(job_id)
+            job_def = self.get_job_definition(job_id, project)
             job_name = job_def.get('name', 'Unknown')
             
             # Get executions for this job
@@ -433,6 +4052,97 @@ class RundeckClient:
             logger.error(f"Error calculating job ROI: {e}")
             return {"error": str(e)}
     
+    def calculate_project_roi(self, project: str, cost_per_hour: float = 50.0, days: int = 30,
+                              manual_hours_per_run: float = 1.0,
+                              manual_hours_overrides: Optional[Dict[str, float]] = None,
+                              max_executions: int = 20000,
+                              progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Calculate ROI for every job of a project from a single execution fetch.
+        
+        Uses the same cost and value model as calculate_job_roi. Manual hours
+        saved per successful run can be overridden per job ID or job name.
+        """
+        overrides = manual_hours_overrides or {}
+        jobs = self.get_jobs(project)
+        executions = self.get_all_executions(project, max_total=max_executions,
+                                             recent_filter=f"{days}d", progress=progress)
+        if progress:
+            progress.check_cancelled()
+            progress.report(len(executions), len(executions),
+                            f"Grouping {len(executions)} executions by job")
+        
+        rows: Dict[str, Dict[str, Any]] = {
+            job['id']: {"job_id": job['id'], "job_name": job.get('name', 'Unknown'), "group": job.get('group') or '',
+                        "executions": 0, "successful": 0, "failed": 0, "seconds": 0.0}
+            for job in jobs if job.get('id')
+        }
+        for ex in executions:
+            job = ex.get('job') or {}
+            job_id = job.get('id')
+            if not job_id:
+                continue
+            row = rows.get(job_id)
+            if row is None:
+                # Job deleted since it ran
+                row = rows[job_id] = {"job_id": job_id, "job_name": job.get('name', 'Unknown'),
+                                      "group": job.get('group') or '',
+                                      "executions": 0, "successful": 0, "failed": 0, "seconds": 0.0}
+            row["executions"] += 1
+            duration = execution_duration_seconds(ex)
+            if duration is None:
+                continue
+            row["seconds"] += duration
+            status = ex.get('status')
+            if status == 'succeeded':
+                row["successful"] += 1
+            elif status == 'failed':
+                row["failed"] += 1
+        
+        table = []
+        for row in rows.values():
+            manual_hours = float(overrides.get(row["job_id"], overrides.get(row["job_name"], manual_hours_per_run)))
+            hours = row["seconds"] / 3600
+            cost = hours * cost_per_hour
+            hours_saved = row["successful"] * manual_hours
+            value = hours_saved * cost_per_hour
+            table.append({
+                "job_id": row["job_id"],
+                "job_name": row["job_name"],
+                "group": row["group"],
+                "total_executions": row["executions"],
+                "successful_executions": row["successful"],
+                "failed_executions": row["failed"],
+                "success_rate_percent": round(row["successful"] / row["executions"] * 100, 2) if row["executions"] else 0,
+                "total_execution_hours": round(hours, 2),
+                "total_execution_cost": round(cost, 2),
+                "manual_hours_per_run": manual_hours,
+                "estimated_manual_hours_saved": round(hours_saved, 2),
+                "estimated_value_saved": round(value, 2),
+                "net_value": round(value - cost, 2),
+                "roi_percentage": round((value - cost) / cost * 100, 2) if cost > 0 else 0
+            })
+        
+        # Jobs that ran come first even when they lost money
+        table.sort(key=lambda r: (r["total_executions"] > 0, r["net_value"], r["total_executions"]), reverse=True)
+        for rank, row in enumerate(table, 1):
+            row["rank"] = rank
+        
+        total_cost = sum(r["total_execution_cost"] for r in table)
+        total_value = sum(r["estimated_value_saved"] for r in table)
+        return {
+            "project": project,
+            "analysis_period_days": days,
+            "cost_per_hour_used": cost_per_hour,
+            "jobs_analyzed": len(table),
+            "jobs_without_executions": sum(1 for r in table if r["total_executions"] == 0),
+            "total_executions": len(executions),
+            "total_execution_cost": round(total_cost, 2),
+            "estimated_value_saved": round(total_value, 2),
+            "net_value": round(total_value - total_cost, 2),
+            "roi_percentage": round((total_value - total_cost) / total_cost * 100, 2) if total_cost > 0 else 0,
+            "jobs": table
+        }
+    
     def get_bulk_execution_status(self, execution_ids: List[str]) -> List[Dict[str, Any]]:
         """Get status for multiple executions efficiently"""
         results = []
@@ -444,41 +4154,309 @@ class RundeckClient:
                 results.append({"id": exec_id, "error": str(e)})
         return results
     
+    def cluster_failures(self, project: str, days: int = 1, max_executions: int = 300,
+                         similarity: float = 0.6, max_clusters: int = 20,
+                         progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Group recent failed executions by normalized error signature"""
+        failed = self.get_all_executions(project, max_total=max_executions, status='failed',
+                                         recent_filter=f"{days}d", progress=progress)
+        if not failed:
+            return {"project": project, "analysis_period_days": days,
+                    "failed_executions": 0, "clusters": []}
+        
+        # Fetch outputs concurrently; cancellation stops scheduling further fetches
+        outputs: Dict[Any, Any] = {}
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=FAILURE_FETCH_WORKERS) as pool:
+            futures = {
+                pool.submit(context.copy().run, self.get_failure_lines, str(ex.get('id'))): ex.get('id')
+                for ex in failed
+            }
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    try:
+                        outputs[futures[future]] = future.result()
+                    except Exception as e:
+                        outputs[futures[future]] = e
+                    if progress:
+                        progress.check_cancelled()
+                        if done % 25 == 0 or done == len(futures):
+                            progress.report(done, len(futures), f"Fetched {done}/{len(futures)} failure logs")
+            except OperationCancelled:
+                for future in futures:
+                    future.cancel()
+                raise
+        
+        # Exact signature grouping first, then near-duplicate merging with MinHash
+        by_signature: Dict[str, Dict[str, Any]] = {}
+        for ex in failed:
+            output = outputs.get(ex.get('id'))
+            error_lines = output if isinstance(output, list) else []
+            sample = error_lines[0] if error_lines else "(no output available)"
+            signature = ' | '.join(normalize_log_line(line) for line in error_lines) or sample
+            
+            group = by_signature.setdefault(signature, {"sample_line": sample, "executions": []})
+            group["executions"].append(ex)
+        
+        minhashes = {signature: minhash_signature(signature) for signature in by_signature}
+        clusters = []
+        for members in cluster_signatures(minhashes, similarity):
+            executions = [ex for signature in members for ex in by_signature[signature]["executions"]]
+            representative = max(members, key=lambda sig: len(by_signature[sig]["executions"]))
+            jobs: Dict[str, int] = defaultdict(int)
+            nodes: Dict[str, int] = defaultdict(int)
+            for ex in executions:
+                jobs[ex.get('job', {}).get('name', 'Unknown')] += 1
+                for node in ex.get('failedNodes') or []:
+                    nodes[node] += 1
+            started = sorted(ex['date-started']['date'] for ex in executions
+                             if ex.get('date-started', {}).get('date'))
+            clusters.append({
+                "count": len(executions),
+                "signature": representative,
+                "sample_line": by_signature[representative]["sample_line"],
+                "variants": len(members),
+                "representative_executions": [ex.get('id') for ex in executions[:5]],
+                "jobs": dict(sorted(jobs.items(), key=lambda x: x[1], reverse=True)[:10]),
+                "failed_nodes": dict(sorted(nodes.items(), key=lambda x: x[1], reverse=True)[:10]),
+                "first_seen": started[0] if started else None,
+                "last_seen": started[-1] if started else None
+            })
+        
+        clusters.sort(key=lambda c: c["count"], reverse=True)
+        return {
+            "project": project,
+            "analysis_period_days": days,
+            "failed_executions": len(failed),
+            "distinct_signatures": len(by_signature),
+            "cluster_count": len(clusters),
+            "clusters": clusters[:max_clusters]
+        }
+    
+    def get_concurrency_profile(self, project: Optional[str] = None, days: int = 7,
+                                max_executions: int = 20000, top_jobs: int = 10,
+                                progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Profile concurrent executions for a project, or every project on the server"""
+        projects = [project] if project else [p['name'] for p in self.get_projects()]
+        executions: List[Dict[str, Any]] = []
+        for name in projects:
+            if progress:
+                progress.check_cancelled()
+            executions.extend(self.get_all_executions(name, max_total=max_executions,
+                                                      recent_filter=f"{days}d", progress=progress))
+        if progress:
+            progress.report(len(executions), len(executions),
+                            f"Sweeping {len(executions)} executions")
+        
+        now = time.time()
+        profile = concurrency_profile(executions, now - days * 86400, now, top_jobs)
+        return {
+            "project": project or "all projects",
+            "projects_analyzed": len(projects),
+            "analysis_period_days": days,
+            **profile
+        }
+    
+    def get_node_reliability(self, project: Optional[str] = None, days: int = 7,
+                             min_executions: int = 3, limit: int = 20, max_executions: int = 20000,
+                             progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Rank nodes by failure rate for a project, or every project on the server"""
+        projects = [project] if project else [p['name'] for p in self.get_projects()]
+        executions: List[Dict[str, Any]] = []
+        for name in projects:
+            if progress:
+                progress.check_cancelled()
+            executions.extend(self.get_all_executions(name, max_total=max_executions,
+                                                      recent_filter=f"{days}d", progress=progress))
+        if progress:
+            progress.report(len(executions), len(executions),
+                            f"Aggregating node results of {len(executions)} executions")
+        
+        return {
+            "project": project or "all projects",
+            "projects_analyzed": len(projects),
+            "analysis_period_days": days,
+            **node_reliability(executions, min_executions, limit)
+        }
+    
+    def forecast_schedule_load(self, project: Optional[str] = None, horizon_hours: int = 24,
+                               bucket_minutes: int = 15, history_days: int = FORECAST_HISTORY_DAYS,
+                               default_duration_seconds: float = 60.0, timezone: Optional[str] = None,
+                               top: int = 10, max_executions: int = 20000,
+                               progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Forecast concurrency from every scheduled job's cron and its historical durations"""
+        default_zone = dateutil_tz.gettz(timezone) if timezone else dateutil_tz.tzlocal()
+        if default_zone is None:
+            raise ValueError(f"Unknown time zone: {timezone}")
+        projects = [project] if project else [p['name'] for p in self.get_projects()]
+        jobs: List[Dict[str, Any]] = []
+        invalid = []
+        for index, name in enumerate(projects):
+            if progress:
+                progress.check_cancelled()
+                progress.report(index, len(projects), f"Loading schedules and durations of {name}")
+            scheduled = [d for d in self.export_job_definitions(name)
+                         if d.get('schedule') and d.get('scheduleEnabled', True) is not False
+                         and d.get('executionEnabled', True) is not False]
+            if not scheduled:
+                continue
+            
+            # Median successful duration per job; a narrower query the planner can serve
+            durations: Dict[str, List[float]] = defaultdict(list)
+            for ex in self.get_all_executions(name, max_total=max_executions, status='succeeded',
+                                              recent_filter=f"{history_days}d", progress=progress):
+                duration = execution_duration_seconds(ex)
+                if duration is not None and (ex.get('job') or {}).get('id'):
+                    durations[ex['job']['id']].append(duration)
+            
+            for definition in scheduled:
+                job_id = definition.get('id') or definition.get('uuid')
+                try:
+                    cron = CronSchedule(rundeck_schedule_cron(definition['schedule']))
+                except (ValueError, TypeError) as e:
+                    invalid.append({"job_id": job_id, "job_name": definition.get('name'), "project": name,
+                                    "schedule": definition['schedule'], "error": str(e)})
+                    continue
+                history = durations.get(job_id) if job_id else None
+                jobs.append({
+                    "id": job_id, "name": definition.get('name'), "group": definition.get('group') or None,
+                    "project": name, "cron": cron,
+                    "timezone": (definition.get('timeZone') and dateutil_tz.gettz(definition['timeZone'])) or default_zone,
+                    "multiple_executions": bool(definition.get('multipleExecutions')),
+                    "duration_seconds": statistics.median(history) if history else default_duration_seconds,
+                    "duration_source": "history" if history else "default"
+                })
+        
+        now = time.time()
+        forecast = schedule_load_forecast(jobs, now, now + horizon_hours * 3600, bucket_minutes * 60, top)
+        return {
+            "project": project or "all projects",
+            "projects_analyzed": len(projects),
+            "horizon_hours": horizon_hours,
+            "bucket_minutes": bucket_minutes,
+            "jobs_without_history": sum(1 for job in jobs if job['duration_source'] == 'default'),
+            "invalid_schedules": invalid,
+            **forecast
+        }
+    
+    def detect_anomalies(self, project: Optional[str] = None, days: int = 30, recent_hours: int = 24,
+                         threshold: float = 3.5, min_baseline: int = 10, limit: int = 20,
+                         max_executions: int = 20000,
+                         progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Find unusual durations and failure-rate jumps for a project, or every project on the server"""
+        projects = [project] if project else [p['name'] for p in self.get_projects()]
+        executions: List[Dict[str, Any]] = []
+        for name in projects:
+            if progress:
+                progress.check_cancelled()
+            executions.extend(self.get_all_executions(name, max_total=max_executions,
+                                                      recent_filter=f"{days}d", progress=progress))
+        if progress:
+            progress.report(len(executions), len(executions),
+                            f"Scoring {len(executions)} executions against per-job baselines")
+        
+        return {
+            "project": project or "all projects",
+            "projects_analyzed": len(projects),
+            "analysis_period_days": days,
+            "recent_hours": recent_hours,
+            **execution_anomalies(executions, time.time() - recent_hours * 3600,
+                                  threshold, min_baseline, limit)
+        }
+    
     def run_job_with_monitoring(self, job_id: str, options: Optional[Dict[str, str]] = None,
                                node_filter: Optional[str] = None,
                                wait_for_completion: bool = False,
-                               timeout_minutes: int = 30) -> Dict[str, Any]:
+                               timeout_minutes: int = 30,
+                               priority: int = 0,
+                               max_concurrent_runs: Optional[int] = None,
+                               allow_duplicate: bool = False,
+                               progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
         """Execute a job with optional monitoring until completion"""
-        import time
-        
-        # Start the job
-        execution = self.run_job(job_id, options, node_filter)
+        # Start the job (or attach to an identical launch made moments ago)
+        execution = self.run_job(job_id, options, node_filter, priority, max_concurrent_runs,
+                                 allow_duplicate, progress=progress)
         execution_id = execution.get('id')
         
         if not wait_for_completion or not execution_id:
             return execution
         
+        # Completion is pushed when the job notifies the webhook listener; polling stays as fallback
+        completion_signal = "polling"
+        webhook_hint = None
+        if webhook_receiver is not None:
+            try:
+                definition = self.get_job_definition(job_id, execution.get('project'))
+                if webhook_receiver.notifies_receiver(definition):
+                    completion_signal = "webhook"
+                else:
+                    webhook_hint = (f"Add a webhook notification on success and failure to this job "
+                                    f"with URL {webhook_receiver.url_for(server_name_for_url(self.base_url))} "
+                                    f"(JSON format) so completion is pushed instead of polled")
+            except Exception as e:
+                logger.warning(f"Could not check notifications of job {job_id}: {e}")
+        
         # Monitor execution
         start_time = datetime.now()
         timeout = timedelta(minutes=timeout_minutes)
+        last_status = None
+        history: Optional[List[Dict[str, Any]]] = None
         
         while datetime.now() - start_time < timeout:
             try:
+                pushed = (webhook_receiver.waiters.completion(self.base_url, str(execution_id))
+                          if webhook_receiver else None)
+                # A push only wakes the monitor; the reported status is always read from this server
                 status = self.get_execution_status(str(execution_id))
+                if pushed and status.get('status') not in TERMINAL_EXECUTION_STATUSES:
+                    # The notification is sent on completion; trust it over a lagging read
+                    status = {**status, 'status': pushed['status']}
                 current_status = status.get('status')
+                elapsed = (datetime.now() - start_time).total_seconds()
                 
-                if current_status in ['succeeded', 'failed', 'aborted', 'timedout']:
+                if progress and current_status != last_status:
+                    progress.report(elapsed, timeout.total_seconds(),
+                                    f"Execution {execution_id} is {current_status}")
+                last_status = current_status
+                
+                if current_status in TERMINAL_EXECUTION_STATUSES:
                     # Execution completed
                     return {
                         **execution,
                         "final_status": status,
                         "monitoring_completed": True,
-                        "total_wait_time_seconds": (datetime.now() - start_time).total_seconds()
+                        "total_wait_time_seconds": elapsed,
+                        "completion_signal": "webhook" if pushed else completion_signal,
+                        **({"webhook_hint": webhook_hint} if webhook_hint else {})
                     }
                 
-                # Wait before next check
-                time.sleep(5)
+                # Poll sparsely while the expected finish is far away, every 5s near it
+                if history is None:
+                    job = status.get('job') or {}
+                    project = status.get('project') or job.get('project')
+                    history = []
+                    if job.get('id') and project:
+                        try:
+                            history = self.get_job_duration_history(project, job['id']) or []
+                        except Exception as e:
+                            logger.warning(f"Could not load duration history for job {job['id']}: {e}")
+                forecast = forecast_completion(status, history)
+                interval = 5.0
+                if forecast.get("available") and not forecast["overdue"]:
+                    interval = min(max(forecast["expected_remaining_seconds"] / 2, 5.0), 60.0)
+                if completion_signal == "webhook":
+                    interval = max(interval, WEBHOOK_FALLBACK_POLL_SECONDS)
+                interval = min(interval, max((timeout - (datetime.now() - start_time)).total_seconds(), 0.0))
+                
+                if webhook_receiver is not None:
+                    webhook_receiver.waiters.wait(self.base_url, str(execution_id), interval, progress)
+                elif progress:
+                    progress.wait(interval)
+                else:
+                    time.sleep(interval)
                 
+            except OperationCancelled:
+                raise
             except Exception as e:
                 logger.warning(f"Error monitoring execution {execution_id}: {e}")
                 break
@@ -488,19 +4466,52 @@ class RundeckClient:
             **execution,
             "monitoring_completed": False,
             "timeout_reached": True,
-            "timeout_minutes": timeout_minutes
+            "timeout_minutes": timeout_minutes,
+            "completion_signal": completion_signal,
+            **({"webhook_hint": webhook_hint} if webhook_hint else {})
         }
 
 
 # Initialize the MCP server
 server = Server("rundeck-mcp-server")
 
-# Global Rundeck clients (multiple servers support)
+# Configured Rundeck servers (name -> url, token, api_version), from env and registry file
+server_configs: Dict[str, Dict[str, str]] = {}
+default_server_name: Optional[str] = None
+
+# Rundeck clients, created on first use and evicted when idle
 rundeck_clients: Dict[str, RundeckClient] = {}
+client_last_used: Dict[str, float] = {}
+registry_lock = threading.RLock()
+registry_file_mtime: Optional[float] = None
+registry_last_checked = 0.0
 
 # Global tool prompts
 tool_prompts: Dict[str, Dict[str, str]] = {}
 
+# Recorders for Rundeck HTTP traffic and tool call traces
+http_recorder: Optional[JsonLinesWriter] = JsonLinesWriter(HTTP_RECORD_PATH) if HTTP_RECORD_PATH else None
+tool_trace_recorder: Optional[JsonLinesWriter] = JsonLinesWriter(TOOL_TRACE_PATH) if TOOL_TRACE_PATH else None
+tool_trace_started = time.monotonic()
+
+# Execution log archive (enabled by RUNDECK_LOG_ARCHIVE_DIR)
+log_archive: Optional[ExecutionLogArchive] = None
+
+# Cross-process cache (enabled by RUNDECK_SHARED_CACHE_DIR)
+shared_cache: Optional[SharedCache] = None
+
+# Webhook notification listener (enabled by RUNDECK_WEBHOOK_PORT)
+webhook_receiver: Optional[WebhookReceiver] = None
+
+# Background refresher for hot projects (enabled by RUNDECK_PREFETCH_PROJECTS)
+prefetcher: Optional[Prefetcher] = None
+
+# Worker pools for blocking tool calls, shared by every connected MCP session
+tool_lanes: Dict[str, ExecutionLane] = {
+    'interactive': ExecutionLane('interactive', TOOL_WORKERS),
+    'bulk': ExecutionLane('bulk', BULK_TOOL_WORKERS),
+}
+
 
 def load_tool_prompts():
     """Load tool prompts from external JSON file"""
@@ -519,74 +4530,260 @@ def load_tool_prompts():
         tool_prompts = {}
 
 
-def initialize_rundeck_clients():
-    """Initialize Rundeck clients from environment variables (supports multiple servers)"""
-    global rundeck_clients
+def initialize_log_archive() -> None:
+    """Open the execution log archive if RUNDECK_LOG_ARCHIVE_DIR is set"""
+    global log_archive
+    
+    if not LOG_ARCHIVE_DIR:
+        return
+    try:
+        log_archive = ExecutionLogArchive(LOG_ARCHIVE_DIR, int(LOG_ARCHIVE_MAX_MB * 1024 * 1024))
+        logger.info(f"Archiving execution logs to {log_archive.path}")
+    except sqlite3.Error as e:
+        logger.error(f"Could not open execution log archive in {LOG_ARCHIVE_DIR}: {e}")
+
+
+def initialize_shared_cache() -> None:
+    """Open the cross-process cache if RUNDECK_SHARED_CACHE_DIR is set"""
+    global shared_cache
+    
+    if not SHARED_CACHE_DIR:
+        return
+    try:
+        shared_cache = SharedCache(SHARED_CACHE_DIR, int(SHARED_CACHE_MAX_MB * 1024 * 1024))
+        logger.info(f"Sharing cached Rundeck data through {shared_cache.path}")
+    except sqlite3.Error as e:
+        logger.error(f"Could not open shared cache in {SHARED_CACHE_DIR}: {e}")
+
+
+def initialize_webhook_receiver() -> None:
+    """Start the webhook notification listener if RUNDECK_WEBHOOK_PORT is set"""
+    global webhook_receiver
+    
+    if not WEBHOOK_PORT:
+        return
+    try:
+        webhook_receiver = WebhookReceiver(WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_SECRET, WEBHOOK_PUBLIC_URL,
+                                           resolve_notification_server)
+        logger.info(f"Accepting Rundeck webhook notifications at {webhook_receiver.public_url}")
+    except OSError as e:
+        logger.error(f"Could not start webhook listener on {WEBHOOK_HOST}:{WEBHOOK_PORT}: {e}")
+
+
+def initialize_prefetcher() -> None:
+    """Start warming hot projects in the background if RUNDECK_PREFETCH_PROJECTS is set"""
+    global prefetcher
+    
+    if not PREFETCH_PROJECTS:
+        return
+    prefetcher = Prefetcher(PREFETCH_PROJECTS)
+    prefetcher.start()
+    logger.info(f"Prefetching {', '.join(PREFETCH_PROJECTS)} every {PREFETCH_INTERVAL_SECONDS:g}s")
+
+
+def load_env_server_configs() -> Dict[str, Dict[str, str]]:
+    """Read server configuration from RUNDECK_URL / RUNDECK_URL_<n> environment variables"""
+    configs: Dict[str, Dict[str, str]] = {}
+    
+    # Check for single server configuration (backward compatibility)
+    base_url = os.getenv('RUNDECK_URL')
+    api_token = os.getenv('RUNDECK_API_TOKEN')
+    if base_url and api_token:
+        configs['default'] = {
+            'url': base_url,
+            'token': api_token,
+            'api_version': os.getenv('RUNDECK_API_VERSION', '47')
+        }
+    
+    # Check for numbered multiple server configuration, without a fixed limit
+    numbers = sorted(int(m.group(1)) for m in (re.fullmatch(r'RUNDECK_URL_(\d+)', key) for key in os.environ) if m)
+    for i in numbers:
+        server_url = os.getenv(f'RUNDECK_URL_{i}')
+        server_token = os.getenv(f'RUNDECK_API_TOKEN_{i}')
+        if server_url and server_token:
+            configs[os.getenv(f'RUNDECK_NAME_{i}', f'server_{i}')] = {
+                'url': server_url,
+                'token': server_token,
+                'api_version': os.getenv(f'RUNDECK_API_VERSION_{i}', '47')
+            }
+    return configs
+
+
+def load_registry_file(path: str) -> Dict[str, Any]:
+    """Read a YAML or JSON server registry.
+    
+    The file holds a ``servers`` list (or name -> settings mapping) with
+    ``name``, ``url``, ``token`` or ``token_env`` and optional
+    ``api_version``, plus an optional top-level ``default`` server name.
+    """
+    with open(path, 'r') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise ValueError(f"PyYAML is required to read {path}. Install it or use a JSON registry")
+            try:
+                data = yaml.safe_load(f) or {}
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML: {e}")
+        else:
+            data = json.load(f)
+    
+    if not isinstance(data, dict):
+        raise ValueError("Registry must be a mapping with a 'servers' entry")
+    servers = data.get('servers') or []
+    if isinstance(servers, dict):
+        if not all(isinstance(settings, dict) or settings is None for settings in servers.values()):
+            raise ValueError("Each server in 'servers' must be a mapping of settings")
+        servers = [{'name': name, **(settings or {})} for name, settings in servers.items()]
+    if not isinstance(servers, list) or not all(isinstance(entry, dict) for entry in servers):
+        raise ValueError("'servers' must be a list of server mappings or a name -> settings mapping")
+    
+    configs: Dict[str, Dict[str, str]] = {}
+    for entry in servers:
+        name = entry.get('name')
+        token = entry.get('token') or (os.getenv(entry['token_env']) if entry.get('token_env') else None)
+        if not name or not entry.get('url') or not token:
+            logger.warning(f"Skipping incomplete server registry entry: {name or entry.get('url')}")
+            continue
+        configs[str(name)] = {
+            'url': str(entry['url']),
+            'token': str(token),
+            'api_version': str(entry.get('api_version', '47'))
+        }
+    return {'servers': configs, 'default': data.get('default')}
+
+
+def apply_server_configs(configs: Dict[str, Dict[str, str]], default: Optional[str] = None) -> None:
+    """Swap in a new server configuration, dropping clients whose settings changed"""
+    global server_configs, default_server_name
+    
+    with registry_lock:
+        for name in list(rundeck_clients):
+            if configs.get(name) != server_configs.get(name):
+                rundeck_clients.pop(name, None)
+                client_last_used.pop(name, None)
+        server_configs = configs
+        default_server_name = default
+
+
+def load_server_configs() -> None:
+    """Load server configuration from the environment and RUNDECK_SERVERS_FILE.
     
-    # Clear existing clients
-    rundeck_clients = {}
+    A registry file that cannot be read or parsed (say, half-saved while
+    being edited) leaves the last good configuration and its clients in
+    place, and is retried on the next registry check.
+    """
+    global registry_file_mtime
     
-    # Check for single server configuration (backward compatibility)
-    base_url = os.getenv('RUNDECK_URL')
-    api_token = os.getenv('RUNDECK_API_TOKEN')
-    api_version = os.getenv('RUNDECK_API_VERSION', '47')
+    configs = load_env_server_configs()
+    default = 'default' if 'default' in configs else None
+    if SERVERS_FILE:
+        try:
+            mtime = os.path.getmtime(SERVERS_FILE)
+            registry = load_registry_file(SERVERS_FILE)
+        except (OSError, ValueError) as e:
+            if server_configs:
+                logger.error(f"Could not load server registry {SERVERS_FILE}, "
+                             f"keeping the last good configuration: {e}")
+                return
+            logger.error(f"Could not load server registry {SERVERS_FILE}: {e}")
+        else:
+            registry_file_mtime = mtime
+            configs.update(registry['servers'])
+            default = default or registry['default']
+            logger.info(f"Loaded {len(registry['servers'])} server(s) from {SERVERS_FILE}")
+    apply_server_configs(configs, default)
+
+
+def refresh_server_registry() -> None:
+    """Reload the registry file when it changes and evict idle clients (throttled)"""
+    global registry_last_checked
     
-    if base_url and api_token:
-        # Single server configuration
-        client = RundeckClient(base_url, api_token, api_version)
-        rundeck_clients['default'] = client
-        logger.info(f"Initialized default Rundeck client for {base_url}")
-    
-    # Check for multiple server configuration
-    server_count = 0
-    for i in range(1, 10):  # Support up to 9 additional servers
-        url_key = f'RUNDECK_URL_{i}'
-        token_key = f'RUNDECK_API_TOKEN_{i}'
-        version_key = f'RUNDECK_API_VERSION_{i}'
-        name_key = f'RUNDECK_NAME_{i}'
-        
-        server_url = os.getenv(url_key)
-        server_token = os.getenv(token_key)
-        server_version = os.getenv(version_key, '47')
-        server_name = os.getenv(name_key, f'server_{i}')
+    now = time.time()
+    with registry_lock:
+        if now - registry_last_checked < REGISTRY_CHECK_SECONDS:
+            return
+        registry_last_checked = now
         
-        if server_url and server_token:
-            client = RundeckClient(server_url, server_token, server_version)
-            rundeck_clients[server_name] = client
-            logger.info(f"Initialized Rundeck client '{server_name}' for {server_url}")
-            server_count += 1
+        if SERVERS_FILE:
+            try:
+                mtime = os.path.getmtime(SERVERS_FILE)
+            except OSError:
+                mtime = None
+            if mtime is not None and mtime != registry_file_mtime:
+                logger.info(f"Server registry {SERVERS_FILE} changed, reloading")
+                load_server_configs()
+        
+        # Dropped clients stay usable by calls still holding them
+        for name, last_used in list(client_last_used.items()):
+            if now - last_used > CLIENT_IDLE_SECONDS:
+                rundeck_clients.pop(name, None)
+                client_last_used.pop(name, None)
+                logger.info(f"Evicted idle Rundeck client '{name}'")
+
+
+def initialize_rundeck_clients():
+    """Load Rundeck server configuration (supports multiple servers); clients are created on first use"""
+    load_server_configs()
     
-    if not rundeck_clients:
+    if not server_configs:
         raise ValueError(
             "No Rundeck servers configured. Set RUNDECK_URL and RUNDECK_API_TOKEN "
-            "for single server, or RUNDECK_URL_1, RUNDECK_API_TOKEN_1, etc. for multiple servers"
+            "for single server, RUNDECK_URL_1, RUNDECK_API_TOKEN_1, etc. for multiple servers, "
+            "or RUNDECK_SERVERS_FILE for a server registry"
         )
     
-    logger.info(f"Initialized {len(rundeck_clients)} Rundeck client(s)")
+    logger.info(f"Configured {len(server_configs)} Rundeck server(s)")
 
 
 def get_rundeck_client(server_name: Optional[str] = None) -> RundeckClient:
     """Get a Rundeck client by name, or default if not specified"""
-    if not rundeck_clients:
-        raise ValueError("No Rundeck clients initialized")
+    refresh_server_registry()
     
-    if server_name is None:
-        # Return default client or first available
-        if 'default' in rundeck_clients:
-            return rundeck_clients['default']
-        else:
-            return next(iter(rundeck_clients.values()))
-    
-    if server_name not in rundeck_clients:
-        available = list(rundeck_clients.keys())
-        raise ValueError(f"Rundeck server '{server_name}' not found. Available servers: {available}")
-    
-    return rundeck_clients[server_name]
+    with registry_lock:
+        if not server_configs:
+            raise ValueError("No Rundeck servers configured")
+        
+        if server_name is None:
+            # Use the default server or first available
+            server_name = default_server_name if default_server_name in server_configs else next(iter(server_configs))
+        
+        if server_name not in server_configs:
+            available = list(server_configs.keys())
+            raise ValueError(f"Rundeck server '{server_name}' not found. Available servers: {available}")
+        
+        client = rundeck_clients.get(server_name)
+        if client is None:
+            config = server_configs[server_name]
+            client = RundeckClient(config['url'], config['token'], config['api_version'])
+            rundeck_clients[server_name] = client
+            logger.info(f"Created Rundeck client '{server_name}' for {config['url']}")
+        client_last_used[server_name] = time.time()
+        return client
 
 
 def list_rundeck_servers() -> List[str]:
     """Get list of configured Rundeck server names"""
-    return list(rundeck_clients.keys())
+    refresh_server_registry()
+    return list(server_configs.keys())
+
+
+def server_name_for_url(base_url: str) -> Optional[str]:
+    """Name of the configured server with the given base URL"""
+    with registry_lock:
+        return next((name for name, config in server_configs.items()
+                     if config['url'].rstrip('/') == base_url.rstrip('/')), None)
+
+
+def resolve_notification_server(server_name: Optional[str], server_url: Optional[str]) -> Optional[str]:
+    """Base URL of the configured server a webhook notification came from"""
+    with registry_lock:
+        urls = {name: config['url'].rstrip('/') for name, config in server_configs.items()}
+    if server_name:
+        return urls.get(server_name)
+    if server_url:
+        return match_server_url(server_url, list(urls.values()))
+    # Without a link only a single configured server is unambiguous
+    return next(iter(urls.values())) if len(urls) == 1 else None
 
 
 @server.list_tools()
@@ -600,19 +4797,290 @@ async def handle_list_tools() -> List[Tool]:
             return f"{prompt_info.get('description', fallback)}\n\n{prompt_info.get('prompt', '')}"
         return fallback
     
-    return [
+    tools = [
+        Tool(
+            name="list_servers",
+            description="List all configured Rundeck servers",
+            inputSchema={
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        ),
+        Tool(
+            name="get_projects",
+            description=get_tool_description("get_projects", "Get all Rundeck projects"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="get_jobs",
+            description=get_tool_description("get_jobs", "Get jobs from a Rundeck project with optional filtering"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "project": {
+                        "type": "string",
+                        "description": "The project name"
+                    },
+                    "job_filter": {
+                        "type": "string",
+                        "description": "Optional job name filter"
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["project"]
+            }
+        ),
+        Tool(
+            name="get_job_definition",
+            description=get_tool_description("get_job_definition", "Get detailed job definition including options, workflow, and metadata"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "The job ID or UUID"
+                    },
+                    "project": {
+                        "type": "string",
+                        "description": "The job's project, if known (keeps the job dependency graph complete)"
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="run_job",
+            description=get_tool_description("run_job", "Execute a Rundeck job with optional parameters"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "The job ID or UUID to execute"
+                    },
+                    "options": {
+                        "type": "object",
+                        "description": "Job options as key-value pairs",
+                        "additionalProperties": {"type": "string"}
+                    },
+                    "node_filter": {
+                        "type": "string",
+                        "description": "Optional node filter for job execution"
+                    },
+                    "priority": {
+                        "type": "integer",
+                        "description": "Launch priority when launches are queued (higher goes first)",
+                        "default": 0
+                    },
+                    "max_concurrent_runs": {
+                        "type": "integer",
+                        "description": "Queue the launch while the job already has this many running executions (0 = no limit)"
+                    },
+                    "allow_duplicate": {
+                        "type": "boolean",
+                        "description": "Launch even if an identical launch happened moments ago",
+                        "default": False
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="get_execution_status",
+            description=get_tool_description("get_execution_status", "Get the status and details of a job execution"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "execution_id": {
+                        "type": "string",
+                        "description": "The execution ID"
+                    },
+                    "forecast": {
+                        "type": "boolean",
+                        "description": "Load the job's duration history to forecast completion of a running execution (otherwise only cached history is used)",
+                        "default": False
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["execution_id"]
+            }
+        ),
+        Tool(
+            name="get_execution_output",
+            description=get_tool_description("get_execution_output", "Get the output logs of a job execution"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "execution_id": {
+                        "type": "string",
+                        "description": "The execution ID"
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Index of the first log entry to return (default: 0); use next_offset to page",
+                        "default": 0
+                    },
+                    "max_entries": {
+                        "type": "integer",
+                        "description": "Maximum log entries to return (default: RUNDECK_OUTPUT_MAX_ENTRIES, 5000)",
+                        "default": OUTPUT_MAX_ENTRIES
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["execution_id"]
+            }
+        ),
+        Tool(
+            name="get_executions",
+            description=get_tool_description("get_executions", "Get executions for a project with filtering options"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "project": {
+                        "type": "string",
+                        "description": "The project name"
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": "Maximum number of results to return per page",
+                        "default": 100
+                    },
+                    "status": {
+                        "type": "string",
+                        "description": "Filter by execution status (succeeded, failed, running, etc.)"
+                    },
+                    "user": {
+                        "type": "string",
+                        "description": "Filter by user who executed the job"
+                    },
+                    "job_id": {
+                        "type": "string",
+                        "description": "Filter by specific job ID"
+                    },
+                    "recent_filter": {
+                        "type": "string",
+                        "description": "Recent time filter (e.g., '1d', '7d', '30d')"
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Offset for pagination (0-based)",
+                        "default": 0
+                    },
+                    "summary_only": {
+                        "type": "boolean",
+                        "description": "Return only summary information instead of full execution details",
+                        "default": True
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["project"]
+            }
+        ),
+        Tool(
+            name="get_all_executions",
+            description=get_tool_description("get_all_executions", "Get all executions with automatic pagination (up to specified limit)"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "project": {
+                        "type": "string",
+                        "description": "The project name"
+                    },
+                    "max_total": {
+                        "type": "integer",
+                        "description": "Maximum total number of executions to retrieve",
+                        "default": 5000
+                    },
+                    "status": {
+                        "type": "string",
+                        "description": "Filter by execution status (succeeded, failed, running, etc.)"
+                    },
+                    "user": {
+                        "type": "string",
+                        "description": "Filter by user who executed the job"
+                    },
+                    "job_id": {
+                        "type": "string",
+                        "description": "Filter by specific job ID"
+                    },
+                    "recent_filter": {
+                        "type": "string",
+                        "description": "Recent time filter (e.g., '1d', '7d', '30d')"
+                    },
+                    "summary_only": {
+                        "type": "boolean",
+                        "description": "Return only summary information instead of full execution details",
+                        "default": True
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Fetch from Rundeck instead of reusing a recent wider fetch",
+                        "default": False
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["project"]
+            }
+        ),
         Tool(
-            name="list_servers",
-            description="List all configured Rundeck servers",
+            name="get_execution_metrics",
+            description=get_tool_description("get_execution_metrics", "Get comprehensive execution metrics and analytics for a project"),
             inputSchema={
                 "type": "object",
-                "properties": {},
-                "required": []
+                "properties": {
+                    "project": {
+                        "type": "string",
+                        "description": "The project name"
+                    },
+                    "days": {
+                        "type": "integer",
+                        "description": "Number of days to analyze",
+                        "default": 30
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["project"]
             }
         ),
         Tool(
-            name="get_projects",
-            description=get_tool_description("get_projects", "Get all Rundeck projects"),
+            name="get_system_info",
+            description=get_tool_description("get_system_info", "Get Rundeck system information and health metrics"),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -625,8 +5093,8 @@ async def handle_list_tools() -> List[Tool]:
             }
         ),
         Tool(
-            name="get_jobs",
-            description=get_tool_description("get_jobs", "Get jobs from a Rundeck project with optional filtering"),
+            name="get_project_stats",
+            description=get_tool_description("get_project_stats", "Get comprehensive statistics for a project including jobs and execution metrics"),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -634,10 +5102,6 @@ async def handle_list_tools() -> List[Tool]:
                         "type": "string",
                         "description": "The project name"
                     },
-                    "job_filter": {
-                        "type": "string",
-                        "description": "Optional job name filter"
-                    },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
@@ -647,32 +5111,108 @@ async def handle_list_tools() -> List[Tool]:
             }
         ),
         Tool(
-            name="get_job_definition",
-            description=get_tool_description("get_job_definition", "Get detailed job definition including options, workflow, and metadata"),
+            name="calculate_job_roi",
+            description=get_tool_description("calculate_job_roi", "Calculate ROI metrics for a specific job including cost analysis and value estimation"),
             inputSchema={
                 "type": "object",
                 "properties": {
+                    "project": {
+                        "type": "string",
+                        "description": "The project name"
+                    },
                     "job_id": {
                         "type": "string",
-                        "description": "The job ID or UUID"
+                        "description": "The job ID to analyze"
+                    },
+                    "cost_per_hour": {
+                        "type": "number",
+                        "description": "Cost per hour for execution resources",
+                        "default": 50.0
+                    },
+                    "days": {
+                        "type": "integer",
+                        "description": "Number of days to analyze",
+                        "default": 30
                     },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
                     }
                 },
-                "required": ["job_id"]
+                "required": ["project", "job_id"]
             }
         ),
         Tool(
-            name="run_job",
-            description=get_tool_description("run_job", "Execute a Rundeck job with optional parameters"),
+            name="calculate_project_roi",
+            description=get_tool_description("calculate_project_roi", "Calculate ROI for every job of a project in one call, ranked by net value"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "project": {
+                        "type": "string",
+                        "description": "The project name"
+                    },
+                    "cost_per_hour": {
+                        "type": "number",
+                        "description": "Cost per hour for execution resources",
+                        "default": 50.0
+                    },
+                    "days": {
+                        "type": "integer",
+                        "description": "Number of days to analyze",
+                        "default": 30
+                    },
+                    "manual_hours_per_run": {
+                        "type": "number",
+                        "description": "Manual work hours saved by each successful run",
+                        "default": 1.0
+                    },
+                    "manual_hours_overrides": {
+                        "type": "object",
+                        "additionalProperties": {"type": "number"},
+                        "description": "Manual hours saved per run for specific jobs, keyed by job ID or job name"
+                    },
+                    "max_executions": {
+                        "type": "integer",
+                        "description": "Maximum number of executions to fetch",
+                        "default": 20000
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["project"]
+            }
+        ),
+        Tool(
+            name="get_bulk_execution_status",
+            description=get_tool_description("get_bulk_execution_status", "Get status for multiple executions efficiently"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "execution_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "List of execution IDs to check"
+                    },
+                    "server": {
+                        "type": "string",
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["execution_ids"]
+            }
+        ),
+        Tool(
+            name="run_job_with_monitoring",
+            description=get_tool_description("run_job_with_monitoring", "Execute a job with optional monitoring until completion"),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "job_id": {
                         "type": "string",
-                        "description": "The job ID or UUID to execute"
+                        "description": "The job ID to execute"
                     },
                     "options": {
                         "type": "object",
@@ -683,6 +5223,29 @@ async def handle_list_tools() -> List[Tool]:
                         "type": "string",
                         "description": "Optional node filter for job execution"
                     },
+                    "wait_for_completion": {
+                        "type": "boolean",
+                        "description": "Whether to wait and monitor until job completion"
+                    },
+                    "timeout_minutes": {
+                        "type": "integer",
+                        "description": "Timeout in minutes for monitoring",
+                        "default": 30
+                    },
+                    "priority": {
+                        "type": "integer",
+                        "description": "Launch priority when launches are queued (higher goes first)",
+                        "default": 0
+                    },
+                    "max_concurrent_runs": {
+                        "type": "integer",
+                        "description": "Queue the launch while the job already has this many running executions (0 = no limit)"
+                    },
+                    "allow_duplicate": {
+                        "type": "boolean",
+                        "description": "Launch even if an identical launch happened moments ago, instead of monitoring that execution",
+                        "default": False
+                    },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
@@ -692,44 +5255,63 @@ async def handle_list_tools() -> List[Tool]:
             }
         ),
         Tool(
-            name="get_execution_status",
-            description=get_tool_description("get_execution_status", "Get the status and details of a job execution"),
+            name="preview_node_filter",
+            description=get_tool_description("preview_node_filter", "Preview and validate the nodes a node filter targets before running a job"),
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "execution_id": {
+                    "project": {
                         "type": "string",
-                        "description": "The execution ID"
+                        "description": "The project name"
+                    },
+                    "node_filter": {
+                        "type": "string",
+                        "description": "Rundeck node filter (e.g., 'tags: web+prod !hostname: db.*')"
+                    },
+                    "max_nodes": {
+                        "type": "integer",
+                        "description": "Maximum number of matched nodes to list",
+                        "default": 50
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Reload the node inventory instead of using the cache",
+                        "default": False
                     },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
                     }
                 },
-                "required": ["execution_id"]
+                "required": ["project", "node_filter"]
             }
         ),
         Tool(
-            name="get_execution_output",
-            description=get_tool_description("get_execution_output", "Get the output logs of a job execution"),
+            name="search_execution_logs",
+            description=get_tool_description("search_execution_logs", "Full-text search across archived execution output logs"),
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "execution_id": {
+                    "query": {
                         "type": "string",
-                        "description": "The execution ID"
+                        "description": "Text to search for (SQLite FTS5 syntax, e.g. 'connection refused' or 'timeout OR unreachable')"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of matching executions to return",
+                        "default": 50
                     },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
                     }
                 },
-                "required": ["execution_id"]
+                "required": ["query"]
             }
         ),
         Tool(
-            name="get_executions",
-            description=get_tool_description("get_executions", "Get executions for a project with filtering options"),
+            name="cluster_failures",
+            description=get_tool_description("cluster_failures", "Group recent failed executions into clusters of distinct failure causes"),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -737,36 +5319,25 @@ async def handle_list_tools() -> List[Tool]:
                         "type": "string",
                         "description": "The project name"
                     },
-                    "max_results": {
+                    "days": {
                         "type": "integer",
-                        "description": "Maximum number of results to return per page",
-                        "default": 100
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Filter by execution status (succeeded, failed, running, etc.)"
-                    },
-                    "user": {
-                        "type": "string",
-                        "description": "Filter by user who executed the job"
+                        "description": "Number of days of failed executions to analyze",
+                        "default": 1
                     },
-                    "job_id": {
-                        "type": "string",
-                        "description": "Filter by specific job ID"
+                    "max_executions": {
+                        "type": "integer",
+                        "description": "Maximum number of failed executions to analyze",
+                        "default": 300
                     },
-                    "recent_filter": {
-                        "type": "string",
-                        "description": "Recent time filter (e.g., '1d', '7d', '30d')"
+                    "similarity": {
+                        "type": "number",
+                        "description": "Minimum estimated similarity (0-1) for merging near-duplicate error signatures",
+                        "default": 0.6
                     },
-                    "offset": {
+                    "max_clusters": {
                         "type": "integer",
-                        "description": "Offset for pagination (0-based)",
-                        "default": 0
-                    },
-                    "summary_only": {
-                        "type": "boolean",
-                        "description": "Return only summary information instead of full execution details",
-                        "default": True
+                        "description": "Maximum number of clusters to return",
+                        "default": 20
                     },
                     "server": {
                         "type": "string",
@@ -777,8 +5348,8 @@ async def handle_list_tools() -> List[Tool]:
             }
         ),
         Tool(
-            name="get_all_executions",
-            description=get_tool_description("get_all_executions", "Get all executions with automatic pagination (up to specified limit)"),
+            name="forecast_running_executions",
+            description=get_tool_description("forecast_running_executions", "Estimate completion times for running executions and flag overdue ones"),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -786,69 +5357,108 @@ async def handle_list_tools() -> List[Tool]:
                         "type": "string",
                         "description": "The project name"
                     },
-                    "max_total": {
-                        "type": "integer",
-                        "description": "Maximum total number of executions to retrieve",
-                        "default": 5000
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Filter by execution status (succeeded, failed, running, etc.)"
-                    },
-                    "user": {
+                    "server": {
                         "type": "string",
-                        "description": "Filter by user who executed the job"
-                    },
-                    "job_id": {
+                        "description": "Rundeck server name (optional, uses default if not specified)"
+                    }
+                },
+                "required": ["project"]
+            }
+        ),
+        Tool(
+            name="get_execution_state_changes",
+            description=get_tool_description("get_execution_state_changes", "Follow per-node and per-step progress of an execution, returning only what changed since the last poll"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "execution_id": {
                         "type": "string",
-                        "description": "Filter by specific job ID"
+                        "description": "The execution ID to follow"
                     },
-                    "recent_filter": {
+                    "cursor": {
                         "type": "string",
-                        "description": "Recent time filter (e.g., '1d', '7d', '30d')"
-                    },
-                    "summary_only": {
-                        "type": "boolean",
-                        "description": "Return only summary information instead of full execution details",
-                        "default": True
+                        "description": "Cursor returned by the previous call (omit for the full current state)"
                     },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
                     }
                 },
-                "required": ["project"]
+                "required": ["execution_id"]
             }
         ),
         Tool(
-            name="get_execution_metrics",
-            description=get_tool_description("get_execution_metrics", "Get comprehensive execution metrics and analytics for a project"),
+            name="get_concurrency_profile",
+            description=get_tool_description("get_concurrency_profile", "Analyze how many executions run at once: peak and percentile concurrency, hourly heatmap and most-overlapping jobs"),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "project": {
                         "type": "string",
-                        "description": "The project name"
+                        "description": "The project name (optional, analyzes every project if not specified)"
                     },
                     "days": {
                         "type": "integer",
-                        "description": "Number of days to analyze",
-                        "default": 30
+                        "description": "Number of days of execution history to analyze",
+                        "default": 7
+                    },
+                    "max_executions": {
+                        "type": "integer",
+                        "description": "Maximum number of executions to fetch per project",
+                        "default": 20000
+                    },
+                    "top_jobs": {
+                        "type": "integer",
+                        "description": "Number of most-overlapping jobs to return",
+                        "default": 10
                     },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
                     }
                 },
-                "required": ["project"]
+                "required": []
             }
         ),
         Tool(
-            name="get_system_info",
-            description=get_tool_description("get_system_info", "Get Rundeck system information and health metrics"),
+            name="forecast_schedule_load",
+            description=get_tool_description("forecast_schedule_load", "Forecast upcoming concurrent executions from job schedules and historical durations"),
             inputSchema={
                 "type": "object",
                 "properties": {
+                    "project": {
+                        "type": "string",
+                        "description": "The project name (optional, forecasts every project if not specified)"
+                    },
+                    "horizon_hours": {
+                        "type": "integer",
+                        "description": "Hours ahead to forecast",
+                        "default": 24
+                    },
+                    "bucket_minutes": {
+                        "type": "integer",
+                        "description": "Width of each forecast time bucket in minutes",
+                        "default": 15
+                    },
+                    "history_days": {
+                        "type": "integer",
+                        "description": "Days of successful executions used for expected durations",
+                        "default": 30
+                    },
+                    "default_duration_seconds": {
+                        "type": "number",
+                        "description": "Duration assumed for jobs without execution history",
+                        "default": 60
+                    },
+                    "timezone": {
+                        "type": "string",
+                        "description": "Time zone of the Rundeck server for jobs without their own, e.g. 'Europe/London' (optional, defaults to this machine's)"
+                    },
+                    "top": {
+                        "type": "integer",
+                        "description": "Number of hot spots and busiest jobs to return",
+                        "default": 10
+                    },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
@@ -858,122 +5468,286 @@ async def handle_list_tools() -> List[Tool]:
             }
         ),
         Tool(
-            name="get_project_stats",
-            description=get_tool_description("get_project_stats", "Get comprehensive statistics for a project including jobs and execution metrics"),
+            name="get_job_graph",
+            description=get_tool_description("get_job_graph", "Map which jobs call which through job reference steps: callers, callees, impact and cycles"),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "project": {
                         "type": "string",
-                        "description": "The project name"
+                        "description": "The project name (optional, builds the graph across every project if not specified)"
+                    },
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job to show upstream callers, downstream callees and impact for (optional, summarizes the graph if not specified)"
+                    },
+                    "max_depth": {
+                        "type": "integer",
+                        "description": "Limit upstream/downstream to this many reference hops (optional, unlimited by default)"
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Re-export the job definitions even if the cached graph is recent",
+                        "default": False
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum entries in the summary lists",
+                        "default": 20
                     },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
                     }
                 },
-                "required": ["project"]
+                "required": []
             }
         ),
         Tool(
-            name="calculate_job_roi",
-            description=get_tool_description("calculate_job_roi", "Calculate ROI metrics for a specific job including cost analysis and value estimation"),
+            name="detect_anomalies",
+            description=get_tool_description("detect_anomalies", "Flag executions with unusual durations and jobs whose duration or failure rate has shifted"),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "project": {
                         "type": "string",
-                        "description": "The project name"
+                        "description": "The project name (optional, analyzes every project if not specified)"
                     },
-                    "job_id": {
-                        "type": "string",
-                        "description": "The job ID to analyze"
+                    "days": {
+                        "type": "integer",
+                        "description": "Days of execution history used for the baselines",
+                        "default": 30
                     },
-                    "cost_per_hour": {
+                    "recent_hours": {
+                        "type": "integer",
+                        "description": "Hours of recent executions compared against the baselines",
+                        "default": 24
+                    },
+                    "threshold": {
                         "type": "number",
-                        "description": "Cost per hour for execution resources",
-                        "default": 50.0
+                        "description": "Robust z-score (standard errors) at which a deviation is flagged",
+                        "default": 3.5
                     },
-                    "days": {
+                    "min_baseline": {
                         "type": "integer",
-                        "description": "Number of days to analyze",
-                        "default": 30
+                        "description": "Minimum baseline executions before a job is scored",
+                        "default": 10
                     },
-                    "server": {
-                        "type": "string",
-                        "description": "Rundeck server name (optional, uses default if not specified)"
-                    }
-                },
-                "required": ["project", "job_id"]
-            }
-        ),
-        Tool(
-            name="get_bulk_execution_status",
-            description=get_tool_description("get_bulk_execution_status", "Get status for multiple executions efficiently"),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "execution_ids": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of execution IDs to check"
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of entries in each list",
+                        "default": 20
+                    },
+                    "max_executions": {
+                        "type": "integer",
+                        "description": "Maximum number of executions to fetch per project",
+                        "default": 20000
                     },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
                     }
                 },
-                "required": ["execution_ids"]
+                "required": []
             }
         ),
         Tool(
-            name="run_job_with_monitoring",
-            description=get_tool_description("run_job_with_monitoring", "Execute a job with optional monitoring until completion"),
+            name="get_node_reliability",
+            description=get_tool_description("get_node_reliability", "Rank nodes by execution failure rate and failure streaks to find flaky hosts"),
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "job_id": {
+                    "project": {
                         "type": "string",
-                        "description": "The job ID to execute"
+                        "description": "The project name (optional, analyzes every project if not specified)"
                     },
-                    "options": {
-                        "type": "object",
-                        "description": "Job options as key-value pairs",
-                        "additionalProperties": {"type": "string"}
+                    "days": {
+                        "type": "integer",
+                        "description": "Number of days of execution history to analyze",
+                        "default": 7
                     },
-                    "node_filter": {
-                        "type": "string",
-                        "description": "Optional node filter for job execution"
+                    "min_executions": {
+                        "type": "integer",
+                        "description": "Minimum executions on a node before it is ranked",
+                        "default": 3
                     },
-                    "wait_for_completion": {
-                        "type": "boolean",
-                        "description": "Whether to wait and monitor until job completion"
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of nodes to return",
+                        "default": 20
                     },
-                    "timeout_minutes": {
+                    "max_executions": {
                         "type": "integer",
-                        "description": "Timeout in minutes for monitoring",
-                        "default": 30
+                        "description": "Maximum number of executions to fetch per project",
+                        "default": 20000
                     },
                     "server": {
                         "type": "string",
                         "description": "Rundeck server name (optional, uses default if not specified)"
                     }
                 },
-                "required": ["job_id"]
+                "required": []
+            }
+        ),
+        Tool(
+            name="get_mcp_server_metrics",
+            description=get_tool_description("get_mcp_server_metrics", "Show this MCP server's lane queue depths, rate limiting and cache statistics"),
+            inputSchema={
+                "type": "object",
+                "properties": {},
+                "required": []
             }
         )
     ]
+    
+    if PROFILE_DIR:
+        for tool in tools:
+            tool.inputSchema["properties"]["profile"] = {
+                "type": "boolean",
+                "description": "Profile this call (CPU and allocations) and append a hot-spot summary",
+                "default": False
+            }
+    
+    return tools
 
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[TextContent]:
-    """Handle tool calls"""
-    if not rundeck_clients:
+    """Handle tool calls on the shared worker pools so concurrent sessions don't block each other"""
+    loop = asyncio.get_running_loop()
+    
+    try:
+        request_context = server.request_context
+        progress = ToolProgress(
+            loop, request_context.session,
+            request_context.meta.progressToken if request_context.meta else None,
+            request_context.request_id
+        )
+    except LookupError:
+        progress = ToolProgress()
+    
+    arguments = dict(arguments)
+    profile = bool(arguments.pop("profile", False))
+    target = execute_tool
+    if PROFILE_DIR and (profile or name in PROFILE_TOOLS or '*' in PROFILE_TOOLS):
+        target = functools.partial(profile_tool_call, execute_tool)
+    if tracer.enabled:
+        target = functools.partial(trace_tool_call, target)
+    
+    lane = 'bulk' if name in BULK_TOOLS else 'interactive'
+    context = contextvars.copy_context()
+    context.run(current_progress.set, progress)
+    context.run(current_lane.set, lane)
+    started = time.monotonic()
+    try:
+        result: Sequence[TextContent] = await tool_lanes[lane].submit(
+            loop, functools.partial(context.run, target, name, arguments)
+        )
+        if tool_trace_recorder is not None:
+            tool_trace_recorder.write({
+                "offset_seconds": round(started - tool_trace_started, 3),
+                "name": name,
+                "arguments": redact_arguments(arguments),
+                "duration_ms": round((time.monotonic() - started) * 1000, 2)
+            })
+        return result
+    except asyncio.CancelledError:
+        # Stop the worker thread at its next page or poll boundary
+        progress.cancel()
+        logger.info(f"Tool call {name} cancelled by client")
+        raise
+
+
+def launch_result_content(execution: Dict[str, Any]) -> List[TextContent]:
+    """Tool result for a job launch, leading with a notice when no new run was started"""
+    content = [TextContent(type="text", text=to_json_text(execution))]
+    launch = execution.get('launch_queue') or {}
+    if launch.get('deduplicated'):
+        content.insert(0, TextContent(type="text", text=(
+            f"Deduplicated: attached to existing execution {launch.get('existing_execution_id')}, "
+            f"started moments ago by an identical launch. No new run was started; "
+            f"pass allow_duplicate=true to start one.")))
+    return content
+
+
+def trace_tool_call(func: Callable[[str, Dict[str, Any]], Sequence[TextContent]],
+                    name: str, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+    """Run a tool call inside a root span that parents its Rundeck requests"""
+    with tracer.span(f"tool {name}", kind='SERVER', attributes={
+        "mcp.tool.name": name,
+        "mcp.tool.arguments": json.dumps(redact_arguments(arguments), sort_keys=True)
+    }) as span:
+        result = func(name, arguments)
+        if result and result[0].text.startswith("Error"):
+            span.set_error(result[0].text[:200])
+        return result
+
+
+# Profiled calls run one at a time since tracemalloc traces the whole process
+profile_lock = threading.Lock()
+
+
+def profile_tool_call(func: Any, name: str, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+    """Run a tool call under cProfile and tracemalloc, saving reports to PROFILE_DIR"""
+    with profile_lock:
+        profiler = cProfile.Profile()
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(10)
+        before = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        
+        profiler.enable()
+        try:
+            result = list(func(name, arguments))
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            after = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+    
+    directory = Path(PROFILE_DIR or '.')
+    directory.mkdir(parents=True, exist_ok=True)
+    prefix = directory / f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{name}"
+    profiler.dump_stats(f"{prefix}.prof")
+    
+    allocation_diff = after.compare_to(before, 'lineno')
+    with open(f"{prefix}-allocations.txt", 'w') as f:
+        for stat in allocation_diff[:50]:
+            f.write(f"{stat}\n")
+    
+    stats = pstats.Stats(profiler)
+    hot_spots = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:10]  # type: ignore[attr-defined]
+    
+    lines = [f"🔬 Profile of {name}: {elapsed * 1000:.1f} ms wall, peak traced memory {peak / 1024 / 1024:.1f} MiB"]
+    lines.append(f"Saved {prefix}.prof and {prefix}-allocations.txt")
+    lines.append("")
+    lines.append("Top functions by own time:")
+    for (filename, lineno, function), (_, ncalls, tottime, cumtime, _) in hot_spots:
+        lines.append(f"  {tottime * 1000:9.1f} ms own {cumtime * 1000:9.1f} ms cum {ncalls:>8} calls  "
+                     f"{function} ({Path(filename).name}:{lineno})")
+    lines.append("")
+    lines.append("Top allocation sites:")
+    for stat in allocation_diff[:5]:
+        frame = stat.traceback[0]
+        lines.append(f"  {stat.size_diff / 1024:9.1f} KiB {stat.count_diff:>8} blocks  "
+                     f"{Path(frame.filename).name}:{frame.lineno}")
+    
+    return result + [TextContent(type="text", text="\n".join(lines))]
+
+
+def execute_tool(name: str, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+    """Execute a tool call synchronously"""
+    if not server_configs:
         return [TextContent(
             type="text",
             text="Error: No Rundeck clients initialized. Please configure RUNDECK_URL and RUNDECK_API_TOKEN environment variables."
         )]
     
+    # Tools take an optional server name; None selects the default server
+    server_name: Optional[str]
     try:
         if name == "list_servers":
             servers = list_rundeck_servers()
@@ -982,10 +5756,11 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             text_lines.append("=" * 40)
             
             for i, server_name in enumerate(servers, 1):
-                client = rundeck_clients[server_name]
+                config = server_configs[server_name]
                 text_lines.append(f"{i}. {server_name}")
-                text_lines.append(f"   URL: {client.base_url}")
-                text_lines.append(f"   API Version: {client.api_version}")
+                text_lines.append(f"   URL: {config['url']}")
+                text_lines.append(f"   API Version: {config['api_version']}")
+                text_lines.append(f"   Client: {'active' if server_name in rundeck_clients else 'not connected'}")
                 text_lines.append("")
             
             return [TextContent(
@@ -999,7 +5774,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             projects = client.get_projects()
             return [TextContent(
                 type="text",
-                text=json.dumps(projects, indent=2)
+                text=to_json_text(projects)
             )]
         
         elif name == "get_jobs":
@@ -1085,7 +5860,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             job_id = arguments["job_id"]
             server_name = arguments.get("server")
             client = get_rundeck_client(server_name)
-            job_def = client.get_job_definition(job_id)
+            job_def = client.get_job_definition(job_id, arguments.get("project"))
             
             # Extract key information including options
             formatted_def = {
@@ -1106,22 +5881,23 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             
             return [TextContent(
                 type="text",
-                text=json.dumps(formatted_def, indent=2)
+                text=to_json_text(formatted_def)
             )]
         
         elif name == "run_job":
             job_id = arguments["job_id"]
             options = arguments.get("options", {})
             node_filter = arguments.get("node_filter")
+            priority = arguments.get("priority", 0)
+            max_concurrent_runs = arguments.get("max_concurrent_runs")
+            allow_duplicate = arguments.get("allow_duplicate", False)
             server_name = arguments.get("server")
             
             client = get_rundeck_client(server_name)
-            execution = client.run_job(job_id, options, node_filter)
+            execution = client.run_job(job_id, options, node_filter, priority, max_concurrent_runs,
+                                       allow_duplicate, progress=current_progress.get())
             
-            return [TextContent(
-                type="text",
-                text=json.dumps(execution, indent=2)
-            )]
+            return launch_result_content(execution)
         
         elif name == "get_execution_status":
             execution_id = arguments["execution_id"]
@@ -1147,21 +5923,28 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
                 "successfulNodes": status.get("successfulNodes", []),
                 "failedNodes": status.get("failedNodes", [])
             }
+            if status.get("status") == "running":
+                # Loading duration history costs a paged scan, so it is only done on request
+                formatted_status["forecast"] = client.forecast_execution(
+                    status, load_history=arguments.get("forecast", False))
             
             return [TextContent(
                 type="text",
-                text=json.dumps(formatted_status, indent=2)
+                text=to_json_text(formatted_status)
             )]
         
         elif name == "get_execution_output":
             execution_id = arguments["execution_id"]
             server_name = arguments.get("server")
             client = get_rundeck_client(server_name)
-            output = client.get_execution_output(execution_id)
+            output = client.get_execution_output(
+                execution_id, max(int(arguments.get("offset", 0)), 0),
+                max(int(arguments.get("max_entries", OUTPUT_MAX_ENTRIES)), 1)
+            )
             
             return [TextContent(
                 type="text",
-                text=json.dumps(output, indent=2)
+                text=to_json_text(output)
             )]
         
         elif name == "get_executions":
@@ -1233,7 +6016,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
                 # Return full details
                 return [TextContent(
                     type="text",
-                    text=json.dumps(result, indent=2)
+                    text=to_json_text(result)
                 )]
         
         elif name == "get_all_executions":
@@ -1244,18 +6027,24 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             job_id = arguments.get("job_id")
             recent_filter = arguments.get("recent_filter")
             summary_only = arguments.get("summary_only", True)
+            refresh = arguments.get("refresh", False)
             server_name = arguments.get("server")
             
             client = get_rundeck_client(server_name)
             executions = client.get_all_executions(
-                project, max_total, status, user, job_id, recent_filter
+                project, max_total, status, user, job_id, recent_filter,
+                progress=current_progress.get(), refresh=refresh
             )
+            fetched_at = client.executions_fetched_at() or time.time()
+            data_age = max(round(time.time() - fetched_at), 0)
+            fetched = datetime.fromtimestamp(fetched_at).astimezone().isoformat(timespec='seconds')
             
             if summary_only:
                 # Format as human-readable text
                 text_lines = []
                 text_lines.append(f"📊 All Executions for Project: {project}")
                 text_lines.append(f"📈 Total Retrieved: {len(executions)} executions (max requested: {max_total})")
+                text_lines.append(f"🕒 Fetched: {fetched} ({data_age}s ago)")
                 text_lines.append("")
                 
                 if not executions:
@@ -1314,11 +6103,16 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
                     text="\n".join(text_lines)
                 )]
             else:
-                # Return full details
-                return [TextContent(
+                # Return full details, noting when they were reused from an earlier fetch
+                content = [TextContent(
                     type="text",
-                    text=json.dumps(executions, indent=2)
+                    text=to_json_text(executions)
                 )]
+                if data_age > 0:
+                    content.insert(0, TextContent(type="text", text=(
+                        f"Reused executions fetched {data_age}s ago ({fetched}); "
+                        f"pass refresh=true to fetch them again.")))
+                return content
         
         elif name == "get_execution_metrics":
             project = arguments["project"]
@@ -1326,11 +6120,11 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             server_name = arguments.get("server")
             
             client = get_rundeck_client(server_name)
-            metrics = client.get_execution_metrics(project, days)
+            metrics = client.get_execution_metrics(project, days, progress=current_progress.get())
             
             return [TextContent(
                 type="text",
-                text=json.dumps(metrics, indent=2)
+                text=to_json_text(metrics)
             )]
         
         elif name == "get_system_info":
@@ -1340,7 +6134,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             
             return [TextContent(
                 type="text",
-                text=json.dumps(system_info, indent=2)
+                text=to_json_text(system_info)
             )]
         
         elif name == "get_project_stats":
@@ -1352,7 +6146,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             
             return [TextContent(
                 type="text",
-                text=json.dumps(stats, indent=2)
+                text=to_json_text(stats)
             )]
         
         elif name == "calculate_job_roi":
@@ -1367,7 +6161,27 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             
             return [TextContent(
                 type="text",
-                text=json.dumps(roi_data, indent=2)
+                text=to_json_text(roi_data)
+            )]
+        
+        elif name == "calculate_project_roi":
+            project = arguments["project"]
+            cost_per_hour = arguments.get("cost_per_hour", 50.0)
+            days = arguments.get("days", 30)
+            manual_hours_per_run = arguments.get("manual_hours_per_run", 1.0)
+            manual_hours_overrides = arguments.get("manual_hours_overrides")
+            max_executions = arguments.get("max_executions", 20000)
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            roi_data = client.calculate_project_roi(
+                project, cost_per_hour, days, manual_hours_per_run, manual_hours_overrides,
+                max_executions, progress=current_progress.get()
+            )
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(roi_data)
             )]
         
         elif name == "get_bulk_execution_status":
@@ -1379,7 +6193,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             
             return [TextContent(
                 type="text",
-                text=json.dumps(statuses, indent=2)
+                text=to_json_text(statuses)
             )]
         
         elif name == "run_job_with_monitoring":
@@ -1388,16 +6202,211 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             node_filter = arguments.get("node_filter")
             wait_for_completion = arguments.get("wait_for_completion", False)
             timeout_minutes = arguments.get("timeout_minutes", 30)
+            priority = arguments.get("priority", 0)
+            max_concurrent_runs = arguments.get("max_concurrent_runs")
+            allow_duplicate = arguments.get("allow_duplicate", False)
             server_name = arguments.get("server")
             
             client = get_rundeck_client(server_name)
             execution = client.run_job_with_monitoring(
-                job_id, options, node_filter, wait_for_completion, timeout_minutes
+                job_id, options, node_filter, wait_for_completion, timeout_minutes, priority,
+                max_concurrent_runs, allow_duplicate, progress=current_progress.get()
+            )
+            
+            return launch_result_content(execution)
+        
+        elif name == "preview_node_filter":
+            project = arguments["project"]
+            node_filter = arguments["node_filter"]
+            max_nodes = arguments.get("max_nodes", 50)
+            refresh = arguments.get("refresh", False)
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            preview = client.preview_node_filter(project, node_filter, max_nodes, refresh)
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(preview)
+            )]
+        
+        elif name == "search_execution_logs":
+            query = arguments["query"]
+            limit = arguments.get("limit", 50)
+            server_name = arguments.get("server")
+            
+            if log_archive is None:
+                return [TextContent(
+                    type="text",
+                    text="Error: Execution log archive is disabled. Set RUNDECK_LOG_ARCHIVE_DIR to archive fetched outputs for searching."
+                )]
+            
+            client = get_rundeck_client(server_name)
+            results = log_archive.search(client.base_url, query, limit)
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(results)
+            )]
+        
+        elif name == "cluster_failures":
+            project = arguments["project"]
+            days = arguments.get("days", 1)
+            max_executions = arguments.get("max_executions", 300)
+            similarity = arguments.get("similarity", 0.6)
+            max_clusters = arguments.get("max_clusters", 20)
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            clusters = client.cluster_failures(
+                project, days, max_executions, similarity, max_clusters,
+                progress=current_progress.get()
+            )
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(clusters)
+            )]
+        
+        elif name == "forecast_running_executions":
+            project = arguments["project"]
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            forecasts = client.forecast_running_executions(project)
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(forecasts)
+            )]
+        
+        elif name == "get_execution_state_changes":
+            execution_id = arguments["execution_id"]
+            cursor = arguments.get("cursor")
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            changes = client.get_execution_state_changes(execution_id, cursor)
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(changes)
+            )]
+        
+        elif name == "get_concurrency_profile":
+            project = arguments.get("project")
+            days = arguments.get("days", 7)
+            max_executions = arguments.get("max_executions", 20000)
+            top_jobs = arguments.get("top_jobs", 10)
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            profile = client.get_concurrency_profile(
+                project, days, max_executions, top_jobs, progress=current_progress.get()
+            )
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(profile)
+            )]
+        
+        elif name == "forecast_schedule_load":
+            project = arguments.get("project")
+            horizon_hours = arguments.get("horizon_hours", 24)
+            bucket_minutes = arguments.get("bucket_minutes", 15)
+            history_days = arguments.get("history_days", FORECAST_HISTORY_DAYS)
+            default_duration_seconds = arguments.get("default_duration_seconds", 60)
+            timezone = arguments.get("timezone")
+            top = arguments.get("top", 10)
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            forecast = client.forecast_schedule_load(
+                project, horizon_hours, bucket_minutes, history_days, default_duration_seconds,
+                timezone, top, progress=current_progress.get()
+            )
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(forecast)
+            )]
+        
+        elif name == "get_job_graph":
+            project = arguments.get("project")
+            job_id = arguments.get("job_id")
+            max_depth = arguments.get("max_depth")
+            refresh = arguments.get("refresh", False)
+            limit = arguments.get("limit", 20)
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            graph = client.get_job_graph(project, job_id, max_depth, refresh, limit,
+                                         progress=current_progress.get())
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(graph)
+            )]
+        
+        elif name == "detect_anomalies":
+            project = arguments.get("project")
+            days = arguments.get("days", 30)
+            recent_hours = arguments.get("recent_hours", 24)
+            threshold = arguments.get("threshold", 3.5)
+            min_baseline = arguments.get("min_baseline", 10)
+            limit = arguments.get("limit", 20)
+            max_executions = arguments.get("max_executions", 20000)
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            anomalies = client.detect_anomalies(
+                project, days, recent_hours, threshold, min_baseline, limit, max_executions,
+                progress=current_progress.get()
+            )
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(anomalies)
+            )]
+        
+        elif name == "get_node_reliability":
+            project = arguments.get("project")
+            days = arguments.get("days", 7)
+            min_executions = arguments.get("min_executions", 3)
+            limit = arguments.get("limit", 20)
+            max_executions = arguments.get("max_executions", 20000)
+            server_name = arguments.get("server")
+            
+            client = get_rundeck_client(server_name)
+            reliability = client.get_node_reliability(
+                project, days, min_executions, limit, max_executions, progress=current_progress.get()
             )
             
             return [TextContent(
                 type="text",
-                text=json.dumps(execution, indent=2)
+                text=to_json_text(reliability)
+            )]
+        
+        elif name == "get_mcp_server_metrics":
+            metrics = {
+                "lanes": {lane_name: lane.stats() for lane_name, lane in tool_lanes.items()},
+                "shared_cache": shared_cache.stats() if shared_cache is not None else None,
+                "webhook": webhook_receiver.stats() if webhook_receiver is not None else None,
+                "prefetch": prefetcher.stats() if prefetcher is not None else None,
+                "clients": {
+                    server_name: {
+                        "rate_limit": client.rate_limiter.stats(),
+                        "launch_queue": client.launch_queue.stats(),
+                        "paging": client.page_sizer.stats(),
+                        "fetch_planner": client.fetch_planner.stats()
+                    }
+                    for server_name, client in list(rundeck_clients.items())
+                }
+            }
+            
+            return [TextContent(
+                type="text",
+                text=to_json_text(metrics)
             )]
         
         else:
@@ -1406,6 +6415,13 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
                 text=f"Unknown tool: {name}"
             )]
     
+    except OperationCancelled as e:
+        logger.info(f"Tool {name} stopped: {e}")
+        return [TextContent(
+            type="text",
+            text=f"Cancelled: {str(e)}"
+        )]
+    
     except Exception as e:
         logger.error(f"Error executing tool {name}: {e}")
         return [TextContent(
@@ -1426,30 +6442,99 @@ async def handle_get_prompt(name: str, arguments: Optional[Dict[str, Any]] = Non
     return {"messages": []}
 
 
+def create_initialization_options() -> InitializationOptions:
+    """Initialization options advertised to MCP clients"""
+    return InitializationOptions(
+        server_name="rundeck-mcp-server",
+        server_version="1.0.0",
+        capabilities=ServerCapabilities(
+            tools=ToolsCapability(),
+            prompts=PromptsCapability()
+        ),
+    )
+
+
+def create_http_app(transport: str = "http") -> Any:
+    """Build an ASGI app serving MCP over streamable HTTP (/mcp) or SSE (/sse).
+    
+    Every session is handled by this process, so all of them share the
+    Rundeck clients, their connection pools and caches.
+    """
+    from contextlib import asynccontextmanager
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Mount, Route
+    
+    if transport == "sse":
+        from mcp.server.sse import SseServerTransport
+        
+        sse = SseServerTransport("/messages/")
+        
+        async def handle_sse(request: Any) -> Response:
+            async with sse.connect_sse(request.scope, request.receive, request._send) as streams:
+                await server.run(streams[0], streams[1], create_initialization_options())
+            return Response()
+        
+        return Starlette(routes=[
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message),
+        ])
+    
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    
+    session_manager = StreamableHTTPSessionManager(app=server)
+    
+    async def handle_streamable_http(scope: Any, receive: Any, send: Any) -> None:
+        await session_manager.handle_request(scope, receive, send)
+    
+    @asynccontextmanager
+    async def lifespan(app: Any) -> Any:
+        async with session_manager.run():
+            yield
+    
+    return Starlette(routes=[Mount("/mcp", app=handle_streamable_http)], lifespan=lifespan)
+
+
+async def run_http_server(transport: str) -> None:
+    """Run a long-lived HTTP/SSE server for many concurrent MCP sessions"""
+    import uvicorn
+    
+    host = os.getenv('RUNDECK_MCP_HOST', '127.0.0.1')
+    port = int(os.getenv('RUNDECK_MCP_PORT', '8000'))
+    endpoint = "/sse" if transport == "sse" else "/mcp"
+    logger.info(f"Serving MCP over {transport} at http://{host}:{port}{endpoint}")
+    
+    config = uvicorn.Config(create_http_app(transport), host=host, port=port, log_level="info")
+    await uvicorn.Server(config).serve()
+
+
 async def main():
     """Main entry point"""
     try:
         load_tool_prompts()
+        validate_rate_limits(MAX_REQUESTS_PER_SECOND, BULK_RATE_SHARE)
         initialize_rundeck_clients()
+        initialize_log_archive()
+        initialize_shared_cache()
+        initialize_webhook_receiver()
+        initialize_prefetcher()
     except ValueError as e:
         logger.error(f"Failed to initialize Rundeck client: {e}")
         return
     
+    transport = os.getenv('RUNDECK_MCP_TRANSPORT', 'stdio').lower()
+    if transport in ('http', 'streamable-http', 'sse'):
+        await run_http_server('sse' if transport == 'sse' else 'http')
+        return
+    
     # Run the server
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
             write_stream,
-            InitializationOptions(
-                server_name="rundeck-mcp-server",
-                server_version="1.0.0",
-                capabilities=ServerCapabilities(
-                    tools=ToolsCapability(),
-                    prompts=PromptsCapability()
-                ),
-            ),
+            create_initialization_options(),
         )
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
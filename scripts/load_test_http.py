@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Load test for the streamable HTTP transport.
+
+Starts rundeck_mcp_server.py with RUNDECK_MCP_TRANSPORT=http, then:
+- opens and closes many MCP sessions at a fixed concurrency to measure
+  sessions per second and per-session latency
+- holds a batch of sessions open at once to measure server memory per session
+
+Only list_tools and list_servers are called, so no live Rundeck is needed.
+
+Usage:
+    python scripts/load_test_http.py --sessions 200 --concurrency 20 --held 100
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+SERVER_SCRIPT = Path(__file__).resolve().parent.parent / "rundeck_mcp_server.py"
+
+
+def rss_kb(pid: int) -> int:
+    """Resident set size of a process in KiB (Linux only)"""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def wait_for_port(host: str, port: int, timeout: float = 15.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server did not start listening on {host}:{port}")
+
+
+async def run_session(url: str) -> float:
+    """Open a session, list tools, call list_servers and close it"""
+    started = time.perf_counter()
+    async with streamablehttp_client(url) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            await session.list_tools()
+            await session.call_tool("list_servers", {})
+    return time.perf_counter() - started
+
+
+async def measure_throughput(url: str, sessions: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def worker() -> None:
+        async with semaphore:
+            latencies.append(await run_session(url))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"Sessions:          {sessions} at concurrency {concurrency}")
+    print(f"Sessions/second:   {sessions / elapsed:.1f}")
+    print(f"Latency p50:       {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"Latency p95:       {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"Latency max:       {latencies[-1] * 1000:.1f} ms")
+
+
+async def measure_memory(url: str, held: int, pid: int) -> None:
+    before = rss_kb(pid)
+    async with AsyncExitStack() as stack:
+        for _ in range(held):
+            read_stream, write_stream, _ = await stack.enter_async_context(streamablehttp_client(url))
+            session = await stack.enter_async_context(ClientSession(read_stream, write_stream))
+            await session.initialize()
+        after = rss_kb(pid)
+
+    print(f"Held sessions:     {held}")
+    print(f"Server RSS:        {before / 1024:.1f} MiB -> {after / 1024:.1f} MiB")
+    print(f"Memory/session:    {(after - before) / held:.1f} KiB")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--held", type=int, default=100)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("RUNDECK_URL", "http://127.0.0.1:4440")
+    env.setdefault("RUNDECK_API_TOKEN", "load-test")
+    env.update({
+        "RUNDECK_MCP_TRANSPORT": "http",
+        "RUNDECK_MCP_HOST": "127.0.0.1",
+        "RUNDECK_MCP_PORT": str(args.port),
+    })
+
+    proc = subprocess.Popen(
+        [sys.executable, str(SERVER_SCRIPT)], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port("127.0.0.1", args.port)
+        url = f"http://127.0.0.1:{args.port}/mcp/"
+        await measure_throughput(url, args.sessions, args.concurrency)
+        print()
+        await measure_memory(url, args.held, proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
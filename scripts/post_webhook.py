@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Stand-in for Rundeck that posts webhook notifications to the server's listener.
+
+Start the server with the listener enabled:
+    RUNDECK_WEBHOOK_PORT=8787 python rundeck_mcp_server.py
+
+Then, while run_job_with_monitoring waits on an execution, push its completion:
+    python scripts/post_webhook.py --execution-id 1234 --trigger success
+
+Both Rundeck notification formats are supported (--format json or xml).
+With several Rundeck servers configured, name the sender with --server or
+give its base URL with --server-url so the execution link identifies it.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timezone
+
+import requests
+
+STATUS_BY_TRIGGER = {"start": "running", "success": "succeeded", "failure": "failed"}
+
+
+def build_payload(execution_id: str, trigger: str, status: str, project: str, job_id: str, fmt: str,
+                  server_url: str = None):
+    now = datetime.now(timezone.utc)
+    href = f"{server_url.rstrip('/')}/project/{project}/execution/show/{execution_id}" if server_url else None
+    if fmt == "xml":
+        href_attribute = f' href="{href}"' if href else ''
+        body = (
+            f'<notification trigger="{trigger}" status="{status}" executionId="{execution_id}">'
+            f'<executions count="1"><execution id="{execution_id}" status="{status}" project="{project}"'
+            f'{href_attribute}>'
+            f'<job id="{job_id}"/></execution></executions></notification>'
+        )
+        return body.encode("utf-8"), "application/xml"
+
+    execution = {
+        "id": int(execution_id) if execution_id.isdigit() else execution_id,
+        "status": status,
+        "project": project,
+        "job": {"id": job_id, "project": project},
+        "date-started": {"unixtime": int(now.timestamp() * 1000), "date": now.strftime("%Y-%m-%dT%H:%M:%SZ")},
+    }
+    if href:
+        execution["href"] = href
+    if status != "running":
+        execution["date-ended"] = dict(execution["date-started"])
+    return json.dumps({"trigger": trigger, "execution": execution}).encode("utf-8"), "application/json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8787/rundeck/notifications")
+    parser.add_argument("--execution-id", required=True)
+    parser.add_argument("--trigger", choices=sorted(STATUS_BY_TRIGGER), default="success")
+    parser.add_argument("--status", help="Execution status (defaults from the trigger)")
+    parser.add_argument("--project", default="demo")
+    parser.add_argument("--job-id", default="job")
+    parser.add_argument("--format", choices=["json", "xml"], default="json")
+    parser.add_argument("--token", help="Shared secret matching RUNDECK_WEBHOOK_SECRET")
+    parser.add_argument("--server", help="Configured server name, sent as the ?server= parameter")
+    parser.add_argument("--server-url", help="Rundeck base URL used for the execution link")
+    args = parser.parse_args()
+
+    body, content_type = build_payload(
+        args.execution_id, args.trigger, args.status or STATUS_BY_TRIGGER[args.trigger],
+        args.project, args.job_id, args.format, args.server_url
+    )
+    params = {key: value for key, value in (("token", args.token), ("server", args.server)) if value}
+    response = requests.post(
+        args.url, data=body, params=params or None,
+        headers={"Content-Type": content_type}, timeout=10
+    )
+    print(f"{response.status_code} {response.reason}")
+    sys.exit(0 if response.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
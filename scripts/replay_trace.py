@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Replay a captured tool call trace against a recorded Rundeck cassette.
+
+Capture both while using the server normally:
+    RUNDECK_TOOL_TRACE=trace.jsonl RUNDECK_HTTP_RECORD=cassette.jsonl.gz python rundeck_mcp_server.py
+
+Then benchmark offline, without a live Rundeck:
+    python scripts/replay_trace.py --trace trace.jsonl --cassette cassette.jsonl.gz \\
+        --concurrency 8 --speedup 10 --repeat 5
+
+Calls are re-issued through handle_call_tool at their recorded offsets
+divided by --speedup (0 issues them as fast as possible), with at most
+--concurrency in flight. Reports throughput and tail latency per tool.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round((len(sorted_values) - 1) * pct / 100.0)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def replay(server_module, calls, concurrency, speedup):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    started = time.monotonic()
+
+    async def issue(call):
+        if speedup > 0:
+            delay = call["offset_seconds"] / speedup - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        async with semaphore:
+            call_started = time.perf_counter()
+            result = await server_module.handle_call_tool(call["name"], call["arguments"])
+            latencies[call["name"]].append(time.perf_counter() - call_started)
+            if result and result[0].text.startswith("Error"):
+                errors[call["name"]] += 1
+
+    await asyncio.gather(*(issue(call) for call in calls))
+    return time.monotonic() - started, latencies, errors
+
+
+def report(elapsed, latencies, errors):
+    all_latencies = sorted(v for values in latencies.values() for v in values)
+    print(f"Calls:        {len(all_latencies)} in {elapsed:.2f}s")
+    print(f"Throughput:   {len(all_latencies) / elapsed:.1f} calls/s")
+    print(f"Latency (ms): p50 {percentile(all_latencies, 50) * 1000:.1f}  "
+          f"p95 {percentile(all_latencies, 95) * 1000:.1f}  "
+          f"p99 {percentile(all_latencies, 99) * 1000:.1f}  "
+          f"max {all_latencies[-1] * 1000:.1f}")
+    print()
+    print(f"{'Tool':<32}{'Calls':>7}{'Errors':>8}{'Mean ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, values in sorted(latencies.items(), key=lambda item: -sum(item[1])):
+        values.sort()
+        print(f"{name:<32}{len(values):>7}{errors[name]:>8}"
+              f"{statistics.mean(values) * 1000:>10.1f}"
+              f"{percentile(values, 95) * 1000:>10.1f}"
+              f"{percentile(values, 99) * 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trace", required=True, help="Tool call trace captured with RUNDECK_TOOL_TRACE")
+    parser.add_argument("--cassette", required=True, help="HTTP cassette captured with RUNDECK_HTTP_RECORD")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--speedup", type=float, default=0.0,
+                        help="Divide recorded call offsets by this factor (0 = no pacing)")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Scale recorded Rundeck response latency (0 = instant)")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the trace this many times")
+    args = parser.parse_args()
+
+    # Configure the server before import so every client replays the cassette
+    os.environ["RUNDECK_HTTP_REPLAY"] = args.cassette
+    os.environ["RUNDECK_REPLAY_LATENCY_SCALE"] = str(args.latency_scale)
+    os.environ.pop("RUNDECK_HTTP_RECORD", None)
+    os.environ.pop("RUNDECK_TOOL_TRACE", None)
+    os.environ.setdefault("RUNDECK_URL", "http://rundeck.replay")
+    os.environ.setdefault("RUNDECK_API_TOKEN", "replay")
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    import rundeck_mcp_server
+
+    rundeck_mcp_server.load_tool_prompts()
+    rundeck_mcp_server.initialize_rundeck_clients()
+
+    trace = rundeck_mcp_server.read_json_lines(args.trace)
+    duration = max((call["offset_seconds"] for call in trace), default=0.0)
+    calls = [
+        {**call, "offset_seconds": call["offset_seconds"] + i * (duration + 1)}
+        for i in range(args.repeat) for call in trace
+    ]
+
+    elapsed, latencies, errors = asyncio.run(
+        replay(rundeck_mcp_server, calls, args.concurrency, args.speedup)
+    )
+    report(elapsed, latencies, errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -42,6 +42,12 @@ setup(
     python_requires=">=3.8",
     install_requires=read_requirements(),
     extras_require={
+        "yaml": [
+            "PyYAML>=6.0",
+        ],
+        "fast-json": [
+            "orjson>=3.9",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
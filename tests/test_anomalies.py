@@ -0,0 +1,77 @@
+"""Robust duration outliers and duration/failure-rate shifts"""
+
+import rundeck_mcp_server as rms
+
+NOW = 1_800_000_000
+RECENT = NOW - 3600
+
+
+def run(job, started, duration, status='succeeded', execution_id=None):
+    return {'id': execution_id, 'status': status, 'project': 'p', 'job': {'id': job, 'name': job.upper()},
+            'date-started': {'unixtime': started * 1000},
+            'date-ended': {'unixtime': (started + duration) * 1000}}
+
+
+def baseline(job, durations, failures=0):
+    runs = [run(job, NOW - 86400 + i * 600, d) for i, d in enumerate(durations)]
+    runs += [run(job, NOW - 40000 + i * 600, 5, 'failed') for i in range(failures)]
+    return runs
+
+
+JITTERY = [96, 98, 99, 100, 100, 101, 102, 104, 97, 103, 100, 99]
+
+
+def test_outliers_in_both_directions():
+    executions = baseline('a', JITTERY) + [run('a', RECENT + 10, 300, execution_id=1),
+                                           run('a', RECENT + 20, 101, execution_id=2),
+                                           run('a', RECENT + 30, 20, 'failed', execution_id=3)]
+    result = rms.execution_anomalies(executions, RECENT)
+    assert [(o['execution_id'], o['direction']) for o in result['duration_outliers']] == \
+        [(1, 'slower'), (3, 'faster')]
+    assert result['duration_outliers'][0]['baseline_median_seconds'] == 100.0
+    assert result['jobs_scored'] == 1 and result['executions_analyzed'] == 15
+
+
+def test_near_constant_jobs_use_a_minimum_spread():
+    executions = baseline('c', [10] * 12) + [run('c', RECENT + 1, 11, execution_id=1),
+                                             run('c', RECENT + 2, 20, execution_id=2)]
+    result = rms.execution_anomalies(executions, RECENT)
+    assert [o['execution_id'] for o in result['duration_outliers']] == [2]
+    assert result['duration_outliers'][0]['robust_z'] == 10.0
+
+
+def test_sustained_slowdown_is_a_duration_shift():
+    executions = baseline('a', JITTERY) + [run('a', RECENT + i * 60, d) for i, d in enumerate((125, 130, 128))]
+    [shift] = rms.execution_anomalies(executions, RECENT)['duration_shifts']
+    assert (shift['baseline_median_seconds'], shift['recent_median_seconds'], shift['change_percent']) == \
+        (100.0, 128.0, 28.0)
+    # A shift smaller than 20% is not reported however significant
+    executions = baseline('a', JITTERY) + [run('a', RECENT + i * 60, 115) for i in range(3)]
+    assert rms.execution_anomalies(executions, RECENT)['duration_shifts'] == []
+
+
+def test_failure_rate_increase_is_reported_but_not_a_decrease():
+    rising = baseline('f', [50] * 19, failures=1) + [run('f', RECENT + i * 60, 50, 'failed') for i in range(4)] + \
+        [run('f', RECENT + 600, 50)]
+    [shift] = rms.execution_anomalies(rising, RECENT)['failure_rate_shifts']
+    assert (shift['baseline_failure_rate_percent'], shift['recent_failure_rate_percent']) == (5.0, 80.0)
+    assert shift['recent_failures'] == 4 and shift['recent_runs'] == 5
+
+    falling = baseline('f', [50] * 10, failures=10) + [run('f', RECENT + i * 60, 50) for i in range(5)]
+    assert rms.execution_anomalies(falling, RECENT)['failure_rate_shifts'] == []
+    steady = baseline('f', [50] * 20) + [run('f', RECENT + i * 60, 50) for i in range(5)]
+    assert rms.execution_anomalies(steady, RECENT)['failure_rate_shifts'] == []
+
+
+def test_thin_history_and_unfinished_runs_are_not_scored():
+    executions = baseline('new', [10] * 5) + [run('new', RECENT + 1, 500)]
+    executions.append({'status': 'running', 'job': {'id': 'a'}, 'date-started': {'unixtime': NOW * 1000}})
+    executions.append({'status': 'succeeded', 'job': {'id': 'a'}})
+    executions.append(run('', RECENT + 1, 5))
+    result = rms.execution_anomalies(executions, RECENT)
+    assert result['jobs_seen'] == 1 and result['jobs_scored'] == 0
+    assert result['executions_analyzed'] == 6 and result['duration_outliers'] == []
+    # Failures count toward the baseline size, but durations need min_baseline successes
+    mostly_failed = baseline('m', [10] * 4, failures=8) + [run('m', RECENT + 1, 500)]
+    scored = rms.execution_anomalies(mostly_failed, RECENT)
+    assert scored['jobs_scored'] == 1 and scored['duration_outliers'] == []
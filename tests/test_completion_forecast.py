@@ -0,0 +1,95 @@
+"""Completion forecasts for running executions"""
+
+import json
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+NOW = 1_800_000_000.0
+
+
+def run(duration, started=NOW - 86400, argstring=None, nodes=1):
+    return {'date-started': {'unixtime': int(started * 1000)},
+            'date-ended': {'unixtime': int((started + duration) * 1000)},
+            'argstring': argstring, 'successfulNodes': [f'n{i}' for i in range(nodes)]}
+
+
+def running(elapsed, argstring=None, nodes=0):
+    return {'id': 5, 'status': 'running', 'project': 'p', 'job': {'id': 'job'},
+            'date-started': {'unixtime': int((NOW - elapsed) * 1000)},
+            'argstring': argstring, 'successfulNodes': [f'n{i}' for i in range(nodes)]}
+
+
+def test_too_little_history_is_unavailable():
+    forecast = rms.forecast_completion(running(10), [run(60), run(70)], NOW)
+    assert forecast['available'] is False
+
+
+def test_remaining_time_conditions_on_elapsed_time():
+    history = [run(d) for d in (60, 60, 60, 600, 600, 600, 600)]
+    early = rms.forecast_completion(running(30), history, NOW)
+    assert early['expected_remaining_seconds'] == 570 and not early['overdue']
+    # Past the short runs, only the long runs are still plausible
+    late = rms.forecast_completion(running(120), history, NOW)
+    assert late['expected_remaining_seconds'] == 480
+
+
+def test_overdue_past_p95():
+    forecast = rms.forecast_completion(running(1000), [run(d) for d in (100, 110, 120, 130, 140)], NOW)
+    assert forecast['overdue'] is True
+    assert forecast['expected_remaining_seconds'] == 0
+    assert forecast['overrun_ratio'] > 7
+
+
+def test_history_narrows_to_same_options_then_node_count():
+    history = [run(100, argstring='-env prod', nodes=3) for _ in range(5)] + \
+        [run(10, argstring='-env dev', nodes=1) for _ in range(5)]
+    assert rms.forecast_completion(running(1, '-env prod'), history, NOW)['basis'] == 'same_options'
+    by_nodes = rms.forecast_completion(running(1, '-env qa', nodes=3), history, NOW)
+    assert by_nodes['basis'] == 'same_node_count' and by_nodes['p50_duration_seconds'] == 100
+    assert rms.forecast_completion(running(1, '-env qa', nodes=2), history, NOW)['basis'] == 'job'
+
+
+@pytest.fixture
+def status_client(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    scans = []
+    monkeypatch.setattr(client, 'get_execution_status', lambda execution_id: running(30))
+
+    def get_all_executions(project, **kwargs):
+        scans.append(kwargs)
+        return [run(d, started=rms.time.time() - 3600) for d in (60, 60, 60)]
+    monkeypatch.setattr(client, 'get_all_executions', get_all_executions)
+    monkeypatch.setattr(rms, 'get_rundeck_client', lambda server_name=None: client)
+    monkeypatch.setattr(rms, 'server_configs', {'default': {'url': client.base_url, 'token': 't'}})
+    return client, scans
+
+
+def status(arguments):
+    return json.loads(rms.execute_tool('get_execution_status', arguments)[0].text)
+
+
+def test_status_check_does_not_scan_history_by_default(status_client):
+    client, scans = status_client
+    result = status({'execution_id': '5'})
+    assert scans == []
+    assert result['forecast']['available'] is False
+
+
+def test_status_check_forecasts_on_request(status_client):
+    client, scans = status_client
+    result = status({'execution_id': '5', 'forecast': True})
+    assert len(scans) == 1
+    assert result['forecast']['available'] is True
+
+
+def test_status_check_uses_cached_history(status_client):
+    client, scans = status_client
+    ended = rms.time.time() - 3600
+    client.fetch_planner.record('p', None, None, None, '30d', 5000, [
+        {**run(60, started=ended - 60), 'status': 'succeeded', 'job': {'id': 'job'}} for _ in range(3)])
+    result = status({'execution_id': '5'})
+    assert scans == []
+    assert result['forecast']['available'] is True
+    assert result['forecast']['p50_duration_seconds'] == 60
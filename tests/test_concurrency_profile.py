@@ -0,0 +1,109 @@
+"""Execution concurrency profile from a start/end event sweep"""
+
+import math
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+START = 1_800_000_000.0
+
+
+def execution(start, end=None, job='a'):
+    ex = {'job': {'id': job, 'name': job.upper()}, 'project': 'p',
+          'date-started': {'unixtime': int((START + start) * 1000)}}
+    if end is not None:
+        ex['date-ended'] = {'unixtime': int((START + end) * 1000)}
+    return ex
+
+
+def profile(executions, now=100, **kwargs):
+    return rms.concurrency_profile(executions, START, START + now, **kwargs)
+
+
+def test_no_executions():
+    assert profile([]) == {"executions": 0, "peak_concurrency": 0}
+
+
+def test_back_to_back_runs_do_not_overlap():
+    result = profile([execution(0, 50), execution(50, 100)])
+    assert result['peak_concurrency'] == 1
+    assert result['idle_percent'] == 0
+    assert [j['total_overlaps'] for j in result['most_overlapping_jobs']] == [0]
+
+
+def test_running_executions_count_until_now_and_intervals_are_clipped():
+    result = profile([execution(-500, 20), execution(10), execution(200, 300)])
+    # The run started before the window counts from window_start; the one after now is dropped
+    assert result['executions'] == 2
+    assert result['peak_concurrency'] == 2
+    assert result['average_concurrency'] == 1.1
+    assert result['idle_percent'] == 0
+
+
+def test_jobs_ranked_by_overlaps():
+    result = profile([execution(0, 60, 'a'), execution(10, 20, 'b'), execution(30, 40, 'b'),
+                      execution(70, 80, 'c')], top_jobs=2)
+    ranked = result['most_overlapping_jobs']
+    assert [(j['job_id'], j['executions'], j['total_overlaps'], j['max_overlapping']) for j in ranked] == \
+        [('a', 1, 2, 2), ('b', 2, 2, 1)]
+    assert ranked[1]['avg_overlapping'] == 1.0 and ranked[1]['busy_seconds'] == 20.0
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_sweep_matches_second_by_second_count(seed):
+    rng = random.Random(seed)
+    window = 3 * 3600
+    spans = []
+    for _ in range(40):
+        start = rng.randrange(-600, window)
+        spans.append((start, start + rng.randrange(1, 1800) if rng.random() < 0.9 else None))
+    result = profile([execution(s, e, f'job{i % 4}') for i, (s, e) in enumerate(spans)], now=window)
+
+    levels = [0] * window
+    for start, end in spans:
+        for second in range(max(start, 0), min(window if end is None else end, window)):
+            levels[second] += 1
+    ordered = sorted(levels)
+    assert result['peak_concurrency'] == max(levels)
+    assert result['average_concurrency'] == round(sum(levels) / window, 2)
+    assert result['idle_percent'] == round(levels.count(0) / window * 100, 1)
+    for pct in (50, 90, 95, 99):
+        # Smallest level covering pct% of the seconds
+        assert result[f'p{pct}_concurrency'] == ordered[math.ceil(window * pct / 100) - 1]
+    assert max(max(hours) for hours in result['hourly_peak_heatmap'].values()) == max(levels)
+
+
+@pytest.fixture
+def local_zone(monkeypatch):
+    def use(zone):
+        monkeypatch.setenv('TZ', zone)
+        time.tzset()
+    yield use
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize('zone', ['Asia/Kolkata', 'Asia/Kathmandu', 'America/St_Johns'])
+def test_heatmap_buckets_follow_local_hours_off_utc_hours(local_zone, zone):
+    local_zone(zone)
+    # 10:00-10:30 local on a Monday sits entirely in the 10 o'clock cell
+    run = datetime(2026, 10, 19, 10, 0).timestamp()
+    window_start = datetime(2026, 10, 19, 8, 0).timestamp()
+    ex = {'job': {'id': 'a'}, 'date-started': {'unixtime': int(run * 1000)},
+          'date-ended': {'unixtime': int((run + 1800) * 1000)}}
+    result = rms.concurrency_profile([ex], window_start, window_start + 4 * 3600)
+    assert result['hourly_peak_heatmap']['Mon'][8:12] == [0, 0, 1, 0]
+    assert result['hourly_average_heatmap']['Mon'][8:12] == [0, 0, 0.5, 0]
+
+
+def test_local_hour_boundaries_across_fall_back(local_zone):
+    local_zone('America/New_York')
+    start = datetime(2026, 11, 1, 0, 30).timestamp()
+    boundaries = rms.local_hour_boundaries(start, start + 4 * 3600)
+    # 01:00 happens twice, so five one-hour buckets cover the four hours
+    assert [datetime.fromtimestamp(b).hour for b in boundaries] == [0, 1, 1, 2, 3, 4]
+    assert all(b - a == 3600 for a, b in zip(boundaries, boundaries[1:]))
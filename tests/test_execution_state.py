@@ -0,0 +1,72 @@
+"""Incremental per-node execution state polling"""
+
+import rundeck_mcp_server as rms
+
+
+def state(nodes, execution_state='RUNNING', targets=('web1', 'web2', 'web3'), completed=False):
+    return {
+        'executionState': execution_state, 'completed': completed, 'stepCount': 2,
+        'targetNodes': list(targets),
+        'nodes': {name: [{'stepctx': ctx, 'executionState': s} for ctx, s in steps.items()]
+                  for name, steps in nodes.items()}
+    }
+
+
+def test_flatten_includes_target_nodes_without_steps():
+    flat = rms.flatten_execution_state(state({'web1': {'1': 'RUNNING'}, 'web2': {'1': 'SUCCEEDED', '2/1': 'FAILED'}}))
+    assert flat == {'execution_state': 'RUNNING', 'completed': False, 'step_count': 2,
+                    'nodes': {'web1': {'1': 'RUNNING'}, 'web2': {'1': 'SUCCEEDED', '2/1': 'FAILED'}, 'web3': {}}}
+    assert rms.flatten_execution_state({}) == {'execution_state': None, 'completed': False,
+                                               'step_count': None, 'nodes': {}}
+
+
+def test_node_overall_state():
+    assert rms.node_overall_state({}) == 'WAITING'
+    assert rms.node_overall_state({'1': 'SUCCEEDED', '2': 'RUNNING'}) == 'RUNNING'
+    assert rms.node_overall_state({'1': 'SUCCEEDED', '2': 'FAILED', '3': 'RUNNING'}) == 'FAILED'
+    assert rms.node_overall_state({'1': 'SUCCEEDED', '2': 'NOT_STARTED'}) == 'SUCCEEDED'
+    assert rms.node_overall_state({'1': 'NOT_STARTED'}) == 'WAITING'
+
+
+def test_first_poll_is_full_then_only_changes():
+    tracker = rms.ExecutionStateTracker()
+    first = tracker.diff('9', state({'web1': {'1': 'RUNNING'}}))
+    assert first['full_state'] and first['execution_state_changed']
+    assert first['nodes_started'] == ['web1']
+    assert first['node_states'] == {'RUNNING': 1, 'WAITING': 2}
+    assert first['step_changes'] == [{'node': 'web1', 'step': '1', 'from': None, 'to': 'RUNNING'}]
+
+    second = tracker.diff('9', state({'web1': {'1': 'SUCCEEDED', '2': 'SUCCEEDED'},
+                                      'web2': {'1': 'RUNNING'}, 'web3': {'1': 'FAILED'}}), first['cursor'])
+    assert not second['full_state'] and not second['execution_state_changed']
+    assert second['nodes_started'] == ['web2'] and second['nodes_finished'] == ['web1']
+    assert second['nodes_failed'] == [{'node': 'web3', 'state': 'FAILED'}]
+    assert {(c['node'], c['step'], c['from'], c['to']) for c in second['step_changes']} == {
+        ('web1', '1', 'RUNNING', 'SUCCEEDED'), ('web1', '2', None, 'SUCCEEDED'),
+        ('web2', '1', None, 'RUNNING'), ('web3', '1', None, 'FAILED')}
+
+    # Re-polling from the same cursor gives another client the same changes
+    again = tracker.diff('9', state({'web1': {'1': 'SUCCEEDED', '2': 'SUCCEEDED'},
+                                     'web2': {'1': 'RUNNING'}, 'web3': {'1': 'FAILED'}}), first['cursor'])
+    assert again['nodes_finished'] == ['web1'] and again['cursor'] != second['cursor']
+
+    unchanged = tracker.diff('9', state({'web1': {'1': 'SUCCEEDED', '2': 'SUCCEEDED'},
+                                         'web2': {'1': 'RUNNING'}, 'web3': {'1': 'FAILED'}}), second['cursor'])
+    assert unchanged['step_changes'] == [] and unchanged['nodes_failed'] == []
+
+
+def test_unknown_expired_or_foreign_cursor_returns_full_state():
+    tracker = rms.ExecutionStateTracker(max_cursors=2)
+    first = tracker.diff('1', state({}))
+    assert tracker.diff('2', state({}), first['cursor'])['full_state']
+    assert tracker.diff('1', state({}), 'bogus')['full_state']
+    # first's snapshot has been evicted by the two polls since
+    assert tracker.diff('1', state({}), first['cursor'])['full_state']
+
+
+def test_step_changes_are_truncated(monkeypatch):
+    monkeypatch.setattr(rms, 'EXECUTION_STATE_MAX_CHANGES', 3)
+    nodes = {f'n{i}': {'1': 'RUNNING'} for i in range(5)}
+    result = rms.ExecutionStateTracker().diff('1', state(nodes, targets=()))
+    assert len(result['step_changes']) == 3 and result['step_changes_truncated'] == 2
+    assert result['node_count'] == 5
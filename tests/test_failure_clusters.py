@@ -0,0 +1,82 @@
+"""Failure signature normalization and MinHash clustering"""
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('2025-11-03T10:15:22.123Z ERROR job 5f0c1a2b-1111-2222-3333-444455556666 failed',
+     '<ts> error job <uuid> failed'),
+    ('Connection to 10.0.3.17:5432 refused after 3 retries', 'connection to <ip> refused after <n> retries'),
+    ('Cannot reach db-7.prod.example.com at 04:01:02', 'cannot reach <host> at <time>'),
+    ('Checksum deadbeefcafe1234 mismatch, ptr 0x7ffe', 'checksum <hex> mismatch, ptr <hex>'),
+    ('  Disk   FULL on 2025-11-03  ', 'disk full on <date>'),
+])
+def test_normalize_strips_variable_parts(line, expected):
+    assert rms.normalize_log_line(line) == expected
+
+
+def test_error_lines_prefer_error_level_then_error_words_then_tail():
+    entries = [{'log': 'starting', 'level': 'NORMAL'}, {'log': 'Exception: boom', 'level': 'NORMAL'},
+               {'log': 'done', 'level': 'NORMAL'}]
+    assert rms.extract_error_lines(entries) == ['Exception: boom']
+    assert rms.extract_error_lines(entries + [{'log': 'fatal', 'level': 'ERROR'}]) == ['fatal']
+    assert rms.extract_error_lines(iter({'log': f'line {i}'} for i in range(5)), 2) == ['line 3', 'line 4']
+    assert rms.extract_error_lines([]) == []
+
+
+def test_minhash_is_deterministic_and_tracks_similarity():
+    a = rms.minhash_signature('connection refused by upstream service on port <n>')
+    assert a == rms.minhash_signature('connection refused by upstream service on port <n>')
+    assert len(a) == rms.MINHASH_PERMUTATIONS
+    near = rms.minhash_signature('connection refused by upstream service on port <n> again')
+    far = rms.minhash_signature('permission denied writing to output directory')
+
+    def similarity(x, y):
+        return sum(1 for p, q in zip(x, y) if p == q) / len(x)
+    assert similarity(a, near) > 0.5
+    assert similarity(a, far) < 0.2
+
+
+def test_cluster_signatures_merges_near_duplicates_only():
+    texts = {
+        'a': 'timeout waiting for lock on table orders in database <host>',
+        'b': 'timeout waiting for lock on table orders in database <host> after <n>s',
+        'c': 'authentication failed for user deploy using key <hex>',
+        'd': 'authentication failed for user deploy using key <hex> from <ip>',
+        'e': 'no space left on device',
+    }
+    clusters = rms.cluster_signatures({k: rms.minhash_signature(v) for k, v in texts.items()}, 0.6)
+    assert sorted(sorted(c) for c in clusters) == [['a', 'b'], ['c', 'd'], ['e']]
+    assert len(rms.cluster_signatures({k: rms.minhash_signature(v) for k, v in texts.items()}, 1.01)) == 5
+
+
+def test_cluster_failures_groups_outputs(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    failed = [{'id': i, 'job': {'name': f'job{i % 2}'}, 'failedNodes': [f'web{i % 3}'],
+               'date-started': {'date': f'2025-11-03T0{i}:00:00Z'}} for i in range(6)]
+    logs = {
+        0: 'ERROR: connection to 10.0.0.1:5432 refused',
+        1: 'ERROR: connection to 10.0.0.2:5432 refused',
+        2: 'ERROR: connection to 10.9.9.9:5432 refused',
+        3: 'ERROR: disk full on /var/lib/app',
+        4: 'ERROR: disk full on /var/lib/app',
+        5: None,
+    }
+    monkeypatch.setattr(client, 'get_all_executions', lambda *args, **kwargs: failed)
+
+    def iter_execution_output(execution_id, envelope=None):
+        line = logs[int(execution_id)]
+        if line is None:
+            raise ValueError("output gone")
+        yield from [{'log': 'starting'}, {'log': line, 'level': 'ERROR'}]
+    monkeypatch.setattr(client, 'iter_execution_output', iter_execution_output)
+
+    result = client.cluster_failures('p')
+    assert result['failed_executions'] == 6
+    assert [(c['count'], c['representative_executions']) for c in result['clusters']] == \
+        [(3, [0, 1, 2]), (2, [3, 4]), (1, [5])]
+    assert result['clusters'][0]['sample_line'] == 'ERROR: connection to 10.0.0.1:5432 refused'
+    assert result['clusters'][2]['sample_line'] == '(no output available)'
+    assert result['clusters'][0]['first_seen'] == '2025-11-03T00:00:00Z'
@@ -0,0 +1,145 @@
+"""Answering narrower execution queries from recent wider fetches"""
+
+import time
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+DAY = 86400
+
+
+def execution(i, days_ago, status='succeeded', job='j1', user='alice'):
+    ended = time.time() - days_ago * DAY
+    return {'id': i, 'status': status, 'user': user, 'job': {'id': job},
+            'date-ended': {'unixtime': int(ended * 1000)}}
+
+
+WINDOW = [execution(1, 0.5), execution(2, 1.5, 'failed'), execution(3, 3, job='j2'),
+          execution(4, 6, user='bob'), execution(5, 9, 'failed', 'j2'),
+          {'id': 6, 'status': 'running', 'job': {'id': 'j1'}, 'user': 'alice'}]
+
+
+@pytest.fixture
+def planner():
+    planner = rms.ExecutionFetchPlanner(ttl_seconds=60)
+    planner.record('p', None, None, None, '10d', 5000, WINDOW)
+    return planner
+
+
+def ids(executions):
+    return None if executions is None else [e['id'] for e in executions]
+
+
+def test_narrower_filters_and_windows_are_answered_locally(planner):
+    assert ids(planner.lookup('p', None, None, None, '10d', 5000)) == [1, 2, 3, 4, 5, 6]
+    assert ids(planner.lookup('p', 'failed', None, None, '10d', 5000)) == [2, 5]
+    assert ids(planner.lookup('p', None, None, 'j2', '7d', 5000)) == [3]
+    assert ids(planner.lookup('p', None, 'bob', None, '1w', 5000)) == [4]
+    # Running executions have no end time and are inside every window
+    assert ids(planner.lookup('p', None, None, 'j1', '1d', 5000)) == [1, 6]
+    assert ids(planner.lookup('p', None, None, None, '10d', 2)) == [1, 2]
+    assert planner.stats()['hits'] == 6
+
+
+def test_wider_or_other_queries_miss(planner):
+    assert planner.lookup('p', None, None, None, '30d', 5000) is None
+    assert planner.lookup('p', None, None, None, None, 5000) is None
+    assert planner.lookup('other', None, None, None, '1d', 5000) is None
+    assert planner.lookup('p', None, None, None, 'bogus', 5000) is None
+    narrow = rms.ExecutionFetchPlanner(ttl_seconds=60)
+    narrow.record('p', 'failed', None, None, '10d', 5000, [WINDOW[1]])
+    assert narrow.lookup('p', None, None, None, '10d', 5000) is None
+    assert narrow.lookup('p', 'succeeded', None, None, '10d', 5000) is None
+
+
+def test_truncated_fetch_only_covers_windows_it_reaches_back_past():
+    planner = rms.ExecutionFetchPlanner(ttl_seconds=60)
+    # Hit max_total: the newest 3 executions reach back 3 days
+    planner.record('p', None, None, None, '30d', 3, WINDOW[:3])
+    assert ids(planner.lookup('p', None, None, None, '2d', 5000)) == [1, 2]
+    assert planner.lookup('p', None, None, None, '7d', 5000) is None
+    # Asking for no more than the newest matches is always covered
+    assert ids(planner.lookup('p', None, None, None, '7d', 2)) == [1, 2]
+
+
+def test_entries_expire_and_ttl_zero_disables():
+    planner = rms.ExecutionFetchPlanner(ttl_seconds=0.05)
+    planner.record('p', None, None, None, '10d', 5000, WINDOW)
+    time.sleep(0.1)
+    assert planner.lookup('p', None, None, None, '1d', 5000) is None
+    disabled = rms.ExecutionFetchPlanner(ttl_seconds=0)
+    disabled.record('p', None, None, None, '10d', 5000, WINDOW)
+    assert disabled.lookup('p', None, None, None, '1d', 5000) is None
+
+
+def test_refetch_of_the_same_query_replaces_the_older_window(planner):
+    planner.record('p', None, None, None, '10d', 5000, WINDOW[:1])
+    assert planner.stats()['entries'] == 1
+    assert ids(planner.lookup('p', None, None, None, '10d', 5000)) == [1]
+
+
+def test_oldest_entries_are_evicted_beyond_max_entries():
+    planner = rms.ExecutionFetchPlanner(ttl_seconds=60, max_entries=2)
+    for project in ('a', 'b', 'c'):
+        planner.record(project, None, None, None, '10d', 5000, WINDOW)
+    assert planner.lookup('a', None, None, None, '1d', 5000) is None
+    assert planner.lookup('c', None, None, None, '1d', 5000) is not None
+
+
+def test_get_all_executions_reuses_a_wider_fetch(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    pages = []
+
+    def get_executions(project, max_results, *args, **kwargs):
+        pages.append(args)
+        return {'executions': WINDOW, 'total': len(WINDOW), 'hasMore': False}
+
+    monkeypatch.setattr(client, 'get_executions', get_executions)
+    client.get_all_executions('p', recent_filter='10d')
+    assert ids(client.get_all_executions('p', status='failed', recent_filter='7d')) == [2]
+    assert len(pages) == 1
+    client.get_all_executions('p', status='failed', recent_filter='7d', refresh=True)
+    assert len(pages) == 2
+
+
+def test_windows_from_other_processes_are_read_once(tmp_path, monkeypatch):
+    cache = rms.SharedCache(str(tmp_path), 1 << 20)
+    monkeypatch.setattr(rms, 'shared_cache', cache)
+    rms.ExecutionFetchPlanner(ttl_seconds=60).record('p', None, None, None, '10d', 5000, WINDOW)
+    reads = []
+    get = cache.get
+    monkeypatch.setattr(cache, 'get', lambda key, max_age: reads.append(key) or get(key, max_age))
+
+    planner = rms.ExecutionFetchPlanner(ttl_seconds=60)
+    assert ids(planner.lookup('p', 'failed', None, None, '10d', 5000)) == [2, 5]
+    # Misses after adopting the window don't read it again
+    for _ in range(3):
+        assert planner.lookup('p', None, None, None, '30d', 5000) is None
+    assert len(reads) == 1
+    # A window this planner stored itself is never read back
+    planner.record('p', None, None, None, '60d', 5000, WINDOW)
+    assert planner.lookup('p', None, None, None, '90d', 5000) is None
+    assert len(reads) == 1
+
+
+def test_tool_result_shows_when_reused_executions_were_fetched(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    monkeypatch.setattr(client, 'get_executions', lambda *args, **kwargs:
+                        {'executions': WINDOW, 'total': len(WINDOW), 'hasMore': False})
+    monkeypatch.setattr(rms, 'server_configs', {'default': {}})
+    monkeypatch.setattr(rms, 'get_rundeck_client', lambda server=None: client)
+    client.get_all_executions('p', recent_filter='10d')
+    fetched_at = client.executions_fetched_at()
+    monkeypatch.setattr(rms.time, 'time', lambda: fetched_at + 42)
+
+    summary = rms.execute_tool('get_all_executions', {'project': 'p', 'recent_filter': '7d'})
+    assert '(42s ago)' in summary[0].text
+    notice, details = rms.execute_tool('get_all_executions', {
+        'project': 'p', 'recent_filter': '7d', 'summary_only': False
+    })
+    assert notice.text.startswith('Reused executions fetched 42s ago')
+    fresh = rms.execute_tool('get_all_executions', {
+        'project': 'p', 'recent_filter': '7d', 'summary_only': False, 'refresh': True
+    })
+    assert len(fresh) == 1 and client.executions_fetched_at() == fetched_at + 42
@@ -0,0 +1,126 @@
+"""Recording Rundeck traffic to a cassette and replaying it offline"""
+
+import gzip
+import json
+
+import pytest
+import requests
+
+import rundeck_mcp_server as rms
+
+
+class CannedAdapter(requests.adapters.BaseAdapter):
+    """Transport answering each request with the next canned body for its path"""
+
+    def __init__(self, bodies):
+        super().__init__()
+        self.bodies = {path: list(items) for path, items in bodies.items()}
+
+    def send(self, request, **kwargs):
+        path = request.path_url.split('?')[0]
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        queue = self.bodies.get(path)
+        response.status_code = 200 if queue else 404
+        response._content = json.dumps(queue.pop(0) if queue else {"error": True}).encode()
+        response._content_consumed = True
+        response.headers['Content-Type'] = 'application/json'
+        return response
+
+    def close(self):
+        pass
+
+
+def client_with(adapter, base_url='http://rundeck.example:4440'):
+    client = rms.RundeckClient(base_url, 't')
+    client.session.mount('http://', adapter)
+    return client
+
+
+def test_cassette_key_ignores_server_version_and_query_order():
+    a = rms.cassette_key('get', 'http://a:4440/api/47/project/p/executions?max=20&offset=0')
+    b = rms.cassette_key('GET', 'https://b/rundeck/api/41/project/p/executions?offset=0&max=20')
+    assert a == b == 'GET project/p/executions?max=20&offset=0 '
+    assert rms.cassette_key('POST', 'http://a/api/47/job/x/run', b'{"options": {}}') == \
+        'POST job/x/run? {"options": {}}'
+
+
+def test_cassette_key_hides_option_values():
+    live = rms.cassette_key('POST', 'http://a/api/47/job/x/run',
+                            b'{"options": {"password": "hunter2"}, "filter": "web"}')
+    assert 'hunter2' not in live
+    # A launch replayed from a redacted tool trace hits the same recording
+    replayed = rms.cassette_key('POST', 'http://a/api/47/job/x/run',
+                                '{"filter": "web", "options": {"password": "<redacted>"}}')
+    assert live == replayed
+
+
+@pytest.mark.parametrize('name', ['cassette.jsonl', 'cassette.jsonl.gz'])
+def test_json_lines_round_trip(tmp_path, name):
+    path = str(tmp_path / 'nested' / name)
+    writer = rms.JsonLinesWriter(path)
+    writer.write({"n": 1})
+    writer.write({"n": 2, "text": "café"})
+    writer.close()
+    assert rms.read_json_lines(path) == [{"n": 1}, {"n": 2, "text": "café"}]
+
+
+def test_truncated_tail_is_tolerated(tmp_path):
+    plain = tmp_path / 'a.jsonl'
+    plain.write_text('{"n": 1}\n\n{"n": 2}\n{"n": 3, "te', encoding='utf-8')
+    assert rms.read_json_lines(str(plain)) == [{"n": 1}, {"n": 2}]
+
+    compressed = tmp_path / 'a.jsonl.gz'
+    data = gzip.compress(b'{"n": 1}\n{"n": 2}\n' * 50)
+    compressed.write_bytes(data[:len(data) - 12])
+    records = rms.read_json_lines(str(compressed))
+    assert 0 < len(records) < 100
+    assert records == ([{"n": 1}, {"n": 2}] * 50)[:len(records)]
+
+
+def test_recorded_session_replays_offline(tmp_path, monkeypatch):
+    cassette = str(tmp_path / 'cassette.jsonl')
+    monkeypatch.setattr(rms, 'http_recorder', rms.JsonLinesWriter(cassette))
+    live = client_with(CannedAdapter({
+        '/api/47/execution/7': [{"id": 7, "status": "running"}, {"id": 7, "status": "succeeded"}],
+        '/api/47/projects': [[{"name": "ops"}]],
+    }))
+    recorded = [live.get_execution_status('7'), live.get_execution_status('7'), live.get_projects()]
+    rms.http_recorder.close()
+    monkeypatch.setattr(rms, 'http_recorder', None)
+
+    records = rms.read_json_lines(cassette)
+    assert [r['key'] for r in records] == ['GET execution/7? '] * 2 + ['GET projects? ']
+    assert all(r['server'] == 'http://rundeck.example:4440' and r['latency_ms'] >= 0 for r in records)
+
+    # A different server URL replays the same cassette; repeats of a request come back in order
+    replay = client_with(rms.ReplayAdapter(cassette, latency_scale=0), 'http://elsewhere:4440')
+    replayed = [replay.get_execution_status('7'), replay.get_execution_status('7'), replay.get_projects(refresh=True)]
+    assert replayed == recorded
+    assert replay.get_execution_status('7') == {"id": 7, "status": "succeeded"}
+
+
+def test_replay_answers_unrecorded_requests_with_404(tmp_path):
+    cassette = tmp_path / 'cassette.jsonl'
+    cassette.write_text('', encoding='utf-8')
+    adapter = rms.ReplayAdapter(str(cassette), latency_scale=0)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    result = session.get('http://rundeck.example/api/47/execution/1')
+    assert result.status_code == 404
+    assert result.json()['message'] == 'Not in cassette'
+
+
+def test_tool_trace_keeps_option_names_only(tmp_path, monkeypatch):
+    path = str(tmp_path / 'trace.jsonl')
+    monkeypatch.setattr(rms, 'tool_trace_recorder', rms.JsonLinesWriter(path))
+    monkeypatch.setattr(rms, 'execute_tool', lambda name, arguments: [])
+    arguments = {'job_id': 'j', 'options': {'password': 'hunter2', 'env': 'prod'}}
+    rms.asyncio.run(rms.handle_call_tool('run_job', arguments))
+    rms.tool_trace_recorder.close()
+
+    [call] = rms.read_json_lines(path)
+    assert call['name'] == 'run_job'
+    assert call['arguments'] == {'job_id': 'j', 'options': {'password': '<redacted>', 'env': '<redacted>'}}
+    assert arguments['options']['password'] == 'hunter2'
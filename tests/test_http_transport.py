@@ -0,0 +1,162 @@
+"""Streamable HTTP and SSE transports serving many sessions from one process"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+try:
+    from mcp.client.streamable_http import streamable_http_client
+except ImportError:  # renamed in newer mcp releases
+    from mcp.client.streamable_http import streamablehttp_client as streamable_http_client
+
+import rundeck_mcp_server as rms
+
+
+class RecordingClient(rms.RundeckClient):
+    """Client answering execution lookups locally and remembering every instance"""
+
+    created = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        RecordingClient.created.append(self)
+        self.calls = []
+
+    def get_execution_status(self, execution_id):
+        self.calls.append(execution_id)
+        return {'id': int(execution_id), 'status': 'succeeded', 'project': 'p'}
+
+
+@pytest.fixture
+def configured(monkeypatch):
+    RecordingClient.created = []
+    monkeypatch.setattr(rms, 'RundeckClient', RecordingClient)
+    monkeypatch.setattr(rms, 'server_configs', {'default': {'url': 'http://rundeck.example:4440', 'token': 't',
+                                                            'api_version': '47'}})
+    monkeypatch.setattr(rms, 'rundeck_clients', {})
+    monkeypatch.setattr(rms, 'client_last_used', {})
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Run run_http_server on a background thread, returning its base URL"""
+    servers = []
+
+    class StoppableServer(uvicorn.Server):
+        def __init__(self, config):
+            super().__init__(config)
+            servers.append(self)
+
+    monkeypatch.setattr(uvicorn, 'Server', StoppableServer)
+    threads = []
+
+    def start(transport):
+        port = free_port()
+        monkeypatch.setenv('RUNDECK_MCP_HOST', '127.0.0.1')
+        monkeypatch.setenv('RUNDECK_MCP_PORT', str(port))
+        thread = threading.Thread(target=asyncio.run, args=(rms.run_http_server(transport),), daemon=True)
+        thread.start()
+        threads.append(thread)
+        deadline = time.monotonic() + 10
+        while not (servers and servers[-1].started):
+            assert time.monotonic() < deadline, "server did not start"
+            time.sleep(0.02)
+        return f"http://127.0.0.1:{port}"
+
+    yield start
+    for server in servers:
+        server.should_exit = True
+    for thread in threads:
+        thread.join(5)
+
+
+async def call_status(streams, execution_id):
+    async with ClientSession(streams[0], streams[1]) as session:
+        await session.initialize()
+        tools = await session.list_tools()
+        result = await session.call_tool('get_execution_status', {'execution_id': execution_id})
+        return {tool.name for tool in tools.tools}, json.loads(result.content[0].text)
+
+
+def test_streamable_http_sessions_share_one_client(configured, serve):
+    url = serve('http') + '/mcp/'
+
+    async def session(execution_id):
+        async with streamable_http_client(url) as (read, write, _):
+            return await call_status((read, write), execution_id)
+
+    async def sessions():
+        return await asyncio.gather(session('1'), session('2'), session('3'))
+
+    results = asyncio.run(sessions())
+    assert all('get_execution_status' in tools for tools, _ in results)
+    assert sorted(status['id'] for _, status in results) == [1, 2, 3]
+    [client] = RecordingClient.created
+    assert sorted(client.calls) == ['1', '2', '3']
+
+
+def test_sse_sessions_share_one_client(configured, serve):
+    url = serve('sse') + '/sse'
+
+    async def session(execution_id):
+        async with sse_client(url) as streams:
+            return await call_status(streams, execution_id)
+
+    async def sessions():
+        return await asyncio.gather(session('4'), session('5'))
+
+    results = asyncio.run(sessions())
+    assert sorted(status['status'] for _, status in results) == ['succeeded', 'succeeded']
+    [client] = RecordingClient.created
+    assert sorted(client.calls) == ['4', '5']
+
+
+def test_http_app_routes():
+    from starlette.routing import Mount, Route
+    http_paths = [(type(route), route.path) for route in rms.create_http_app('http').routes]
+    assert http_paths == [(Mount, '/mcp')]
+    sse_paths = [(type(route), route.path) for route in rms.create_http_app('sse').routes]
+    assert sse_paths == [(Route, '/sse'), (Mount, '/messages')]
+
+
+@pytest.mark.parametrize('setting, expected', [
+    ('http', 'http'), ('streamable-http', 'http'), ('SSE', 'sse'), ('stdio', None), (None, None)])
+def test_main_selects_the_transport(monkeypatch, setting, expected):
+    for name in ('load_tool_prompts', 'initialize_rundeck_clients', 'initialize_log_archive',
+                 'initialize_shared_cache', 'initialize_webhook_receiver', 'initialize_prefetcher'):
+        monkeypatch.setattr(rms, name, lambda: None)
+    if setting is None:
+        monkeypatch.delenv('RUNDECK_MCP_TRANSPORT', raising=False)
+    else:
+        monkeypatch.setenv('RUNDECK_MCP_TRANSPORT', setting)
+    served = []
+
+    async def run_http_server(transport):
+        served.append(transport)
+
+    @asynccontextmanager
+    async def stdio_server():
+        served.append('stdio')
+        yield 'read', 'write'
+
+    async def run(read, write, options):
+        assert (read, write) == ('read', 'write')
+
+    monkeypatch.setattr(rms, 'run_http_server', run_http_server)
+    monkeypatch.setattr(rms, 'stdio_server', stdio_server)
+    monkeypatch.setattr(rms.server, 'run', run)
+    asyncio.run(rms.main())
+    assert served == [expected or 'stdio']
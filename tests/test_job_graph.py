@@ -0,0 +1,145 @@
+"""Job reference graph: resolution, relinking on rename, cycles and impact"""
+
+import rundeck_mcp_server as rms
+
+
+def job(job_id, name, refs=(), group=None, project='p', schedule=False, handler=None):
+    commands = []
+    for ref in refs:
+        commands.append({'jobref': ref} if isinstance(ref, dict) else {'jobref': {'name': ref}})
+    if handler:
+        commands.append({'exec': 'true', 'errorhandler': {'jobref': handler}})
+    definition = {'id': job_id, 'name': name, 'group': group, 'project': project,
+                  'sequence': {'commands': commands}}
+    if schedule:
+        definition['schedule'] = {'time': {'hour': '1'}}
+    return definition
+
+
+def edges(graph):
+    return {(source, target) for source, targets in graph.downstream.items() for target in targets}
+
+
+def test_job_references_include_error_handlers():
+    refs = rms.job_references(job('a', 'A', [{'uuid': 'b'}, {'group': 'ops/db', 'name': 'backup', 'project': 'q'}],
+                                  handler={'name': 'notify'}))
+    assert refs == [
+        {'uuid': 'b', 'project': None, 'path': '', 'step': 1, 'error_handler': False},
+        {'uuid': None, 'project': 'q', 'path': 'ops/db/backup', 'step': 2, 'error_handler': False},
+        {'uuid': None, 'project': None, 'path': 'notify', 'step': 3, 'error_handler': True}]
+    assert rms.job_references({}) == []
+
+
+def test_references_resolve_when_the_target_appears_later():
+    graph = rms.JobGraph()
+    graph.update(job('a', 'A', ['B', {'name': 'C', 'group': 'g', 'project': 'q'}]))
+    assert edges(graph) == set()
+    graph.update(job('b', 'B'))
+    graph.update(job('c', 'C', group='g', project='q'))
+    graph.update(job('c2', 'C', group='g'))  # same path in another project
+    assert edges(graph) == {('a', 'b'), ('a', 'c')}
+    assert graph.upstream['b'] == {'a'}
+
+
+def test_rename_relinks_name_references():
+    graph = rms.JobGraph()
+    graph.load_project('p', iter([job('a', 'A', ['B']), job('b', 'B'), job('x', 'X', [{'uuid': 'b'}])]))
+    assert edges(graph) == {('a', 'b'), ('x', 'b')}
+
+    graph.update(job('b', 'Renamed'))
+    # The UUID reference follows the job; the name reference no longer matches
+    assert edges(graph) == {('x', 'b')}
+    assert graph.summary(['p'])['unresolved_reference_count'] == 1
+
+    graph.update(job('new', 'B'))
+    assert edges(graph) == {('a', 'new'), ('x', 'b')}
+    graph.update(job('b', 'B'))
+    assert ('a', 'b') in edges(graph)
+
+
+def test_updating_a_caller_replaces_its_edges():
+    graph = rms.JobGraph()
+    graph.load_project('p', iter([job('a', 'A', ['B']), job('b', 'B'), job('c', 'C')]))
+    graph.update({'id': 'a', 'name': 'A', 'sequence': {'commands': [{'jobref': {'name': 'C'}}]}})
+    assert edges(graph) == {('a', 'c')}
+    assert graph.upstream['b'] == set()
+    assert graph.jobs['a']['project'] == 'p'
+    assert not graph.update({'name': 'no id'})
+
+
+def test_reload_drops_deleted_jobs():
+    graph = rms.JobGraph()
+    graph.load_project('p', iter([job('a', 'A', ['B']), job('b', 'B')]))
+    graph.load_project('q', iter([job('q1', 'Q', [{'uuid': 'a'}], project='q')]))
+    assert graph.load_project('p', iter([job('a', 'A', ['B'])])) == 1
+    assert 'b' not in graph.jobs and edges(graph) == {('q1', 'a')}
+    graph.load_project('p', iter([job('a', 'A', ['B']), job('b2', 'B')]))
+    assert edges(graph) == {('q1', 'a'), ('a', 'b2')}
+
+
+def test_cycles_self_loops_and_acyclic_parts():
+    graph = rms.JobGraph()
+    graph.load_project('p', iter([
+        job('a', 'A', ['B']), job('b', 'B', ['C']), job('c', 'C', ['A', 'D']),
+        job('d', 'D'), job('s', 'S', ['S']), job('e', 'E', ['D'])]))
+    assert sorted(graph.cycles()) == [['a', 'b', 'c'], ['s']]
+    assert [[j['id'] for j in cycle] for cycle in graph.query('b')['cycles']] == [['a', 'b', 'c']]
+    graph.update(job('c', 'C', ['D']))
+    assert graph.cycles() == [['s']]
+
+
+def test_long_reference_chain_does_not_recurse():
+    graph = rms.JobGraph()
+    count = 5000
+    graph.load_project('p', iter(job(f'j{i}', f'J{i}', [f'J{(i + 1) % count}']) for i in range(count)))
+    [cycle] = graph.cycles()
+    assert len(cycle) == count
+
+
+def test_query_depths_and_entry_points():
+    graph = rms.JobGraph()
+    graph.load_project('p', iter([
+        job('top', 'Top', ['Mid']), job('cron', 'Cron', ['Leaf'], schedule=True),
+        job('mid', 'Mid', ['Leaf']), job('leaf', 'Leaf', ['Util']), job('util', 'Util')]))
+    graph.update(job('x', 'X', [{'uuid': 'cron'}], project='q'))
+    result = graph.query('leaf')
+    assert [(j['id'], j['depth']) for j in result['upstream']] == [('cron', 1), ('mid', 1), ('top', 2), ('x', 2)]
+    assert [(j['id'], j['depth']) for j in result['downstream']] == [('util', 1)]
+    assert result['impact']['affected_jobs'] == 4
+    assert result['impact']['affected_projects'] == ['p', 'q']
+    assert sorted((j['id'], j['scheduled']) for j in result['impact']['entry_points']) == \
+        [('cron', True), ('top', False), ('x', False)]
+    assert [j['id'] for j in graph.query('leaf', max_depth=1)['upstream']] == ['cron', 'mid']
+    assert graph.query('missing')['job'] == {'id': 'missing', 'loaded': False}
+
+
+def test_summary_counts_and_unresolved_references():
+    graph = rms.JobGraph()
+    graph.load_project('p', iter([job('a', 'A', ['B', 'Ghost']), job('b', 'B'), job('c', 'C', ['B'])]))
+    summary = graph.summary(['p'])
+    assert (summary['jobs'], summary['references'], summary['jobs_calling_others'],
+            summary['jobs_called_by_others']) == (3, 2, 2, 1)
+    assert summary['most_referenced'][0]['id'] == 'b' and summary['most_referenced'][0]['callers'] == 2
+    assert summary['unresolved_references'] == [
+        {'from': {'id': 'a', 'name': 'A', 'group': None, 'project': 'p'}, 'step': 2, 'project': 'p', 'job': 'Ghost'}]
+
+
+def test_definitions_without_a_project_are_filed_under_a_known_one(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    definitions = {'a': job('a', 'A', ['B'], project=None), 'b': job('b', 'B', project=None)}
+    monkeypatch.setattr(client, '_make_request', lambda method, endpoint, **kwargs:
+                        [{'id': 'b', 'name': 'B'}] if endpoint == 'project/p/jobs'
+                        else [definitions[endpoint.split('/')[1]]])
+
+    client.get_job_definition('a')
+    assert 'a' not in client.job_graph.jobs
+    # Project from the caller, else from a job listing already in memory
+    client.get_job_definition('a', 'p')
+    monkeypatch.setattr(rms, 'CATALOG_TTL_SECONDS', 300)
+    client.get_jobs('p')
+    client.get_job_definition('b')
+    assert client.job_graph.jobs['b']['project'] == 'p'
+    assert edges(client.job_graph) == {('a', 'b')}
+    # Once known, later definitions of the job keep its project
+    client.get_job_definition('a')
+    assert client.job_graph.jobs['a']['project'] == 'p'
@@ -0,0 +1,167 @@
+"""Launch queue deduplication, priority order and per-job run limits"""
+
+import json
+import threading
+import time
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+
+class Launcher:
+    def __init__(self, delay=0.0, running=None):
+        self.launches = []
+        self.delay = delay
+        self.running = list(running or [])
+        self.release = threading.Event()
+        self.release.set()
+        self.lock = threading.Lock()
+
+    def launch(self, job_id, options, node_filter):
+        self.release.wait(5)
+        time.sleep(self.delay)
+        with self.lock:
+            self.launches.append((job_id, options, node_filter))
+            return {'id': len(self.launches), 'job': {'id': job_id}}
+
+    def running_count(self, job_id):
+        return self.running.pop(0) if self.running else 0
+
+
+def queue(launcher, **kwargs):
+    return rms.LaunchQueue(launcher.launch, launcher.running_count, **kwargs)
+
+
+def test_identical_launches_within_window_are_deduplicated():
+    launcher = Launcher()
+    launch_queue = queue(launcher, dedupe_seconds=60)
+    first = launch_queue.submit('job', {'a': '1'}, 'tags: web')
+    second = launch_queue.submit('job', {'a': '1'}, 'tags: web')
+    assert first['id'] == second['id'] == 1
+    assert first['launch_queue']['deduplicated'] is False
+    assert second['launch_queue'] == {'deduplicated': True, 'existing_execution_id': 1}
+    assert launch_queue.stats()['deduplicated'] == 1
+
+
+def test_different_options_filters_or_allow_duplicate_launch_again():
+    launcher = Launcher()
+    launch_queue = queue(launcher, dedupe_seconds=60)
+    launch_queue.submit('job', {'a': '1'})
+    assert launch_queue.submit('job', {'a': '2'})['id'] == 2
+    assert launch_queue.submit('job', {'a': '1'}, 'tags: db')['id'] == 3
+    assert launch_queue.submit('job', {'a': '1'}, allow_duplicate=True)['id'] == 4
+    assert len(launcher.launches) == 4
+
+
+def test_dedupe_window_expires():
+    launcher = Launcher()
+    launch_queue = queue(launcher, dedupe_seconds=0.05)
+    launch_queue.submit('job')
+    time.sleep(0.1)
+    assert launch_queue.submit('job')['launch_queue']['deduplicated'] is False
+
+
+def test_concurrent_identical_launches_start_one_run():
+    launcher = Launcher(delay=0.2)
+    launch_queue = queue(launcher, dedupe_seconds=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(launch_queue.submit('job'))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(launcher.launches) == 1
+    assert {r['id'] for r in results} == {1}
+    assert sum(r['launch_queue']['deduplicated'] for r in results) == 4
+
+
+def test_failed_launch_is_raised_to_waiting_duplicates_and_not_remembered():
+    attempts = []
+
+    def launch(job_id, options, node_filter):
+        attempts.append(job_id)
+        if len(attempts) == 1:
+            time.sleep(0.1)
+            raise ValueError("boom")
+        return {'id': 99}
+    launch_queue = rms.LaunchQueue(launch, lambda job_id: 0, dedupe_seconds=60)
+    errors = []
+
+    def submit():
+        try:
+            launch_queue.submit('job')
+        except ValueError as e:
+            errors.append(str(e))
+    threads = [threading.Thread(target=submit) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+    assert errors == ['boom', 'boom']
+    assert launch_queue.submit('job')['id'] == 99
+
+
+def test_higher_priority_launches_go_first():
+    launcher = Launcher()
+    launcher.release.clear()
+    launch_queue = queue(launcher, dedupe_seconds=0, concurrency=1)
+    threads = [threading.Thread(target=launch_queue.submit, args=('blocker',))]
+    threads[0].start()
+    time.sleep(0.1)
+    for job_id, priority in (('low', 0), ('high', 10), ('mid', 5)):
+        thread = threading.Thread(target=launch_queue.submit, args=(job_id, None, None, priority))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+    assert launch_queue.stats()['queue_depth'] == 3
+    launcher.release.set()
+    for thread in threads:
+        thread.join()
+    assert [job for job, _, _ in launcher.launches] == ['blocker', 'high', 'mid', 'low']
+
+
+def test_launch_waits_while_job_is_at_its_run_limit(monkeypatch):
+    monkeypatch.setattr(rms, 'LAUNCH_RECHECK_SECONDS', 0.01)
+    launcher = Launcher(running=[2, 2, 1])
+    launch_queue = queue(launcher, dedupe_seconds=0)
+    result = launch_queue.submit('job', max_concurrent_runs=2)
+    assert result['id'] == 1
+    assert launcher.running == []
+    assert launch_queue.stats()['held_for_capacity'] == 1
+
+
+def test_run_limit_gives_up_after_queue_timeout(monkeypatch):
+    monkeypatch.setattr(rms, 'LAUNCH_RECHECK_SECONDS', 0.01)
+    monkeypatch.setattr(rms, 'LAUNCH_QUEUE_TIMEOUT_SECONDS', 0.05)
+    launcher = Launcher(running=[3] * 100)
+    with pytest.raises(ValueError):
+        queue(launcher, dedupe_seconds=0).submit('job', max_concurrent_runs=1)
+    assert launcher.launches == []
+
+
+@pytest.fixture
+def tool_client(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    started = []
+
+    def start_job(job_id, options=None, node_filter=None):
+        started.append(job_id)
+        return {'id': 40 + len(started), 'permalink': 'http://rundeck.example:4440/execution/show/41'}
+    client.launch_queue = rms.LaunchQueue(start_job, lambda job_id: 0, dedupe_seconds=60)
+    monkeypatch.setattr(rms, 'get_rundeck_client', lambda server_name=None: client)
+    monkeypatch.setattr(rms, 'server_configs', {'default': {'url': client.base_url, 'token': 't'}})
+    return started
+
+
+@pytest.mark.parametrize('tool', ['run_job', 'run_job_with_monitoring'])
+def test_deduplicated_launch_leads_the_tool_result(tool_client, tool):
+    first = rms.execute_tool(tool, {'job_id': 'job'})
+    assert len(first) == 1 and json.loads(first[0].text)['id'] == 41
+    second = rms.execute_tool(tool, {'job_id': 'job'})
+    assert second[0].text.startswith('Deduplicated: attached to existing execution 41')
+    assert json.loads(second[1].text)['launch_queue']['deduplicated'] is True
+    third = rms.execute_tool(tool, {'job_id': 'job', 'allow_duplicate': True})
+    assert len(third) == 1 and json.loads(third[0].text)['id'] == 42
+    assert tool_client == ['job', 'job']
@@ -0,0 +1,79 @@
+"""Execution log archive storage, eviction and full-text search"""
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+
+def entries(*lines, node='web1'):
+    return [{'log': line, 'node': node, 'level': 'NORMAL', 'time': '10:00:00'} for line in lines]
+
+
+def store(archive, server, execution_id, *lines, node='web1'):
+    archive.store(server, execution_id, {'execCompleted': True}, iter(entries(*lines, node=node)))
+
+
+def read(archive, server, execution_id):
+    stored = archive.read(server, execution_id)
+    return stored and (stored[0], list(stored[1]))
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return rms.ExecutionLogArchive(str(tmp_path), 50 * 1024 * 1024)
+
+
+def test_store_and_read_round_trip(archive):
+    store(archive, 's1', '1', 'hello', 'world')
+    assert read(archive, 's1', '1') == ({'execCompleted': True}, entries('hello', 'world'))
+    assert archive.read('s2', '1') is None
+
+
+def test_large_outputs_are_read_back_a_chunk_at_a_time(archive):
+    lines = [f'step {i % 7} ' + 'x' * (i % 300) for i in range(20000)]
+    store(archive, 's1', '1', *lines)
+    envelope, stored = archive.read('s1', '1')
+    assert next(stored) == entries(lines[0])[0]
+    assert [entry['log'] for entry in stored] == lines[1:]
+
+
+def test_search_counts_only_the_requested_server(archive):
+    store(archive, 's1', '1', 'disk full on /var', 'retrying')
+    store(archive, 's2', '1', 'disk full on /tmp')
+    store(archive, 's2', '2', 'disk full again', 'disk full')
+    result = archive.search('s1', 'disk full')
+    assert result['executions_matched'] == 1
+    assert result['lines_matched'] == 1
+    assert result['archived_executions'] == 1
+    assert [e['execution_id'] for e in result['executions']] == ['1']
+    assert archive.search('s2', 'disk')['executions_matched'] == 2
+
+
+def test_search_limit_truncates_executions_but_not_counts(archive):
+    for i in range(5):
+        store(archive, 's1', str(i), 'connection refused', 'connection refused twice')
+    result = archive.search('s1', 'refused', limit=2)
+    assert result['executions_matched'] == 5
+    assert result['lines_matched'] == 10
+    assert len(result['executions']) == 2
+
+
+def test_snippets_carry_line_numbers_and_nodes(archive):
+    store(archive, 's1', '9', 'ok', 'fatal: no route', 'ok', node='db2')
+    snippet = archive.search('s1', 'fatal')['executions'][0]['snippets'][0]
+    assert snippet['line_number'] == 2
+    assert snippet['node'] == 'db2'
+    assert snippet['text'] == 'fatal: no route'
+
+
+def test_invalid_fts_syntax_searches_the_literal_phrase(archive):
+    store(archive, 's1', '1', 'error: "quoted" (paren')
+    assert archive.search('s1', '(paren')['executions_matched'] == 1
+
+
+def test_eviction_drops_oldest_outputs_and_their_index(tmp_path):
+    archive = rms.ExecutionLogArchive(str(tmp_path), 1)
+    store(archive, 's1', '1', 'first unique')
+    store(archive, 's1', '2', 'second unique')
+    assert archive.read('s1', '1') is None
+    assert archive.search('s1', 'first')['executions_matched'] == 0
@@ -0,0 +1,96 @@
+"""Node filter parsing and evaluation against the cached node inventory"""
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+RESOURCES = {
+    'web1': {'hostname': 'web1.prod', 'osFamily': 'unix', 'tags': 'web,prod', 'rack': 'a'},
+    'web2': {'hostname': 'web2.prod', 'osFamily': 'unix', 'tags': 'web, prod, canary', 'rack': 'b'},
+    'web3': {'hostname': 'web3.stage', 'osFamily': 'unix', 'tags': ['web', 'stage'], 'rack': 'a'},
+    'db1': {'hostname': 'db1.prod', 'osFamily': 'unix', 'tags': 'db,prod', 'rack': 'a'},
+    'win1': {'hostname': 'win1.prod', 'osFamily': 'windows', 'tags': 'web,prod', 'rack': 'c'},
+}
+
+
+@pytest.fixture
+def inventory():
+    return rms.NodeInventory('p', RESOURCES)
+
+
+def names(nodes):
+    return [node['nodename'] for node in nodes]
+
+
+def test_tokenize_honours_quotes():
+    assert rms.tokenize_node_filter('name: "web 1"  tags:\'a b\' x') == ['name:', 'web 1', "tags:a b", 'x']
+    assert rms.tokenize_node_filter('name: ""') == ['name:', '']
+
+
+def test_tokenize_rejects_unterminated_quotes():
+    with pytest.raises(ValueError):
+        rms.tokenize_node_filter('name: "web')
+
+
+def test_parse_attributes_aliases_exclusions_and_bare_words():
+    selectors = rms.parse_node_filter('tags: web+prod,db os-family:unix !name: win1 extra')
+    assert selectors == {
+        'include': {'tags': ['web+prod', 'db'], 'osFamily': ['unix'], 'nodename': ['extra']},
+        'exclude': {'nodename': ['win1']},
+    }
+
+
+@pytest.mark.parametrize('node_filter', ['tags:', 'tags: ,', '!: web', 'name: web[', 'tags: a+(b'])
+def test_parse_rejects_malformed_filters(node_filter):
+    with pytest.raises(ValueError):
+        rms.parse_node_filter(node_filter)
+
+
+def test_inventory_accepts_mapping_and_list_resources():
+    listed = rms.NodeInventory('p', [{'nodename': 'a', 'tags': 'x'}, 'junk', {'nodename': 'b'}])
+    assert names(listed.select('tags: x')) == ['a']
+    assert len(rms.NodeInventory('p', RESOURCES).nodes) == 5
+
+
+def test_tags_plus_is_and_comma_is_or(inventory):
+    assert names(inventory.select('tags: web+prod')) == ['web1', 'web2', 'win1']
+    assert names(inventory.select('tags: canary,db')) == ['web2', 'db1']
+    assert names(inventory.select('tags: web+prod+canary,stage')) == ['web2', 'web3']
+
+
+def test_attributes_are_anded(inventory):
+    assert names(inventory.select('tags: prod rack: a')) == ['web1', 'db1']
+
+
+def test_exclusions_and_empty_filter(inventory):
+    assert names(inventory.select('tags: web !osFamily: windows')) == ['web1', 'web2', 'web3']
+    assert names(inventory.select('!tags: prod')) == ['web3']
+    assert len(inventory.select('')) == 5
+
+
+def test_regex_patterns_match_whole_values(inventory):
+    assert names(inventory.select('hostname: web.*\\.prod')) == ['web1', 'web2']
+    assert names(inventory.select('hostname: web')) == []
+    assert names(inventory.select('web.*')) == ['web1', 'web2', 'web3']
+
+
+def test_unknown_attribute_matches_nothing(inventory):
+    assert inventory.select('datacenter: east') == []
+
+
+def test_large_inventory_is_evaluated_from_indexes():
+    resources = {f'n{i}': {'tags': f'role{i % 10},zone{i % 7}', 'osFamily': 'unix'} for i in range(20000)}
+    inventory = rms.NodeInventory('p', resources)
+    assert len(inventory.select('tags: role3+zone4 !name: n3')) == 20000 // 70 + (1 if 20000 % 70 > 53 else 0)
+
+
+def test_preview_reports_invalid_filters_without_fetching(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    fetched = []
+    monkeypatch.setattr(client, 'get_resources', lambda project: fetched.append(project) or RESOURCES)
+    assert client.preview_node_filter('p', 'name: "web')['valid'] is False
+    assert fetched == []
+    preview = client.preview_node_filter('p', 'tags: web', max_nodes=2)
+    assert preview['matched_nodes'] == 4 and preview['truncated'] is True
+    client.preview_node_filter('p', 'tags: db')
+    assert fetched == ['p']
@@ -0,0 +1,65 @@
+"""Per-node failure rates and failure streaks"""
+
+import rundeck_mcp_server as rms
+
+START = 1_800_000_000
+
+
+def execution(minute, ok=(), failed=(), job='deploy', project='p'):
+    return {'date-started': {'unixtime': (START + minute * 60) * 1000}, 'project': project,
+            'job': {'name': job}, 'successfulNodes': list(ok), 'failedNodes': list(failed)}
+
+
+def test_streaks_follow_start_order_not_input_order():
+    runs = [execution(0, failed=['web1']), execution(1, failed=['web1']), execution(2, ok=['web1']),
+            execution(3, failed=['web1']), execution(4, failed=['web1']), execution(5, failed=['web1'])]
+    result = rms.node_reliability(list(reversed(runs)))
+    [node] = result['worst_nodes']
+    assert (node['executions'], node['failures'], node['failure_rate_percent']) == (6, 5, 83.33)
+    assert node['current_failure_streak'] == 3 and node['longest_failure_streak'] == 3
+    assert node['last_failure'] == node['last_seen']
+    assert result['nodes_failing_now'] == 1
+
+
+def test_recovered_node_has_no_current_streak():
+    runs = [execution(0, failed=['db1']), execution(1, failed=['db1']), execution(2, ok=['db1'])]
+    [node] = rms.node_reliability(runs)['worst_nodes']
+    assert node['current_failure_streak'] == 0 and node['longest_failure_streak'] == 2
+    assert node['last_failure'] != node['last_seen']
+
+
+def test_ranking_thresholds_and_fleet_totals():
+    runs = []
+    for minute in range(4):
+        runs.append(execution(minute, ok=['a', 'healthy'], failed=['b'], job=f'job{minute % 2}',
+                              project='p' if minute else 'q'))
+    runs.append(execution(10, failed=['rare']))
+    runs.append({'status': 'running', 'date-started': {'unixtime': START * 1000}})
+    result = rms.node_reliability(runs, min_executions=3)
+    # 'rare' failed but has too few results to be ranked; 'a' and 'healthy' never failed
+    assert [n['node'] for n in result['worst_nodes']] == ['b']
+    assert result['worst_nodes'][0]['projects'] == ['p', 'q']
+    assert result['worst_nodes'][0]['top_failing_jobs'] == {'job0': 2, 'job1': 2}
+    assert result['executions_with_node_results'] == 5
+    assert result['nodes_seen'] == 4 and result['nodes_with_failures'] == 2
+    assert result['fleet_failure_rate_percent'] == round(5 / 13 * 100, 2)
+
+
+def test_worse_rate_ranks_first_then_current_streak():
+    runs = [execution(0, failed=['x', 'y'], ok=['z']), execution(1, failed=['y', 'z'], ok=['x']),
+            execution(2, ok=['y'], failed=['x', 'z'])]
+    runs += [execution(4, failed=['w']) for _ in range(3)]
+    # x, y and z all failed 2 of 3 runs; z is failing now twice in a row, x once, y recovered
+    names = [n['node'] for n in rms.node_reliability(runs, limit=3)['worst_nodes']]
+    assert names == ['w', 'z', 'x']
+
+
+def test_client_aggregates_every_project(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    monkeypatch.setattr(client, 'get_projects', lambda: [{'name': 'p'}, {'name': 'q'}])
+    monkeypatch.setattr(client, 'get_all_executions', lambda project, **kwargs: [
+        execution(i, failed=['shared'], project=project) for i in range(2)])
+    result = client.get_node_reliability(min_executions=1)
+    assert result['project'] == 'all projects' and result['projects_analyzed'] == 2
+    assert result['worst_nodes'][0]['executions'] == 4
+    assert result['worst_nodes'][0]['projects'] == ['p', 'q']
@@ -0,0 +1,107 @@
+"""Adaptive execution page sizing"""
+
+import pytest
+import requests
+
+import rundeck_mcp_server as rms
+
+
+def sizer(**kwargs):
+    settings = dict(floor=20, ceiling=1000, initial=100, target_seconds=2.0, target_bytes=1_000_000)
+    settings.update(kwargs)
+    return rms.PageSizer(**settings)
+
+
+def test_initial_size_is_clamped():
+    assert sizer(initial=5).next_size() == 20
+    assert sizer(initial=5000).next_size() == 1000
+    assert rms.PageSizer(floor=0, ceiling=0, initial=0).next_size() == 1
+
+
+def test_fast_small_pages_grow_at_most_2x_per_page():
+    pages = sizer()
+    sizes = []
+    for _ in range(5):
+        size = pages.next_size()
+        pages.observe(size, size, 0.001 * size, 100 * size)
+        sizes.append(pages.next_size())
+    # 1 ms/row targets 2000 rows, capped at the 1000-row ceiling
+    assert sizes == [200, 400, 800, 1000, 1000]
+
+
+def test_slow_rows_aim_at_the_latency_target():
+    pages = sizer()
+    pages.observe(100, 100, 10.0, 10_000)
+    assert pages.next_size() == 20  # 100 ms/row -> 20 rows within 2 s, also the floor
+    pages = sizer()
+    pages.observe(100, 100, 0.5, 10_000)
+    assert pages.next_size() == 200
+    pages = sizer(initial=400)
+    pages.observe(400, 400, 2.0, 40_000)
+    assert pages.next_size() == 400
+
+
+def test_large_rows_aim_at_the_byte_target():
+    pages = sizer(initial=400)
+    pages.observe(400, 400, 0.01, 400 * 5000)
+    assert pages.next_size() == 200
+    assert pages.stats()['bytes_per_row'] == 5000
+
+
+def test_averages_are_smoothed():
+    pages = sizer(initial=200)
+    pages.observe(200, 200, 0.2, 0)
+    pages.observe(200, 200, 2.0, 0)
+    # 0.3 * 10 ms + 0.7 * 1 ms = 3.7 ms/row
+    assert pages.stats()['ms_per_row'] == pytest.approx(3.7)
+    # 540 rows would meet the target, but growth is capped at twice the last page
+    assert pages.next_size() == 400
+
+
+def test_short_final_pages_are_ignored():
+    pages = sizer()
+    pages.observe(100, 5, 10.0, 1000)
+    pages.observe(100, 0, 0.0, 0)
+    assert pages.next_size() == 100 and pages.stats()['ms_per_row'] is None
+
+
+def test_shrink_halves_down_to_the_floor():
+    pages = sizer(initial=100)
+    assert pages.shrink() and pages.next_size() == 50
+    assert pages.shrink(30) and pages.next_size() == 20
+    assert not pages.shrink()
+    assert pages.stats()['timeouts'] == 3
+
+
+def test_get_all_executions_retries_a_timed_out_page_smaller(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    client.page_sizer = sizer(initial=200)
+    rows = [{'id': i} for i in range(250)]
+    requested = []
+
+    def get_executions(project, max_results, status, user, job_id, recent_filter, offset, retry_timeouts):
+        requested.append((offset, max_results, retry_timeouts))
+        if max_results > 100:
+            raise requests.exceptions.ReadTimeout('slow')
+        page = rows[offset:offset + max_results]
+        return {'executions': page, 'total': len(rows), 'hasMore': offset + len(page) < len(rows)}
+    monkeypatch.setattr(client, 'get_executions', get_executions)
+
+    assert client.get_all_executions('p', max_total=250, refresh=True) == rows
+    # Each timed-out page is re-requested at half its size from the same offset
+    assert requested == [(0, 200, False), (0, 100, False), (100, 150, False), (100, 75, False), (175, 75, False)]
+
+
+def test_timeout_at_the_floor_is_raised(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    client.page_sizer = sizer(initial=20)
+    calls = []
+
+    def get_executions(*args, retry_timeouts):
+        calls.append(retry_timeouts)
+        raise requests.exceptions.ReadTimeout('slow')
+    monkeypatch.setattr(client, 'get_executions', get_executions)
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get_all_executions('p', max_total=100, refresh=True)
+    # A floor-sized page is allowed the request-level timeout retries
+    assert calls == [True]
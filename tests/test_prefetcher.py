@@ -0,0 +1,75 @@
+"""Background warming of hot projects"""
+
+import threading
+
+import rundeck_mcp_server as rms
+
+
+class FakeClient:
+    def __init__(self, fail_projects=False, fail_jobs=()):
+        self.fail_projects = fail_projects
+        self.fail_jobs = fail_jobs
+        self.calls = []
+        self.lanes = []
+        self.fetched = threading.Event()
+
+    def get_projects(self, refresh=False):
+        self.calls.append(('projects', refresh))
+        if self.fail_projects:
+            raise ConnectionError('down')
+        return []
+
+    def get_jobs(self, project, refresh=False):
+        self.calls.append(('jobs', project, refresh))
+        if project in self.fail_jobs:
+            raise ValueError('forbidden')
+        return []
+
+    def get_all_executions(self, project, max_total, recent_filter, refresh):
+        self.calls.append(('executions', project, max_total, recent_filter, refresh))
+        self.lanes.append(rms.current_lane.get())
+        self.fetched.set()
+        return []
+
+
+def use_clients(monkeypatch, clients):
+    monkeypatch.setattr(rms, 'get_rundeck_client', lambda server_name=None: clients[server_name])
+
+
+def test_targets_are_grouped_by_server_and_refreshed(monkeypatch):
+    clients = {None: FakeClient(), 'eu': FakeClient()}
+    use_clients(monkeypatch, clients)
+    prefetcher = rms.Prefetcher(['ops', 'eu:billing', 'web', 'eu:ops'], days=2, max_executions=300)
+    assert dict(prefetcher.targets) == {None: ['ops', 'web'], 'eu': ['billing', 'ops']}
+    prefetcher.refresh()
+    assert clients[None].calls == [
+        ('projects', True),
+        ('jobs', 'ops', True), ('executions', 'ops', 300, '2d', True),
+        ('jobs', 'web', True), ('executions', 'web', 300, '2d', True)]
+    assert [call[1] for call in clients['eu'].calls if call[0] == 'jobs'] == ['billing', 'ops']
+    stats = prefetcher.stats()
+    assert stats['runs'] == 1 and stats['errors'] == 0 and stats['last_run_seconds'] is not None
+
+
+def test_failures_are_counted_and_other_projects_still_warmed(monkeypatch):
+    clients = {None: FakeClient(fail_jobs=('ops',)), 'eu': FakeClient(fail_projects=True)}
+    use_clients(monkeypatch, clients)
+    prefetcher = rms.Prefetcher(['ops', 'web', 'eu:billing'])
+    prefetcher.refresh()
+    assert ('executions', 'web') in [call[:2] for call in clients[None].calls]
+    assert not any(call[0] == 'jobs' for call in clients['eu'].calls)
+    stats = prefetcher.stats()
+    assert stats['errors'] == 2 and stats['last_error'] == 'eu: down' and stats['runs'] == 1
+
+
+def test_background_thread_uses_the_bulk_lane(monkeypatch):
+    client = FakeClient()
+    use_clients(monkeypatch, {None: client})
+    prefetcher = rms.Prefetcher(['ops'], interval_seconds=60)
+    prefetcher.start()
+    try:
+        assert client.fetched.wait(5)
+    finally:
+        prefetcher.stop()
+    assert client.lanes == ['bulk']
+    assert rms.current_lane.get() == 'interactive'
@@ -0,0 +1,74 @@
+"""Opt-in cProfile/tracemalloc profiling of tool calls"""
+
+import asyncio
+import pstats
+import tracemalloc
+
+import pytest
+from mcp.types import TextContent
+
+import rundeck_mcp_server as rms
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    """Replace execute_tool, recording the arguments each call is dispatched with"""
+    calls = []
+
+    def execute_tool(name, arguments):
+        calls.append((name, arguments))
+        if arguments.get('fail'):
+            raise RuntimeError('tool failed')
+        rows = [{'id': i, 'text': 'x' * 50} for i in range(2000)]
+        return [TextContent(type='text', text=f'{name}: {len(rows)} rows')]
+    monkeypatch.setattr(rms, 'execute_tool', execute_tool)
+    return calls
+
+
+def call(name, arguments):
+    return asyncio.run(rms.handle_call_tool(name, arguments))
+
+
+def profile_files(directory):
+    return sorted(path.name.split('-', 3)[-1] for path in directory.iterdir())
+
+
+def test_profile_argument_writes_reports_and_passes_the_result_through(dispatched, monkeypatch, tmp_path):
+    monkeypatch.setattr(rms, 'PROFILE_DIR', str(tmp_path / 'profiles'))
+    monkeypatch.setattr(rms, 'PROFILE_TOOLS', set())
+    result = call('get_projects', {'server': 'eu', 'profile': True})
+
+    assert dispatched == [('get_projects', {'server': 'eu'})]
+    assert result[0].text == 'get_projects: 2000 rows'
+    assert result[1].text.startswith('🔬 Profile of get_projects:')
+    assert 'Top functions by own time:' in result[1].text and 'Top allocation sites:' in result[1].text
+    assert profile_files(tmp_path / 'profiles') == ['get_projects-allocations.txt', 'get_projects.prof']
+    [prof] = (tmp_path / 'profiles').glob('*.prof')
+    functions = {function for _, _, function in pstats.Stats(str(prof)).stats}
+    assert 'execute_tool' in functions
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.parametrize('tools, profiled', [({'get_projects'}, True), ({'*'}, True), ({'get_jobs'}, False)])
+def test_profile_tools_setting(dispatched, monkeypatch, tmp_path, tools, profiled):
+    monkeypatch.setattr(rms, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setattr(rms, 'PROFILE_TOOLS', tools)
+    result = call('get_projects', {})
+    assert len(result) == (2 if profiled else 1)
+    assert bool(list(tmp_path.iterdir())) == profiled
+
+
+def test_profile_argument_is_stripped_when_profiling_is_disabled(dispatched, monkeypatch):
+    monkeypatch.setattr(rms, 'PROFILE_DIR', None)
+    monkeypatch.setattr(rms, 'PROFILE_TOOLS', {'*'})
+    result = call('get_projects', {'profile': True})
+    assert dispatched == [('get_projects', {})]
+    assert [content.text for content in result] == ['get_projects: 2000 rows']
+
+
+def test_failing_tool_call_stops_tracing_and_raises(dispatched, monkeypatch, tmp_path):
+    monkeypatch.setattr(rms, 'PROFILE_DIR', str(tmp_path))
+    with pytest.raises(RuntimeError):
+        rms.profile_tool_call(rms.execute_tool, 'get_projects', {'fail': True})
+    assert not tracemalloc.is_tracing()
+    assert not rms.profile_lock.locked()
@@ -0,0 +1,67 @@
+"""Project-wide ROI ranking from one execution fetch"""
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+JOBS = [{'id': 'backup', 'name': 'Backup', 'group': 'ops'},
+        {'id': 'report', 'name': 'Report'},
+        {'id': 'broken', 'name': 'Broken'},
+        {'id': 'idle', 'name': 'Idle'}]
+
+
+def execution(job_id, status, minutes, index=0):
+    started = f'2025-11-03T{index:02d}:00:00Z'
+    ended = f'2025-11-03T{index:02d}:{minutes:02d}:00Z'
+    return {'id': f'{job_id}-{index}', 'status': status, 'job': {'id': job_id, 'name': job_id.title()},
+            'date-started': {'date': started}, 'date-ended': {'date': ended}}
+
+
+EXECUTIONS = [
+    execution('backup', 'succeeded', 30, 0), execution('backup', 'succeeded', 30, 1),
+    execution('backup', 'failed', 6, 2),
+    execution('report', 'succeeded', 6, 3),
+    execution('broken', 'failed', 30, 4), execution('broken', 'failed', 30, 5),
+    execution('deleted', 'succeeded', 12, 6),
+    {'id': 'adhoc', 'status': 'succeeded'},
+]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    monkeypatch.setattr(client, 'get_jobs', lambda project, *args, **kwargs: JOBS)
+    monkeypatch.setattr(client, 'get_job_definition', lambda job_id, project=None: {'name': job_id.title()})
+
+    def get_all_executions(project, max_total=1000, job_id=None, **kwargs):
+        return [ex for ex in EXECUTIONS if job_id is None or (ex.get('job') or {}).get('id') == job_id]
+    monkeypatch.setattr(client, 'get_all_executions', get_all_executions)
+    return client
+
+
+def test_ranking_and_totals(client):
+    result = client.calculate_project_roi('p', cost_per_hour=100)
+    assert [(r['rank'], r['job_id'], r['net_value']) for r in result['jobs']] == [
+        (1, 'backup', 90.0), (2, 'report', 90.0), (3, 'deleted', 80.0), (4, 'broken', -100.0), (5, 'idle', 0)]
+    assert result['jobs'][-1]['total_executions'] == 0 and result['jobs_without_executions'] == 1
+    assert result['jobs'][0]['group'] == 'ops' and result['jobs'][0]['success_rate_percent'] == 66.67
+    assert result['total_executions'] == len(EXECUTIONS)
+    assert result['net_value'] == 160.0
+
+
+def test_overrides_by_id_or_name(client):
+    result = client.calculate_project_roi('p', cost_per_hour=100, manual_hours_per_run=0.5,
+                                          manual_hours_overrides={'broken': 3, 'Report': 2})
+    by_id = {r['job_id']: r for r in result['jobs']}
+    assert by_id['report']['manual_hours_per_run'] == 2.0
+    assert by_id['backup']['manual_hours_per_run'] == 0.5
+    assert by_id['broken']['estimated_value_saved'] == 0
+
+
+@pytest.mark.parametrize('job_id', ['backup', 'report', 'broken'])
+def test_rows_match_calculate_job_roi(client, job_id):
+    row = next(r for r in client.calculate_project_roi('p', cost_per_hour=80)['jobs'] if r['job_id'] == job_id)
+    single = client.calculate_job_roi('p', job_id, cost_per_hour=80)
+    for key in ('total_executions', 'successful_executions', 'failed_executions', 'success_rate_percent',
+                'total_execution_hours', 'total_execution_cost', 'estimated_value_saved', 'roi_percentage'):
+        assert row[key] == single[key], key
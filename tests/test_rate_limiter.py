@@ -0,0 +1,48 @@
+"""Per-server request rate limiting with a bulk share"""
+
+import time
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+
+@pytest.mark.parametrize('rate, share', [(10, 0), (10, -0.5), (10, 1.5), (-1, 0.5)])
+def test_settings_that_would_stall_are_rejected(rate, share):
+    with pytest.raises(ValueError):
+        rms.validate_rate_limits(rate, share)
+    with pytest.raises(ValueError):
+        rms.RequestRateLimiter(rate, share)
+
+
+def test_share_is_ignored_without_a_rate_limit():
+    limiter = rms.RequestRateLimiter(0, 0)
+    started = time.monotonic()
+    for _ in range(100):
+        limiter.acquire('bulk')
+    assert time.monotonic() - started < 0.1
+    assert not limiter.enabled
+
+
+def test_bulk_requests_are_held_to_their_share():
+    limiter = rms.RequestRateLimiter(20, 0.25)
+    started = time.monotonic()
+    for _ in range(5):
+        limiter.acquire('bulk')
+    # 5 bulk requests/s with a burst of 5: the sixth waits for a refill
+    assert time.monotonic() - started < 0.1
+    limiter.acquire('bulk')
+    assert time.monotonic() - started >= 0.15
+    assert limiter.stats()['throttled_requests']['bulk'] >= 1
+
+
+def test_interactive_requests_are_not_held_by_the_bulk_share():
+    limiter = rms.RequestRateLimiter(20, 0.25)
+    for _ in range(5):
+        limiter.acquire('bulk')
+    started = time.monotonic()
+    for _ in range(10):
+        limiter.acquire('interactive')
+    # Only the overall bucket applies: roughly 10 tokens left or refilled within 0.5s
+    assert time.monotonic() - started < 0.6
+    assert limiter.stats()['bulk_requests_per_second'] == 5.0
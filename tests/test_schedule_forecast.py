@@ -0,0 +1,193 @@
+"""Quartz cron evaluation and the scheduled-load forecast sweep"""
+
+import random
+from datetime import date, datetime, timezone as dt_timezone
+
+import pytest
+from dateutil import tz
+
+import rundeck_mcp_server as rms
+
+NEW_YORK = tz.gettz('America/New_York')
+UTC = dt_timezone.utc
+
+
+def local(zone, *args):
+    return datetime(*args, tzinfo=zone).timestamp()
+
+
+def matching_days(expression, year, month):
+    cron = rms.CronSchedule(expression)
+    days = [date(year, month, d) for d in range(1, 32) if _valid(year, month, d)]
+    return [d.day for d in days if cron.matches_day(d)]
+
+
+def _valid(year, month, day):
+    try:
+        date(year, month, day)
+        return True
+    except ValueError:
+        return False
+
+
+def test_parse_cron_field_lists_ranges_steps_and_names():
+    assert rms.parse_cron_field('*', 0, 5) == {0, 1, 2, 3, 4, 5}
+    assert rms.parse_cron_field('1,3-4', 0, 59) == {1, 3, 4}
+    assert rms.parse_cron_field('0/20', 0, 59) == {0, 20, 40}
+    assert rms.parse_cron_field('10-30/10', 0, 59) == {10, 20, 30}
+    assert rms.parse_cron_field('FRI-MON', 1, 7, rms.CRON_WEEKDAYS) == {6, 7, 1, 2}
+    assert rms.parse_cron_field('nov-feb', 1, 12, rms.CRON_MONTHS) == {11, 12, 1, 2}
+
+
+@pytest.mark.parametrize('text', ['60', '5-61', '*/0', 'FOO'])
+def test_parse_cron_field_rejects_bad_values(text):
+    with pytest.raises(ValueError):
+        rms.parse_cron_field(text, 0, 59)
+
+
+def test_last_day_and_offsets():
+    assert matching_days('0 0 0 L * ?', 2024, 2) == [29]
+    assert matching_days('0 0 0 L * ?', 2025, 2) == [28]
+    assert matching_days('0 0 0 L-2 * ?', 2025, 4) == [28]
+
+
+def test_nearest_weekday_stays_in_month():
+    # 2025-03-01 is a Saturday: 1W moves forward to Monday the 3rd
+    assert matching_days('0 0 0 1W * ?', 2025, 3) == [3]
+    # 2025-08-31 is a Sunday: 31W moves back to Friday the 29th
+    assert matching_days('0 0 0 31W * ?', 2025, 8) == [29]
+    # 2025-06-15 is a Sunday: 15W is Monday the 16th
+    assert matching_days('0 0 0 15W * ?', 2025, 6) == [16]
+    # 31W in a 30-day month targets the 30th (2025-04-30 is a Wednesday)
+    assert matching_days('0 0 0 31W * ?', 2025, 4) == [30]
+    # LW: 2025-05-31 is a Saturday, so the last weekday is Friday the 30th
+    assert matching_days('0 0 0 LW * ?', 2025, 5) == [30]
+
+
+def test_last_and_nth_weekday_of_month():
+    # Last Friday of October 2025 is the 31st
+    assert matching_days('0 0 0 ? * 6L', 2025, 10) == [31]
+    assert matching_days('0 0 0 ? * FRIL', 2025, 10) == [31]
+    # Second Monday of November 2025 is the 10th
+    assert matching_days('0 0 0 ? * MON#2', 2025, 11) == [10]
+    assert matching_days('0 0 0 ? * 2#5', 2025, 11) == []
+    assert matching_days('0 0 0 ? * L', 2025, 11) == [1, 8, 15, 22, 29]
+
+
+def test_months_years_and_weekday_lists():
+    assert matching_days('0 0 0 ? * MON-FRI', 2025, 11)[:3] == [3, 4, 5]
+    assert matching_days('0 0 0 1 JAN ? 2026', 2025, 1) == []
+    assert matching_days('0 0 0 1 JAN ? 2026', 2026, 1) == [1]
+
+
+@pytest.mark.parametrize('expression', [
+    '0 0 0 32W * ?', '0 0 0 0W * ?', '0 0 0 L-31 * ?', '0 0 0 LX * ?', '0 0 0 ? * 2#6',
+    '0 0 0 ? * 2#0', '0 0 0 * *', '0 61 0 * * ?', '0 0 0 ? * 8'
+])
+def test_invalid_expressions_raise_value_error(expression):
+    with pytest.raises(ValueError):
+        rms.CronSchedule(expression)
+
+
+def test_firings_within_window_and_limit():
+    cron = rms.CronSchedule('0 0/30 9-10 ? * MON-FRI')
+    # 2025-11-07 is a Friday; the window ends Monday 10:00
+    times = cron.firings(local(UTC, 2025, 11, 7, 9, 30), local(UTC, 2025, 11, 10, 10, 0), UTC)
+    assert [datetime.fromtimestamp(t, UTC).strftime('%a %H:%M') for t in times] == [
+        'Fri 09:30', 'Fri 10:00', 'Fri 10:30', 'Mon 09:00', 'Mon 09:30']
+    assert len(cron.firings(local(UTC, 2025, 1, 1), local(UTC, 2026, 1, 1), UTC, limit=7)) == 7
+
+
+def test_firings_follow_wall_clock_across_spring_forward():
+    cron = rms.CronSchedule('0 30 1,2,3,12 * * ?')
+    times = cron.firings(local(NEW_YORK, 2026, 3, 8), local(NEW_YORK, 2026, 3, 9), NEW_YORK)
+    wall = [datetime.fromtimestamp(t, NEW_YORK).strftime('%H:%M%z') for t in times]
+    # 02:30 does not exist and moves to 03:30, which fires once
+    assert wall == ['01:30-0500', '03:30-0400', '12:30-0400']
+
+
+def test_firings_follow_wall_clock_across_fall_back():
+    cron = rms.CronSchedule('0 30 1,12 * * ?')
+    times = cron.firings(local(NEW_YORK, 2026, 11, 1), local(NEW_YORK, 2026, 11, 2), NEW_YORK)
+    wall = [datetime.fromtimestamp(t, NEW_YORK).strftime('%H:%M%z') for t in times]
+    # 01:30 happens twice and fires at its first occurrence
+    assert wall == ['01:30-0400', '12:30-0500']
+
+
+def test_rundeck_schedule_cron_forms():
+    assert rms.rundeck_schedule_cron({'crontab': '0 0 12 ? * MON'}) == '0 0 12 ? * MON'
+    assert rms.rundeck_schedule_cron({
+        'time': {'hour': '3', 'minute': '15', 'seconds': '0'}, 'month': '*',
+        'weekday': {'day': 'MON,WED'}, 'year': '*'
+    }) == '0 15 3 ? * MON,WED *'
+    assert rms.rundeck_schedule_cron({
+        'time': {'hour': '4', 'minute': '0'}, 'dayofmonth': {'day': 'L'}, 'month': '*'
+    }) == '0 0 4 L * ? *'
+
+
+def job(name, expression, duration, multiple=True, zone=UTC):
+    return {'id': name, 'name': name, 'project': 'p', 'cron': rms.CronSchedule(expression),
+            'timezone': zone, 'duration_seconds': duration, 'multiple_executions': multiple,
+            'duration_source': 'history'}
+
+
+def test_overlapping_runs_are_skipped_unless_multiple_executions():
+    start = local(UTC, 2025, 11, 3)
+    jobs = [job('single', '0 0/10 * * * ?', 1500, multiple=False),
+            job('multi', '0 0/10 * * * ?', 1500, multiple=True)]
+    result = rms.schedule_load_forecast(jobs, start, start + 3600, 900)
+    by_name = {j['job_name']: j for j in result['busiest_jobs']}
+    # Single: fires :00, then :30 (busy until :25); :10 and :20, :40 and :50 are skipped
+    assert by_name['single']['firings'] == 2
+    assert by_name['single']['skipped_while_running'] == 4
+    assert by_name['multi']['firings'] == 6
+    assert result['peak_concurrency'] == 4
+
+
+def brute_force(jobs, start, end, bucket_seconds):
+    intervals = []
+    for j in jobs:
+        busy_until = float('-inf')
+        for fired in j['cron'].firings(start, end, j['timezone']):
+            if not j['multiple_executions'] and fired < busy_until:
+                continue
+            busy_until = fired + max(j['duration_seconds'], 1.0)
+            intervals.append((fired, min(busy_until, end)))
+    grid_start = start - start % bucket_seconds
+    buckets = {}
+    low = grid_start
+    while low < end:
+        lo, hi = max(low, start), min(low + bucket_seconds, end)
+        points = [lo] + [b for b, _ in intervals if lo <= b < hi] + [f for _, f in intervals if lo <= f < hi]
+        peak = max(sum(1 for b, f in intervals if b <= t < f) for t in points)
+        area = sum(max(0.0, min(f, hi) - max(b, lo)) for b, f in intervals)
+        firings = sum(1 for b, _ in intervals if low <= b < low + bucket_seconds)
+        if firings or peak:
+            buckets[datetime.fromtimestamp(low).astimezone().isoformat(timespec='seconds')] = {
+                'firings': firings, 'peak_concurrency': peak, 'expected_concurrency': round(area / (hi - lo), 2)}
+        low += bucket_seconds
+    return buckets
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_forecast_buckets_match_brute_force(seed):
+    rng = random.Random(seed)
+    start = local(UTC, 2025, 11, 3, rng.randrange(24), rng.randrange(60), rng.randrange(60))
+    end = start + rng.choice([2, 6, 12]) * 3600
+    expressions = ['0 0/5 * * * ?', '0 0 * * * ?', '30 15 */2 * * ?', '0 0/7 8-20 ? * MON-FRI',
+                   '0 0,1,2 * * * ?', '0 59 23 * * ?']
+    jobs = [job(f'j{i}', rng.choice(expressions), rng.choice([1, 60, 299, 300, 900, 5000]),
+                multiple=rng.random() < 0.5) for i in range(rng.randint(1, 12))]
+    bucket_seconds = rng.choice([300, 900, 3600])
+    result = rms.schedule_load_forecast(jobs, start, end, bucket_seconds, top=50)
+    assert {b['start']: {k: b[k] for k in ('firings', 'peak_concurrency', 'expected_concurrency')}
+            for b in result['buckets']} == brute_force(jobs, start, end, bucket_seconds)
+
+
+def test_firings_are_shared_between_jobs_with_the_same_expression():
+    start = local(UTC, 2025, 11, 3)
+    jobs = [job(f'j{i}', '0 0 * * * ?', 60) for i in range(100)]
+    result = rms.schedule_load_forecast(jobs, start, start + 86400, 3600)
+    assert result['firings'] == 2400
+    assert result['peak_concurrency'] == 100
+    assert result['hot_spots'][0]['peak_concurrency'] == 100
@@ -0,0 +1,110 @@
+"""Server registry file loading, reloading and lazy clients"""
+
+import json
+import os
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    for key in list(os.environ):
+        if key.startswith(('RUNDECK_URL', 'RUNDECK_API_TOKEN', 'RUNDECK_NAME')):
+            monkeypatch.delenv(key)
+    path = tmp_path / 'servers.json'
+    monkeypatch.setattr(rms, 'SERVERS_FILE', str(path))
+    monkeypatch.setattr(rms, 'REGISTRY_CHECK_SECONDS', 0)
+    monkeypatch.setattr(rms, 'server_configs', {})
+    monkeypatch.setattr(rms, 'default_server_name', None)
+    monkeypatch.setattr(rms, 'rundeck_clients', {})
+    monkeypatch.setattr(rms, 'client_last_used', {})
+    monkeypatch.setattr(rms, 'registry_file_mtime', None)
+    monkeypatch.setattr(rms, 'registry_last_checked', 0.0)
+    version = [1_000_000_000]
+
+    def write(text):
+        path.write_text(text)
+        version[0] += 10
+        os.utime(path, (version[0], version[0]))
+
+    return write
+
+
+def servers_json(*names, default=None):
+    return json.dumps({'default': default, 'servers': [
+        {'name': name, 'url': f'http://{name}.example:4440', 'token': 't'} for name in names
+    ]})
+
+
+def test_registry_servers_and_default(registry):
+    registry(servers_json('a', 'b', default='b'))
+    rms.load_server_configs()
+    assert rms.list_rundeck_servers() == ['a', 'b']
+    assert rms.get_rundeck_client().base_url == 'http://b.example:4440'
+
+
+def test_mapping_form_and_token_env(registry, monkeypatch):
+    monkeypatch.setenv('PROD_TOKEN', 'secret')
+    registry(json.dumps({'servers': {'prod': {'url': 'http://prod:4440', 'token_env': 'PROD_TOKEN'},
+                                     'incomplete': {'url': 'http://x:4440'}}}))
+    rms.load_server_configs()
+    assert rms.server_configs == {'prod': {'url': 'http://prod:4440', 'token': 'secret', 'api_version': '47'}}
+
+
+def test_changed_registry_is_reloaded_and_changed_clients_dropped(registry):
+    registry(servers_json('a', 'b'))
+    rms.load_server_configs()
+    client_a = rms.get_rundeck_client('a')
+    client_b = rms.get_rundeck_client('b')
+    registry(json.dumps({'servers': [{'name': 'a', 'url': 'http://a.example:4440', 'token': 't'},
+                                     {'name': 'b', 'url': 'http://b2.example:4440', 'token': 't'},
+                                     {'name': 'c', 'url': 'http://c.example:4440', 'token': 't'}]}))
+    assert rms.list_rundeck_servers() == ['a', 'b', 'c']
+    assert rms.get_rundeck_client('a') is client_a
+    assert rms.get_rundeck_client('b') is not client_b
+
+
+@pytest.mark.parametrize('broken', ['{"servers": [{"name": "a", "url"', '[1, 2]', '{"servers": [1]}',
+                                    '{"servers": {"a": "http://a"}}'])
+def test_broken_registry_keeps_last_good_configuration(registry, broken):
+    registry(servers_json('a', 'b'))
+    rms.load_server_configs()
+    client_a = rms.get_rundeck_client('a')
+    registry(broken)
+    assert rms.list_rundeck_servers() == ['a', 'b']
+    assert rms.get_rundeck_client('a') is client_a
+    # Fixed without another mtime change in between: still picked up
+    registry(servers_json('b'))
+    assert rms.list_rundeck_servers() == ['b']
+
+
+def test_broken_registry_is_retried_until_it_loads(registry, tmp_path):
+    registry(servers_json('a'))
+    rms.load_server_configs()
+    registry('{')
+    assert rms.list_rundeck_servers() == ['a']
+    mtime = os.path.getmtime(rms.SERVERS_FILE)
+    (tmp_path / 'servers.json').write_text(servers_json('a', 'z'))
+    os.utime(rms.SERVERS_FILE, (mtime, mtime))
+    assert rms.list_rundeck_servers() == ['a', 'z']
+
+
+def test_broken_registry_at_startup_falls_back_to_environment(registry, monkeypatch):
+    monkeypatch.setenv('RUNDECK_URL', 'http://env.example:4440')
+    monkeypatch.setenv('RUNDECK_API_TOKEN', 't')
+    registry('not json')
+    rms.load_server_configs()
+    assert rms.list_rundeck_servers() == ['default']
+
+
+def test_idle_clients_are_evicted(registry, monkeypatch):
+    registry(servers_json('a'))
+    rms.load_server_configs()
+    client = rms.get_rundeck_client('a')
+    monkeypatch.setattr(rms, 'CLIENT_IDLE_SECONDS', -1)
+    rms.refresh_server_registry()
+    assert 'a' not in rms.rundeck_clients
+    monkeypatch.setattr(rms, 'CLIENT_IDLE_SECONDS', 900)
+    assert rms.get_rundeck_client('a') is not client
@@ -0,0 +1,100 @@
+"""SQLite cache shared between server processes"""
+
+import os
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_800_000_000.0]
+    monkeypatch.setattr(rms.time, 'time', lambda: now[0])
+    return now
+
+
+def test_round_trip_and_expiry(tmp_path, clock):
+    cache = rms.SharedCache(str(tmp_path), 1 << 20)
+    value = {'projects': [{'name': 'ops', 'description': 'café'}], 'n': 3}
+    cache.put('k', value)
+    assert cache.get('k', 60) == value
+    clock[0] += 61
+    assert cache.get('k', 60) is None
+    assert cache.get('missing', 60) is None
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 2)
+
+
+def test_keys_lists_fresh_entries_under_a_prefix(tmp_path, clock):
+    cache = rms.SharedCache(str(tmp_path), 1 << 20)
+    cache.put('executions|a|p|1', 1)
+    clock[0] += 100
+    assert cache.put('executions|a|p|2', 2) == clock[0]
+    cache.put('executions|a|q|1', 3)
+    cache.put('executions|a|pp|1', 4)
+    assert cache.keys('executions|a|p|', 50) == [('executions|a|p|2', clock[0])]
+
+
+def blob():
+    # Random hex barely compresses, so every blob stores at about the same size
+    return [os.urandom(8).hex() for _ in range(60)]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    size = len(rms.zlib.compress(rms.json_bytes(blob())))
+    cache = rms.SharedCache(str(tmp_path), int(size * 2.5))
+    cache.put('a', blob())
+    clock[0] += 1
+    cache.put('b', blob())
+    clock[0] += 1
+    assert cache.get('a', 60) is not None
+    clock[0] += 1
+    cache.put('c', blob())
+    assert cache.get('b', 60) is None
+    assert cache.get('a', 60) is not None and cache.get('c', 60) is not None
+    assert cache.stats()['entries'] == 2
+
+
+def test_hits_write_their_access_time_with_the_next_store(tmp_path, clock):
+    cache = rms.SharedCache(str(tmp_path), 1 << 20)
+    cache.put('a', 1)
+    changes = cache._conn.total_changes
+    clock[0] += 5
+    for _ in range(10):
+        assert cache.get('a', 60) == 1
+    assert cache._conn.total_changes == changes
+
+    def accessed_at():
+        return cache._conn.execute("SELECT accessed_at FROM entries WHERE key = 'a'").fetchone()[0]
+
+    assert accessed_at() == clock[0] - 5
+    cache.put('b', 2)
+    assert accessed_at() == clock[0]
+
+
+def test_value_larger_than_the_budget_is_not_stored(tmp_path):
+    cache = rms.SharedCache(str(tmp_path), 64)
+    cache.put('big', os.urandom(200).hex())
+    assert cache.get('big', 60) is None and cache.stats()['entries'] == 0
+
+
+def test_separate_connections_share_entries(tmp_path):
+    writer = rms.SharedCache(str(tmp_path), 1 << 20)
+    reader = rms.SharedCache(str(tmp_path), 1 << 20)
+    writer.put('jobs|x', [{'id': 'j'}])
+    assert reader.get('jobs|x', 60) == [{'id': 'j'}]
+    assert reader._conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_second_client_reads_the_project_list_from_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(rms, 'shared_cache', rms.SharedCache(str(tmp_path), 1 << 20))
+    first = rms.RundeckClient('http://rundeck.example:4440', 't')
+    calls = []
+    monkeypatch.setattr(first, '_make_request', lambda method, endpoint, **kwargs:
+                        calls.append(endpoint) or [{'name': 'ops'}])
+    assert first.get_projects() == [{'name': 'ops'}]
+
+    second = rms.RundeckClient('http://rundeck.example:4440', 't')
+    monkeypatch.setattr(second, '_make_request', lambda *args, **kwargs: pytest.fail('cache miss'))
+    assert second.get_projects() == [{'name': 'ops'}]
+    assert calls == ['projects']
@@ -0,0 +1,237 @@
+"""Incremental JSON decoding and restarts of streamed Rundeck responses"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import rundeck_mcp_server as rms
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def decode(data: bytes, size: int, array_key=None):
+    envelope = {}
+    items = list(rms.iter_json_items(iter(chunked(data, size)), array_key, envelope))
+    return items, envelope
+
+
+ENVELOPED = json.dumps({
+    "paging": {"count": 3, "total": 3, "offset": 0, "max": 20},
+    "executions": [
+        {"id": 1, "status": "succeeded", "description": "brackets ] } [ { and \"quotes\""},
+        {"id": 22, "argstring": "-name café ☃", "duration": 12345.678},
+        {"id": 333, "nested": {"list": [1, [2, [3]]], "empty": {}}}
+    ],
+    "trailer": 7
+}, ensure_ascii=False).encode('utf-8')
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 7, 64, 100000])
+def test_every_chunk_boundary_decodes_the_same(size):
+    expected = json.loads(ENVELOPED)
+    items, envelope = decode(ENVELOPED, size, 'executions')
+    assert items == expected['executions']
+    assert envelope == {"paging": expected['paging'], "trailer": 7}
+
+
+@pytest.mark.parametrize('size', [1, 2, 4])
+def test_numbers_split_across_chunks_are_not_cut_short(size):
+    items, _ = decode(b'[12345, -0.5e10, 7, true, null, "x"]', size)
+    assert items == [12345, -0.5e10, 7, True, None, "x"]
+
+
+def test_bare_array_and_empty_documents():
+    assert decode(b'', 1) == ([], {})
+    assert decode(b' \r\n', 1) == ([], {})
+    assert decode(b'  [ ]  ', 1) == ([], {})
+    assert decode(b'{}', 1) == ([], {})
+    assert decode(b'{"executions": []}', 3, 'executions') == ([], {})
+
+
+def test_array_key_that_is_not_an_array_goes_to_envelope():
+    assert decode(b'{"entries": null, "id": 3}', 2, 'entries') == ([], {"entries": None, "id": 3})
+
+
+@pytest.mark.parametrize('data', [b'[1, 2', b'[0.', b'{"executions": [{"id": 1}', b'[1 2]', b'{"a" 1}'])
+def test_truncated_or_malformed_input_raises(data):
+    with pytest.raises(json.JSONDecodeError):
+        decode(data, 1, 'executions')
+
+
+def test_elements_are_yielded_before_the_body_ends():
+    def chunks():
+        yield b'[{"id": 1}, '
+        raise AssertionError("read past the first element")
+    items = rms.iter_json_items(chunks())
+    assert next(items) == {"id": 1}
+
+
+class FlakyRundeck:
+    """Local HTTP server sending chunked JSON pages that can break off or stall mid-body"""
+
+    def __init__(self, rows: int):
+        self.body = self.page(range(rows))
+        self.plan = []
+        # Bodies served from the next request on, one per request
+        self.next_bodies = []
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                fake.requests.append(self.path)
+                action = fake.plan.pop(0) if fake.plan else 'ok'
+                body = fake.body
+                if fake.next_bodies:
+                    fake.body = fake.next_bodies.pop(0)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                half = len(body) // 2
+                for piece in chunked(body if action == 'ok' else body[:half], 1024):
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(piece), piece))
+                self.wfile.flush()
+                if action == 'stall':
+                    time.sleep(1.0)
+                if action == 'ok':
+                    self.wfile.write(b'0\r\n\r\n')
+                self.close_connection = True
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @staticmethod
+    def page(ids):
+        ids = list(ids)
+        return json.dumps({"paging": {"total": len(ids)},
+                           "executions": [{"id": i, "pad": "x" * 200} for i in ids]}).encode()
+
+
+@pytest.fixture
+def flaky():
+    fake = FlakyRundeck(200)
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
+
+
+@pytest.fixture
+def client(flaky, monkeypatch):
+    client = rms.RundeckClient(flaky.url, 't')
+    request = client.session.request
+    monkeypatch.setattr(client.session, 'request',
+                        lambda method, url, **kwargs: request(method, url, **{**kwargs, 'timeout': 0.3}))
+    return client
+
+
+def test_broken_body_is_restarted_without_duplicates(flaky, client):
+    flaky.plan = ['break', 'break']
+    result = client.get_executions('p', 200)
+    assert [e['id'] for e in result['executions']] == list(range(200))
+    assert len(flaky.requests) == 3
+
+
+def test_restart_after_the_list_shifted_skips_executions_by_id(flaky, client):
+    # Two executions start between the attempts and push the page down by two
+    flaky.plan = ['break']
+    flaky.next_bodies = [FlakyRundeck.page([-2, -1] + list(range(198)))]
+    ids = [e['id'] for e in client.get_executions('p', 200)['executions']]
+    assert len(ids) == len(set(ids)) == 200
+    assert set(ids) == set(range(198)) | {-2, -1}
+
+
+def test_empty_body_is_an_empty_page(flaky, client):
+    flaky.body = b''
+    assert client.get_executions('p', 200) == {'executions': [], 'total': 0, 'offset': 0, 'max': 200,
+                                               'hasMore': False}
+
+
+def test_broken_body_gives_up_after_three_attempts(flaky, client):
+    flaky.plan = ['break'] * 3
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get_executions('p', 200)
+
+
+def test_body_timeout_is_retried(flaky, client):
+    flaky.plan = ['stall']
+    assert len(client.get_executions('p', 200)['executions']) == 200
+    assert len(flaky.requests) == 2
+
+
+def test_body_timeout_raises_timeout_when_not_retrying(flaky, client):
+    flaky.plan = ['stall']
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get_executions('p', 200, retry_timeouts=False)
+    assert len(flaky.requests) == 1
+
+
+def test_body_timeout_shrinks_paged_fetches(flaky, client):
+    flaky.plan = ['stall']
+    executions = client.get_all_executions('p', max_total=200)
+    assert len(executions) == 200
+    assert client.page_sizer.stats()['timeouts'] == 1
+    assert 'max=200' in flaky.requests[0] and 'max=100' in flaky.requests[1]
+
+
+def test_stream_span_is_not_current_while_consuming(flaky, client, monkeypatch, tmp_path):
+    path = str(tmp_path / 'spans.jsonl')
+    monkeypatch.setattr(rms, 'tracer', rms.Tracer(rms.JsonLinesWriter(path)))
+    flaky.plan = ['break']
+    with rms.tracer.span('tool') as tool_span:
+        items = client._stream_items('GET', 'project/p/executions', 'executions')
+        for _ in items:
+            assert rms.tracer.current() is tool_span
+    spans = [line['resourceSpans'][0]['scopeSpans'][0]['spans'][0] for line in rms.read_json_lines(path)]
+    stream_span = next(span for span in spans if span['name'] == 'GET project/p/executions')
+    assert stream_span['parentSpanId'] == tool_span.span_id
+    attempts = [span for span in spans if span['name'].startswith('attempt')]
+    assert len(attempts) == 2
+    assert all(span['parentSpanId'] == stream_span['spanId'] for span in attempts)
+    attributes = {a['key']: a['value'] for a in stream_span['attributes']}
+    assert attributes['rundeck.items'] == {'intValue': '200'}
+    assert attributes['http.response_content_length'] == {'intValue': str(len(flaky.body))}
+
+
+def output_body(count, completed=True):
+    return json.dumps({"id": 1, "execCompleted": completed,
+                       "entries": [{"log": f"line {i}", "node": "web1"} for i in range(count)],
+                       "totalSize": count}).encode()
+
+
+def test_execution_output_is_paged(flaky, client):
+    flaky.body = output_body(25)
+    output = client.get_execution_output('1', offset=10, max_entries=5)
+    assert [e['log'] for e in output['entries']] == [f'line {i}' for i in range(10, 15)]
+    assert (output['entries_offset'], output['entries_total'], output['next_offset']) == (10, 25, 15)
+    assert output['execCompleted'] is True and output['totalSize'] == 25
+    last = client.get_execution_output('1', offset=20, max_entries=10)
+    assert len(last['entries']) == 5 and 'next_offset' not in last
+
+
+def test_completed_output_is_archived_while_streaming(flaky, client, monkeypatch, tmp_path):
+    monkeypatch.setattr(rms, 'log_archive', rms.ExecutionLogArchive(str(tmp_path), 1 << 26))
+    flaky.body = output_body(3000)
+    assert client.get_failure_lines('1') == ['line 2997', 'line 2998', 'line 2999']
+    served = len(flaky.requests)
+    output = client.get_execution_output('1', max_entries=2)
+    assert len(flaky.requests) == served
+    assert output['entries_total'] == 3000 and output['entries'][1]['log'] == 'line 1'
+    assert rms.log_archive.search(client.base_url, '"line 2500"')['executions_matched'] == 1
+
+    flaky.body = output_body(3, completed=False)
+    client.get_execution_output('2')
+    assert rms.log_archive.read(client.base_url, '2') is None
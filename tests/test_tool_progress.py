@@ -0,0 +1,77 @@
+"""Progress notifications and cancellation of long-running tool calls"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import rundeck_mcp_server as rms
+
+
+class Session:
+    def __init__(self):
+        self.notifications = []
+
+    async def send_progress_notification(self, token, progress, total=None, message=None,
+                                         related_request_id=None):
+        self.notifications.append((token, progress, total, message, related_request_id))
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_reports_are_sent_monotonically(loop):
+    session = Session()
+    progress = rms.ToolProgress(loop, session, 'tok', 7)
+    progress.report(10, 100, 'ten')
+    progress.report(5, 100, 'five')
+    progress.report(20, 100)
+    time.sleep(0.1)
+    assert [n[1] for n in session.notifications] == [10, 10, 20]
+    assert session.notifications[0] == ('tok', 10, 100, 'ten', 7)
+
+
+def test_reports_without_a_progress_token_are_dropped(loop):
+    session = Session()
+    rms.ToolProgress(loop, session, None).report(1, 2)
+    time.sleep(0.05)
+    assert session.notifications == []
+
+
+def test_cancellation_interrupts_waits():
+    progress = rms.ToolProgress()
+    progress.check_cancelled()
+    threading.Timer(0.05, progress.cancel).start()
+    started = time.monotonic()
+    with pytest.raises(rms.OperationCancelled):
+        progress.wait(5)
+    assert time.monotonic() - started < 1
+    assert progress.cancelled
+    with pytest.raises(rms.OperationCancelled):
+        progress.check_cancelled()
+
+
+def test_cancelled_scan_stops_fetching_pages(monkeypatch):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    progress = rms.ToolProgress()
+    pages = []
+
+    def get_executions(project, max_results, *args, **kwargs):
+        pages.append(max_results)
+        if len(pages) == 2:
+            progress.cancel()
+        return {'executions': [{'id': i} for i in range(max_results)], 'total': 10 ** 6, 'hasMore': True}
+
+    monkeypatch.setattr(client, 'get_executions', get_executions)
+    with pytest.raises(rms.OperationCancelled):
+        client.get_all_executions('p', max_total=50000, progress=progress)
+    assert len(pages) == 2
@@ -0,0 +1,112 @@
+"""Tracing spans around tool calls and their OTLP/JSON export"""
+
+import json
+
+import pytest
+import requests
+
+import rundeck_mcp_server as rms
+
+
+class StatusAdapter(requests.adapters.BaseAdapter):
+    """Transport answering every request with a fixed status and JSON body"""
+
+    def __init__(self, status, body):
+        super().__init__()
+        self.status = status
+        self.body = body
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.status_code = self.status
+        response._content = json.dumps(self.body).encode()
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def exported(tmp_path, monkeypatch):
+    path = str(tmp_path / 'spans.jsonl')
+    monkeypatch.setattr(rms, 'tracer', rms.Tracer(rms.JsonLinesWriter(path)))
+
+    def spans():
+        return {span['name']: span for line in rms.read_json_lines(path)
+                for span in line['resourceSpans'][0]['scopeSpans'][0]['spans']}
+    return spans
+
+
+def use_client(monkeypatch, adapter):
+    client = rms.RundeckClient('http://rundeck.example:4440', 't')
+    client.session.mount('http://', adapter)
+    monkeypatch.setattr(rms, 'get_rundeck_client', lambda server_name=None: client)
+    monkeypatch.setattr(rms, 'server_configs', {'default': {'url': client.base_url, 'token': 't'}})
+    return client
+
+
+def test_nested_spans_share_a_trace_and_export_children_first(exported):
+    with rms.tracer.span('outer', attributes={'n': 3, 'ratio': 0.5, 'flag': True, 'skip': None}) as outer:
+        with rms.tracer.span('inner', kind='CLIENT') as inner:
+            assert rms.tracer.current() is inner
+        assert rms.tracer.current() is outer
+    assert isinstance(rms.tracer.current(), rms._NoopSpan)
+
+    spans = exported()
+    assert list(spans) == ['inner', 'outer']
+    assert spans['inner']['traceId'] == spans['outer']['traceId'] and len(spans['outer']['traceId']) == 32
+    assert spans['inner']['parentSpanId'] == spans['outer']['spanId']
+    assert 'parentSpanId' not in spans['outer']
+    assert spans['inner']['kind'] == 3 and spans['outer']['kind'] == 1
+    attributes = {a['key']: a['value'] for a in spans['outer']['attributes']}
+    assert attributes['n'] == {'intValue': '3'} and attributes['ratio'] == {'doubleValue': 0.5}
+    assert attributes['flag'] == {'boolValue': True} and 'skip' not in attributes
+    assert int(spans['outer']['endTimeUnixNano']) >= int(spans['outer']['startTimeUnixNano'])
+    assert spans['outer']['status'] == {'code': 1}
+
+
+def test_exception_marks_span_as_error(exported):
+    with pytest.raises(KeyError):
+        with rms.tracer.span('failing'):
+            raise KeyError('missing')
+    assert exported()['failing']['status'] == {'code': 2, 'message': "KeyError: 'missing'"}
+
+
+def test_disabled_tracer_hands_out_noop_spans():
+    tracer = rms.Tracer()
+    assert not tracer.enabled
+    with tracer.span('anything') as span:
+        span.set_attribute('k', 'v')
+        assert isinstance(span, rms._NoopSpan) and isinstance(tracer.current(), rms._NoopSpan)
+
+
+def test_tool_call_parents_its_rundeck_requests(exported, monkeypatch):
+    use_client(monkeypatch, StatusAdapter(200, {'id': 7, 'status': 'succeeded'}))
+    result = rms.trace_tool_call(rms.execute_tool, 'get_execution_status', {'execution_id': '7'})
+    assert json.loads(result[0].text)['status'] == 'succeeded'
+
+    spans = exported()
+    tool, request, attempt = spans['tool get_execution_status'], spans['GET execution/7'], spans['attempt 1']
+    assert tool['kind'] == 2 and 'parentSpanId' not in tool
+    assert request['parentSpanId'] == tool['spanId'] and attempt['parentSpanId'] == request['spanId']
+    assert {a['key']: a['value'] for a in attempt['attributes']}['http.status_code'] == {'intValue': '200'}
+
+
+def test_failed_tool_call_is_an_error_span(exported, monkeypatch):
+    use_client(monkeypatch, StatusAdapter(404, {'error': True, 'message': 'not found'}))
+    result = rms.trace_tool_call(rms.execute_tool, 'get_execution_status', {'execution_id': '7'})
+    assert result[0].text.startswith('Error')
+    spans = exported()
+    assert spans['tool get_execution_status']['status']['code'] == 2
+    assert spans['attempt 1']['status'] == {'code': 2, 'message': 'HTTP 404'}
+
+
+def test_tool_span_hides_job_option_values(exported):
+    rms.trace_tool_call(lambda name, arguments: [], 'run_job',
+                        {'job_id': 'j', 'options': {'token': 's3cret'}})
+    attributes = {a['key']: a['value'] for a in exported()['tool run_job']['attributes']}
+    assert json.loads(attributes['mcp.tool.arguments']['stringValue']) == \
+        {'job_id': 'j', 'options': {'token': '<redacted>'}}
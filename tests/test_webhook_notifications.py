@@ -0,0 +1,154 @@
+"""Webhook notification parsing, attribution to servers and monitor wake-up"""
+
+import threading
+
+import pytest
+import requests
+
+import rundeck_mcp_server as rms
+
+SERVER_A = 'http://a.example:4440'
+SERVER_B = 'http://b.example:4440'
+
+
+@pytest.fixture
+def two_servers(monkeypatch):
+    monkeypatch.setattr(rms, 'server_configs', {
+        'a': {'url': SERVER_A, 'token': 't', 'api_version': '47'},
+        'b': {'url': SERVER_B + '/', 'token': 't', 'api_version': '47'},
+    })
+
+
+@pytest.fixture
+def receiver(two_servers):
+    receiver = rms.WebhookReceiver('127.0.0.1', 0, 'sekret', None, rms.resolve_notification_server)
+    yield receiver
+    receiver.stop()
+
+
+def post(receiver, body, params=None, content_type='application/json'):
+    return requests.post(receiver.public_url, data=body, params=params,
+                         headers={'Content-Type': content_type}, timeout=5)
+
+
+def test_parse_json_notification_keeps_execution_link():
+    body = (b'{"trigger": "success", "execution": {"id": 12, "status": "succeeded",'
+            b' "href": "http://a.example:4440/project/p/execution/show/12"}}')
+    notification = rms.parse_rundeck_notification(body, 'application/json')
+    assert notification == {
+        'execution_id': '12', 'trigger': 'success', 'status': 'succeeded',
+        'server_url': 'http://a.example:4440/project/p/execution/show/12'
+    }
+
+
+def test_parse_xml_notification():
+    body = (b'<notification trigger="failure" status="failed" executionId="7"><executions count="1">'
+            b'<execution id="7" status="failed" href="http://b.example:4440/execution/7"/>'
+            b'</executions></notification>')
+    notification = rms.parse_rundeck_notification(body, 'application/xml')
+    assert notification['execution_id'] == '7'
+    assert notification['status'] == 'failed'
+    assert notification['server_url'] == 'http://b.example:4440/execution/7'
+
+
+@pytest.mark.parametrize('body', [b'', b'not json', b'[1, 2]', b'{"trigger": "success"}', b'<broken'])
+def test_parse_rejects_unrecognized_bodies(body):
+    assert rms.parse_rundeck_notification(body) is None
+
+
+def test_match_server_url_requires_path_boundary_and_prefers_longest():
+    bases = ['http://a.example:4440', 'http://a.example:4440/rundeck']
+    assert rms.match_server_url('http://A.example:4440/rundeck/execution/1', bases) == bases[1]
+    assert rms.match_server_url('http://a.example:4440/execution/1', bases) == bases[0]
+    assert rms.match_server_url('http://a.example:44401/execution/1', bases) is None
+
+
+def test_waiters_are_keyed_by_server():
+    waiters = rms.ExecutionWaiters()
+    waiters.notify(SERVER_B, {'execution_id': '123', 'trigger': 'success', 'status': None})
+    assert waiters.completion(SERVER_A, '123') is None
+    assert waiters.completion(SERVER_B, '123')['status'] == 'succeeded'
+    assert not waiters.wait(SERVER_A, '123', 0.05)
+    assert waiters.wait(SERVER_B, 123, 0.05)
+
+
+def test_start_notifications_do_not_complete():
+    waiters = rms.ExecutionWaiters()
+    waiters.notify(SERVER_A, {'execution_id': '1', 'trigger': 'start', 'status': 'running'})
+    assert waiters.completion(SERVER_A, '1') is None
+    assert waiters.stats()['notifications_received'] == 1
+
+
+def test_receiver_checks_secret(receiver):
+    body = b'{"trigger": "success", "execution": {"id": 1}}'
+    assert post(receiver, body, {'token': 'wrong', 'server': 'a'}).status_code == 403
+    assert post(receiver, body, {'server': 'a'}).status_code == 403
+    assert post(receiver, body, {'token': 'sekret', 'server': 'a'}).status_code == 204
+
+
+def test_receiver_attributes_notifications_to_servers(receiver):
+    body = b'{"trigger": "success", "execution": {"id": 123}}'
+    linked = b'{"trigger": "success", "execution": {"id": 123, "href": "http://b.example:4440/execution/123"}}'
+    # Two servers and no server hint: rejected rather than guessed
+    assert post(receiver, body, {'token': 'sekret'}).status_code == 400
+    assert post(receiver, body, {'token': 'sekret', 'server': 'unknown'}).status_code == 400
+    assert post(receiver, linked, {'token': 'sekret'}).status_code == 204
+    assert receiver.waiters.completion(SERVER_A, '123') is None
+    assert receiver.waiters.completion(SERVER_B, '123') is not None
+    assert post(receiver, body, {'token': 'sekret', 'server': 'a'}).status_code == 204
+    assert receiver.waiters.completion(SERVER_A, '123') is not None
+    assert receiver.stats()['unattributed_notifications'] == 2
+
+
+def test_receiver_url_for_server(receiver):
+    assert receiver.url_for('prod east').endswith('/rundeck/notifications?server=prod+east')
+    assert receiver.url_for(None) == receiver.public_url
+
+
+def test_monitor_ignores_other_servers_and_rereads_status(receiver, monkeypatch):
+    client = rms.RundeckClient(SERVER_A, 't')
+    monkeypatch.setattr(rms, 'webhook_receiver', receiver)
+    reads = []
+
+    def get_execution_status(execution_id):
+        reads.append(execution_id)
+        if len(reads) == 1:
+            # Server B finished its own execution 123 long ago; A's finishes shortly
+            threading.Timer(0.2, receiver.waiters.notify, (SERVER_A, {
+                'execution_id': '123', 'trigger': 'success', 'status': 'succeeded'})).start()
+            return {'id': 123, 'status': 'running', 'project': 'p'}
+        return {'id': 123, 'status': 'succeeded', 'project': 'p', 'read': len(reads)}
+
+    receiver.waiters.notify(SERVER_B, {'execution_id': '123', 'trigger': 'failure', 'status': 'failed'})
+    monkeypatch.setattr(client, 'run_job', lambda *args, **kwargs: {'id': 123})
+    monkeypatch.setattr(client, 'get_job_definition',
+                        lambda job_id, project=None: {'notification': {'onsuccess': {'urls': receiver.public_url}}})
+    monkeypatch.setattr(client, 'get_execution_status', get_execution_status)
+
+    result = client.run_job_with_monitoring('job', wait_for_completion=True, timeout_minutes=1)
+
+    assert result['monitoring_completed'] is True
+    assert result['completion_signal'] == 'webhook'
+    assert result['final_status'] == {'id': 123, 'status': 'succeeded', 'project': 'p', 'read': 2}
+    assert result['total_wait_time_seconds'] < 5
+
+
+def test_only_notifications_to_this_listener_count(receiver):
+    def job(urls):
+        return {'notification': {'onsuccess': {'urls': urls}, 'onfailure': {'format': 'json'}}}
+
+    assert receiver.notifies_receiver(job(receiver.url_for('a')))
+    assert receiver.notifies_receiver(job(f"http://ops.example/hook, {receiver.public_url.upper()}/"))
+    assert not receiver.notifies_receiver(job('http://elsewhere.example:9000/rundeck/notifications'))
+    assert not receiver.notifies_receiver(job(receiver.public_url + 'x'))
+    assert not receiver.notifies_receiver({'description': receiver.public_url})
+
+
+def test_unattributed_count_is_exact_under_concurrent_posts(receiver):
+    body = b'{"trigger": "success", "execution": {"id": 1}}'
+    threads = [threading.Thread(target=post, args=(receiver, body, {'token': 'sekret'})) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert receiver.stats()['unattributed_notifications'] == 20